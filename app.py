@@ -1,5 +1,13 @@
 import streamlit as st
 from config.state_manager import initialize_session_state
+from src.monitoring import configure_logging, start_exporter
+from src.warmup import start_warm_up
+
+# JSON logs and the metrics exporter (ESI_PF_METRICS_PORT / ESI_PF_METRICS_FILE); both start once per process
+configure_logging()
+start_exporter()
+# Pre-imports pandas, the Excel engines and the calculators in the background (ESI_PF_WARMUP=0 to skip)
+start_warm_up()
 
 # Initialize session state once, at the very beginning
 initialize_session_state()
@@ -14,6 +22,7 @@ pages = [
     st.Page("pages/0_Home.py", title="Home", icon="🏠"),
     st.Page("pages/1_ESI_PF_Calculator.py", title="ESI PF Calculator", icon="📄"),
     st.Page("pages/2_IFSC_Checker.py", title="IFSC Checker", icon="🔍"),
+    st.Page("pages/3_Group_Processing.py", title="Group Processing", icon="🏢"),
 ]
 
 # Create the navigation menu
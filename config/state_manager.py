@@ -9,17 +9,13 @@ def initialize_session_state():
     if 'approved' not in st.session_state:
         st.session_state.approved = False
         
-    # Result DataFrames
-    if 'pf_df' not in st.session_state:
-        st.session_state.pf_df = None
-    if 'esi_excel' not in st.session_state:
-        st.session_state.esi_excel = None
-    if 'verify_pf' not in st.session_state:
-        st.session_state.verify_pf = None
-    if 'verify_esi' not in st.session_state:
-        st.session_state.verify_esi = None
-    if 'esi_df' not in st.session_state:  # Added for consistency
-        st.session_state.esi_df = None
+    # Result DataFrames (kept in result_store; only the handle lives in the session)
+    if 'results_handle' not in st.session_state:
+        st.session_state.results_handle = None
+    if 'processing_job' not in st.session_state:  # job_queue id while results are being calculated
+        st.session_state.processing_job = None
+    if 'totals' not in st.session_state:  # compute_totals() of the current results
+        st.session_state.totals = None
         
     # Uploaded Files (used by ESI/PF Page)
     if 'payroll_file' not in st.session_state:
@@ -33,6 +29,26 @@ def initialize_session_state():
     if 'esi_payroll_file' not in st.session_state:
         st.session_state.esi_payroll_file = None
         
+    # Multi-establishment results (Group Processing page)
+    if 'group_results' not in st.session_state:
+        st.session_state.group_results = None
+    if 'group_job' not in st.session_state:
+        st.session_state.group_job = None
+
+    # Bulk IFSC validation result (IFSC Checker page)
+    if 'ifsc_bulk_result' not in st.session_state:
+        st.session_state.ifsc_bulk_result = None
+
+    # Per-stage timings of the last calculation (ESI/PF page Diagnostics panel)
+    if 'diagnostics' not in st.session_state:
+        st.session_state.diagnostics = None
+    if 'diagnostics_profile' not in st.session_state:  # next calculation skips the cache and traces memory
+        st.session_state.diagnostics_profile = False
+
+    # Incremental run against last approved month (ESI/PF page)
+    if 'incremental_run' not in st.session_state:
+        st.session_state.incremental_run = None
+
     # Company state tracker
     if 'current_company' not in st.session_state:
         st.session_state.current_company = None
\ No newline at end of file
@@ -42,4 +42,17 @@ with col4:
     if st.button("Launch Tool", key="launch_ifsc", use_container_width=True):
         st.switch_page("pages/2_IFSC_Checker.py")
 
+st.divider()
+
+# --- Tool 3: Group Processing ---
+col5, col6 = st.columns([4, 1])
+
+with col5:
+    st.subheader(":grey[🏢 Group Processing]")
+    st.write("Process payroll and member files for many establishments at once and review group-level totals.")
+
+with col6:
+    if st.button("Launch Tool", key="launch_group", use_container_width=True):
+        st.switch_page("pages/3_Group_Processing.py")
+
 st.divider()
\ No newline at end of file
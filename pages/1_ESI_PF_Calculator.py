@@ -1,25 +1,91 @@
 # pages/1_ESI_PF_Calculator.py
 
-import traceback
+import logging
+from functools import partial
 import streamlit as st
 import pandas as pd
 
 # Import initialization and processing logic
 from config.state_manager import initialize_session_state
-from src.features.esi_pf_challan import somany_pf, somany_esi, hng_pf, hng_esi, save_esi_excel, save_pf_custom_sep
+from src.ui import paginated_preview, job_progress, validation_error
+from src.features.esi_pf_challan import (
+    cached_process_company, file_digest, compute_totals, save_esi_excel, save_pf_custom_sep,
+    member_master, read_pf_members, read_esi_members,
+    process_company, RowReuse, baseline_store, diff_challans, DEFAULT_NAME_THRESHOLD, result_store,
+    job_queue, snapshot, CANCELLED, FAILED, record_stages, DIAGNOSTICS_COLUMNS, COMPANIES, PROFILES,
+)
+from src.monitoring import PAGE_ERRORS
+
+log = logging.getLogger("pages.esi_pf_calculator")
 
 st.set_page_config(layout="wide", initial_sidebar_state="collapsed")
 
+def discard_results():
+    """Releases this session's stored results (and stops a calculation in progress) so they are recalculated on the next run."""
+    job_queue.discard(st.session_state.processing_job)
+    st.session_state.processing_job = None
+    result_store.discard(st.session_state.results_handle)
+    st.session_state.results_handle = None
+    st.session_state.totals = None
+    st.session_state.diagnostics = None
+
+
+def run_processing(job, company, pf_payroll, esi_payroll, pf_members, esi_members, incremental, establishment, profile=False):
+    """
+    Background job: calculates one company's challans and stores them in result_store.
+
+    Stage timings (and memory, when profiling) are left in job.info["diagnostics"].
+
+    Args:
+        profile (bool): Skip the result cache and trace memory per stage (slower).
+
+    Returns:
+        str: The result_store handle of the frames.
+    """
+    with record_stages(trace_memory=profile) as log:
+        handle = _calculate(job, company, pf_payroll, esi_payroll, pf_members, esi_members, incremental, establishment, profile)
+    # Empty when the results came from result_cache
+    job.info["diagnostics"] = log.as_dicts()
+    return handle
+
+
+def _calculate(job, company, pf_payroll, esi_payroll, pf_members, esi_members, incremental, establishment, profile):
+    if incremental:
+        # Not cached: the result depends on the saved baseline too
+        previous = baseline_store.load(establishment)
+        reuse = RowReuse(previous["pf"] if previous else None)
+        results = process_company(company, pf_payroll, esi_payroll, pf_members, esi_members, reuse=reuse, progress=job.report)
+        job.report("Comparing with last approved month", 0.9)
+        job.info["incremental_run"] = {
+            "establishment": establishment,
+            "saved_at": previous["saved_at"] if previous else None,
+            "pf_changes": diff_challans(previous["pf"] if previous else None, results["pf_df"], "UAN", "MEMBER_NAME"),
+            "esi_changes": diff_challans(previous["esi"] if previous else None, results["esi_df"], "IP Number", "IP Name"),
+            "reused": reuse.reused,
+            "recomputed": reuse.recomputed,
+        }
+    elif profile:
+        results = process_company(company, pf_payroll, esi_payroll, pf_members, esi_members, progress=job.report)
+    else:
+        results = cached_process_company(company, pf_payroll, esi_payroll, pf_members, esi_members, progress=job.report)
+
+    frames = {name: results[name] for name in ["pf_df", "esi_df", "verify_pf", "verify_esi"]}
+    if incremental and reuse.baseline is not None:
+        # Kept with the results for baseline_store.save() on approval
+        frames["pf_baseline"] = reuse.baseline
+    # Compressed copies: cached frames are shared between sessions
+    job.report("Storing results", 0.95)
+    return result_store.put(frames)
+
+
 # --- CORE RESET FUNCTION ---
 def reset_all_states():
     """Resets all data-related session states and clears file uploader keys."""
     
     # 1. Clear Processing/Results Data
     st.session_state.approved = False
-    st.session_state.pf_df = None
-    st.session_state.esi_df = None
-    st.session_state.verify_pf = None
-    st.session_state.verify_esi = None
+    discard_results()
+    st.session_state.incremental_run = None
     
     # 2. Clear our DERIVED state keys (safe to clear)
     st.session_state.payroll_file = None
@@ -27,6 +93,8 @@ def reset_all_states():
     st.session_state.esi_payroll_file = None
     st.session_state.pf_members_file = None
     st.session_state.esi_members_file = None
+    for key in ['payroll_file', 'pf_payroll_file', 'esi_payroll_file', 'pf_members_file', 'esi_members_file']:
+        st.session_state[f"{key}_digest"] = None
 
     # 3. Clear the actual file uploader widget keys (CRITICAL FIX)
     file_keys_to_clear = [
@@ -39,6 +107,45 @@ def reset_all_states():
             del st.session_state[key]
 
 
+def clear_results():
+    """Drops computed results so they are recalculated from the current inputs."""
+    st.session_state.approved = False
+    discard_results()
+    st.session_state.incremental_run = None
+
+
+def show_join_summary(verify_df, list_name):
+    """Shows the match counts verification stored on verify_df, warning about duplicate keys."""
+    summary = verify_df.attrs.get("join_summary")
+    if not summary:
+        return
+    st.caption(f"{summary['matched']} payroll rows matched; {summary['missing_from_payroll']} members of the {list_name} have no payroll row.")
+    if summary["duplicate_payroll_rows"] or summary["duplicate_active_rows"]:
+        st.warning(
+            f"Duplicate numbers: {summary['duplicate_payroll_rows']} payroll rows and {summary['duplicate_active_rows']} {list_name} rows "
+            "share their number with another row. Names are compared against the first matching member."
+        )
+
+
+def show_name_check(verify_df, list_name, key):
+    """Shows the name comparison, by default only the rows whose names score below the threshold."""
+    show_join_summary(verify_df, list_name)
+    score_cols = [col for col in verify_df.columns if col.endswith("Score")]
+    filter_cols = st.columns([1, 2])
+    only_mismatches = filter_cols[0].toggle("Only likely mismatches", value=True, key=f"{key}_only_mismatches")
+    threshold = filter_cols[1].slider(
+        "Flag names scoring below", 0.0, 1.0, DEFAULT_NAME_THRESHOLD, 0.05, key=f"{key}_threshold",
+        help="1 means the same name after ignoring case, punctuation, honorifics and initials.",
+    )
+    mismatch = (verify_df[score_cols] < threshold).any(axis=1).to_numpy()
+    if only_mismatches:
+        st.caption(f"{int(mismatch.sum())} of {len(verify_df)} rows score below {threshold:.2f}.")
+    paginated_preview(
+        verify_df, key, search_cols=[col for col in verify_df.columns if not col.endswith(("Score", "Mismatch"))],
+        mask=mismatch if only_mismatches else None, page_columns={"Mismatch": mismatch},
+    )
+
+
 # 1. Guaranteed Initialization
 initialize_session_state()
 
@@ -48,6 +155,27 @@ st.title(":green[📄 PF/ESI Processing App]")
 # ===== Step 1: Select Company =====
 st.header(":blue[Step 1: Company Selection]")
 
+def show_diagnostics(calculation_stages, write_stages):
+    """Collapsible table of how long each stage of the last calculation (and of writing the files) took."""
+    with st.expander("🩺 Diagnostics"):
+        if calculation_stages is None:
+            st.caption("No calculation has been recorded for these results.")
+        elif not calculation_stages:
+            st.caption("These results came from the result cache, so no calculation stages ran. Profile the calculation to measure them.")
+        stages = (calculation_stages or []) + write_stages
+        if stages:
+            st.dataframe(pd.DataFrame(stages, columns=DIAGNOSTICS_COLUMNS), width='stretch', hide_index=True)
+            st.caption(
+                "Times of a stage include the stages nested in it (\"PF / merge\" is part of \"PF\"). "
+                "Peak RSS is the whole server process's high-water mark when the stage ended. "
+                "Peak traced memory stays empty if another profiled calculation was tracing memory at the same time."
+            )
+        if st.button("🔬 Profile the calculation", help="Recalculate without the result cache, tracing memory per stage (slower)."):
+            st.session_state.diagnostics_profile = True
+            clear_results()
+            st.rerun()
+
+
 def handle_company_change():
     """Triggered when the company selection changes."""
     if st.session_state.current_company != st.session_state.company_select:
@@ -56,7 +184,7 @@ def handle_company_change():
         
 company = st.selectbox(
     "Select the company", 
-    ["Somany", "HNG"],
+    COMPANIES,
     key="company_select",
     on_change=handle_company_change
 )
@@ -73,35 +201,44 @@ st.header(":blue[Step 2: Upload Required Files]")
 def handle_file_upload_state(file_object, state_key):
     """Assigns file object to the consistent state key and resets processing flags if the file changed."""
     
-    # Check if the file object is new or different from what's currently stored under the state_key
-    is_new = file_object is not None and (st.session_state.get(state_key) is None or file_object.name != st.session_state.get(state_key).name)
-    is_cleared = file_object is None and st.session_state.get(state_key) is not None
-
-    if is_new or is_cleared:
+    # A file counts as changed when its contents change, not just its name.
+    # Only re-hash when the uploader hands us a different upload.
+    digest_key = f"{state_key}_digest"
+    stored = st.session_state.get(state_key)
+    if file_object is None:
+        digest = None
+    elif stored is not None and file_object.file_id == stored.file_id:
+        digest = st.session_state.get(digest_key)
+    else:
+        digest = file_digest(file_object)
+
+    if digest != st.session_state.get(digest_key):
         st.session_state.approved = False
-        st.session_state.pf_df = None
-        st.session_state.esi_df = None
-        st.session_state.verify_pf = None
-        st.session_state.verify_esi = None
+        discard_results()
     
-    # Always update the consistent state key
+    # Always update the consistent state keys
     st.session_state[state_key] = file_object
+    st.session_state[digest_key] = digest
     
     return file_object is not None
 
 
-if company == "Somany":
+# One workbook for PF and ESI, or one of each (see the company's profile)
+single_payroll = PROFILES[company].single_payroll
+sheet_names = [f"'{sheet}'" for sheet in PROFILES[company].sheet_options if isinstance(sheet, str)]
+
+if single_payroll:
     st.subheader(":grey[Payment Sheet]", divider="grey", width="content")
     payroll_file = st.file_uploader(
         "1. Upload your main payroll Excel file (.xlsx)",
         type=["xlsx"],
         key="somany_payroll_file",
-        help="Ensure your file contains the required sheets: 'WAGES' and 'PAYMENT'."
+        help=f"Ensure your file contains the required sheets: {' and '.join(sheet_names)}." if sheet_names else None
     )
     if handle_file_upload_state(payroll_file, 'payroll_file'):
         st.success(f"✅ Payroll file uploaded: `{payroll_file.name}`")
     
-elif company == "HNG":
+else:
     upload_cols = st.columns(2)
     with upload_cols[0]:
         st.subheader(":grey[PF Payroll Sheet]", divider="grey", width="content")
@@ -130,10 +267,43 @@ pf_payroll_file_state = st.session_state.get('pf_payroll_file')
 esi_payroll_file_state = st.session_state.get('esi_payroll_file')
 
 
+# Saved employee master and incremental run (set below when the toggles are on)
+use_master = False
+master_summary = None
+incremental = False
+establishment = company
+
 # Determine if we should show the member file uploaders
-if (company == "Somany" and payroll_file_state) or \
-   (company == "HNG" and pf_payroll_file_state and esi_payroll_file_state):
+if (single_payroll and payroll_file_state) or \
+   (not single_payroll and pf_payroll_file_state and esi_payroll_file_state):
     
+    option_cols = st.columns(2)
+    use_master = option_cols[0].toggle(
+        "Use saved employee master",
+        key="use_member_master",
+        on_change=clear_results,
+        help="Member lists are kept between runs. Upload a member list only when it has changed; it is merged into the saved one.",
+    )
+    incremental = option_cols[1].toggle(
+        "Compare with last approved month",
+        key="incremental_mode",
+        on_change=clear_results,
+        help="Reuses unchanged PF rows from the last approved run of this establishment and lists who joined, left or changed.",
+    )
+    if use_master or incremental:
+        establishment = st.text_input(
+            "Establishment (employee master and baseline name)",
+            value=company,
+            key="member_master_establishment",
+            on_change=clear_results,
+        ).strip() or company
+    if use_master:
+        full_lists = st.checkbox(
+            "Uploaded member lists are complete",
+            key="member_master_full_lists",
+            help="Members missing from an uploaded list are removed from the employee master. Leave unticked to upload only the changes.",
+        )
+
     upload_cols = st.columns(2)
 
     with upload_cols[0]:
@@ -158,16 +328,45 @@ if (company == "Somany" and payroll_file_state) or \
         if handle_file_upload_state(esi_members_file, 'esi_members_file'):
             st.success(f"✅ ESI members file uploaded: `{esi_members_file.name}`")
 
+    if use_master:
+        # Merge each new upload into the master once (a delta on top of what is saved, unless full_lists)
+        for state_key, parse, upsert in [
+            ('pf_members_file', partial(read_pf_members, dob_format=PROFILES[company].pf["dob_format"]), member_master.upsert_pf),
+            ('esi_members_file', read_esi_members, member_master.upsert_esi),
+        ]:
+            uploaded = st.session_state.get(state_key)
+            merge_id = (establishment, st.session_state.get(f"{state_key}_digest"))
+            if uploaded is not None and st.session_state.get(f"{state_key}_merged") != merge_id:
+                try:
+                    counts = upsert(establishment, parse(uploaded), replace=full_lists)
+                    st.session_state[f"{state_key}_merged"] = merge_id
+                    clear_results()
+                    st.info(f"Merged `{uploaded.name}` into the employee master: {counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged, {counts['removed']} removed.")
+                except ValueError as e:
+                    st.error(f"Could not merge `{uploaded.name}` into the employee master: {e}")
+
+        master_summary = member_master.summary(establishment)
+        st.caption(
+            f"Employee master **{establishment}**: {master_summary['pf_members']} PF members"
+            f" (updated {master_summary['pf_updated_at'] or 'never'}), {master_summary['esi_members']} ESI members"
+            f" (updated {master_summary['esi_updated_at'] or 'never'})."
+        )
+
 # Safely retrieve member file states
 pf_members_file_state = st.session_state.get('pf_members_file')
 esi_members_file_state = st.session_state.get('esi_members_file')
 
+# With the employee master, the saved lists stand in for the uploads
+if use_master:
+    pf_members_file_state = pf_members_file_state or master_summary['pf_members'] > 0
+    esi_members_file_state = esi_members_file_state or master_summary['esi_members'] > 0
+
 
 # ===== Step 3: Processing and Approval =====
 
-if company == "Somany":
+if single_payroll:
     ready = payroll_file_state and pf_members_file_state and esi_members_file_state
-else:  # HNG
+else:
     ready = pf_payroll_file_state and esi_payroll_file_state and pf_members_file_state and esi_members_file_state
 
 if ready:
@@ -175,30 +374,77 @@ if ready:
     
     # --- Processing Logic (Unchanged from previous successful revision) ---
     try:
-        # Run calculation only if data is missing or not yet approved
-        if st.session_state.pf_df is None or st.session_state.approved == False:
-            
-            with st.spinner(f"Processing calculations for {company}..."):
-                if company == "Somany":
-                    verify_pf, pf_df = somany_pf(st.session_state.payroll_file, st.session_state.pf_members_file)
-                    verify_esi, esi_df = somany_esi(st.session_state.payroll_file, st.session_state.esi_members_file)
-                else: # HNG company logic
-                    verify_pf, pf_df = hng_pf(st.session_state.pf_payroll_file, st.session_state.pf_members_file)
-                    verify_esi, esi_df = hng_esi(st.session_state.esi_payroll_file, st.session_state.esi_members_file)
-
-            # Store results in session state 
-            st.session_state.pf_df = pf_df.copy()
-            st.session_state.verify_pf = verify_pf.copy()
-            st.session_state.esi_df = esi_df.copy()
-            st.session_state.verify_esi = verify_esi.copy()
+        # Results live compressed in result_store; the session only holds their handle.
+        # Uploads and company changes discard it, and an idle session's results may be
+        # evicted. Either way they are recalculated here (from result_cache when the
+        # inputs are unchanged, so the payroll is not re-parsed).
+        results = result_store.get(st.session_state.results_handle)
+        if results is None:
+            job = job_queue.get(st.session_state.processing_job)
+            if job is None:
+                if st.session_state.results_handle is not None:
+                    st.info("Results were released after a period of inactivity; recalculating.")
+                    st.session_state.approved = False
+
+                if use_master:
+                    pf_members = member_master.pf_members(establishment)
+                    esi_members = member_master.esi_members(establishment)
+                else:
+                    pf_members = st.session_state.pf_members_file
+                    esi_members = st.session_state.esi_members_file
+
+                if single_payroll:
+                    pf_payroll = esi_payroll = st.session_state.payroll_file
+                else:
+                    pf_payroll, esi_payroll = st.session_state.pf_payroll_file, st.session_state.esi_payroll_file
+
+                # The job gets its own copies of the uploads; the page keeps using the originals
+                files = [snapshot(f) for f in (pf_payroll, esi_payroll, pf_members, esi_members)]
+                if single_payroll:
+                    files[1] = files[0]  # one workbook for both
+                job = job_queue.submit(
+                    partial(run_processing, company=company, pf_payroll=files[0], esi_payroll=files[1],
+                            pf_members=files[2], esi_members=files[3], incremental=incremental, establishment=establishment,
+                            profile=st.session_state.diagnostics_profile),
+                    label=f"Processing calculations for {company}",
+                    kind="calculation",
+                )
+                st.session_state.processing_job = job.id
+                st.session_state.diagnostics_profile = False  # only the run it was asked for
+
+            # Calculation runs in the background; this rerun ends here and the
+            # progress bar refreshes on its own (the job carries on if the user leaves the page)
+            if not job.finished:
+                job_progress(job.id, "processing_job")
+                st.stop()
+
+            if job.status == CANCELLED:
+                st.warning("Processing was cancelled.")
+                if st.button("⚙️ Process again"):
+                    job_queue.discard(job.id)
+                    st.session_state.processing_job = None
+                    st.rerun()
+                st.stop()
+
+            job_queue.discard(job.id)
+            st.session_state.processing_job = None
+            if job.status == FAILED:
+                raise job.error  # shown by the handlers below, like an inline failure
+
+            result_store.discard(st.session_state.results_handle)  # released or superseded
+            st.session_state.results_handle = job.result
+            st.session_state.incremental_run = job.info.get("incremental_run")
+            st.session_state.diagnostics = job.info.get("diagnostics")
+            results = result_store.get(job.result)
+            # Totals only change with the results, so they are not recomputed on every rerun
+            st.session_state.totals = compute_totals(results["pf_df"], results["esi_df"])
             
             st.success("Processing complete. Review data below.")
 
-        # If results are already stored, load them for display
-        pf_df = st.session_state.pf_df
-        esi_df = st.session_state.esi_df
-        verify_pf = st.session_state.verify_pf
-        verify_esi = st.session_state.verify_esi
+        pf_df = results["pf_df"]
+        esi_df = results["esi_df"]
+        verify_pf = results["verify_pf"]
+        verify_esi = results["verify_esi"]
 
         # --- Display Section (Omitted for brevity, assumed to be unchanged) ---
         st.subheader(":grey[Review the data]", divider="grey", width="content")
@@ -206,97 +452,113 @@ if ready:
         # [Preview Expander blocks go here]
         with st.expander("📊 Preview PF"):
             with st.expander("📊 Preview Processed PF Data", expanded=False):
-                pf_df_display = pf_df.copy()
-                pf_df_display.index = range(2, len(pf_df_display) + 2)
-                st.dataframe(pf_df_display, width='stretch')
+                paginated_preview(pf_df, "pf_preview", search_cols=["UAN", "MEMBER_NAME"])
             with st.expander("📊 Preview Names of Labours", expanded=False):
-                verify_pf.index = range(2, len(verify_pf) + 2)
-                st.dataframe(verify_pf, width='stretch')
+                show_name_check(verify_pf, "active PF list", "verify_pf")
                 
         with st.expander("📊 Preview ESI"):
             with st.expander("📊 Preview Processed ESI Data", expanded=False):
-                esi_df_display = esi_df.copy()
-                esi_df_display.index = range(2, len(esi_df_display) + 2)
-                st.dataframe(esi_df_display, width='stretch')
+                paginated_preview(esi_df, "esi_preview", search_cols=["IP Number", "IP Name"])
             with st.expander("📊 Preview Names of Labours", expanded=False):
-                    verify_esi.index = range(2, len(verify_esi) + 2)
-                    st.dataframe(verify_esi, width='stretch')
+                show_name_check(verify_esi, "ESI list", "verify_esi")
+
+        incremental_run = st.session_state.incremental_run
+        if incremental_run is not None:
+            with st.expander("🔁 Changes since last approved month"):
+                if incremental_run["saved_at"] is None:
+                    st.caption(f"No approved month saved for **{incremental_run['establishment']}** yet; approving this one makes it the baseline.")
+                else:
+                    st.caption(
+                        f"Compared with the month approved on {incremental_run['saved_at']}: "
+                        f"{incremental_run['reused']} PF rows reused, {incremental_run['recomputed']} recomputed."
+                    )
+                st.markdown("**PF**")
+                st.dataframe(incremental_run["pf_changes"], width='stretch')
+                st.markdown("**ESI**")
+                st.dataframe(incremental_run["esi_changes"], width='stretch')
 
 
         # [Totals Summary blocks go here]
         if pf_df is not None and not pf_df.empty:
-            numeric_cols = pf_df.select_dtypes(include=["number"]).columns
-            if not numeric_cols.empty:
+            totals = st.session_state.totals
+            if totals is None:
+                totals = st.session_state.totals = compute_totals(pf_df, esi_df)
+            if not totals["pf_column_totals"].empty:
                 st.subheader(f":grey[Totals Summary]", divider="grey", width="content")
                 
                 sum_cols = st.columns(4)
                 
-                esi_days = esi_df.get("No of Days for which wages paid/payable during the month")
-                esi_wages = esi_df.get("Total Monthly Wages")
-                
                 with sum_cols[0]:
-                    st.metric(":blue[Total Number of Employees]", pf_df.shape[0], border=True)
+                    st.metric(":blue[Total Number of Employees]", totals["employees"], border=True)
                 with sum_cols[1]:
-                    st.metric(":green[PF Gross Wages]", pf_df["GROSS_WAGES"].sum(), border=True)
+                    st.metric(":green[PF Gross Wages]", totals["pf_gross_wages"], border=True)
                 with sum_cols[2]:
-                    esi_days_sum = esi_days.astype(int).sum() if esi_days is not None else 0
-                    st.metric(":red[ESI Total Days]", esi_days_sum, border=True)
+                    st.metric(":red[ESI Total Days]", totals["esi_total_days"], border=True)
                     
                 with sum_cols[3]:
-                    esi_wages_sum = esi_wages.astype(int).sum() if esi_wages is not None else 0
-                    st.metric(":orange[ESI Gross Wages]", esi_wages_sum, border=True)
+                    st.metric(":orange[ESI Gross Wages]", totals["esi_gross_wages"], border=True)
                 
-                totals_df = pd.DataFrame(pf_df[numeric_cols].sum()).T
+                totals_df = pd.DataFrame(totals["pf_column_totals"]).T
                 st.dataframe(totals_df, width='stretch', hide_index=True)
 
-            if "EPS_WAGES" in pf_df.columns and (pf_df["EPS_WAGES"] == 0).any():
+            over_age = (pf_df["EPS_WAGES"] == 0).to_numpy(dtype=bool, na_value=False) if "EPS_WAGES" in pf_df.columns else None
+            if over_age is not None and over_age.any():
                 st.subheader(f":grey[Employees with Age >= 58]", divider="grey", width="content")
-                age_df = pf_df[pf_df["EPS_WAGES"] == 0].copy()
-                age_df.index = age_df.index + 2
-                st.dataframe(age_df, width='stretch')
+                paginated_preview(pf_df, "over_age_preview", search_cols=["UAN", "MEMBER_NAME"], mask=over_age)
 
 
         # [Approval and Download blocks go here]
         if not st.session_state.approved:
             if st.button("✅ Approve and Generate Files"):
                 st.session_state.approved = True
+                if incremental_run is not None:
+                    # The approved month is next month's baseline
+                    baseline_store.save(incremental_run["establishment"], results.get("pf_baseline"), esi_df)
                 st.rerun()
 
+        write_stages = []
         if st.session_state.approved:
             st.success("🎉 Approved! You can now download the generated files.")
             
             cols = st.columns(8)
             
-            with cols[0]:
-                if st.session_state.pf_df is not None:
-                    file_content = save_pf_custom_sep(st.session_state.pf_df, sep="#~#", header=False)
-                    st.download_button(
-                        label="📥 Download PF File",
-                        data=file_content,
-                        file_name="PF_CHALLAN.txt",
-                        mime="text/plain"
-                    )
-            
-            with cols[1]:
-                if st.session_state.esi_df is not None:
-                    st.download_button(
-                        label="📥 Download ESI File",
-                        data=save_esi_excel(st.session_state.esi_df),
-                        file_name="ESI_CHALLAN.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
+            # The files are written on the first rerun after approval and kept with the
+            # results, so their stages only show up then
+            handle = st.session_state.results_handle
+            with record_stages() as write_log:
+                with cols[0]:
+                    if pf_df is not None:
+                        st.download_button(
+                            label="📥 Download PF File",
+                            data=result_store.file(handle, "pf", lambda: save_pf_custom_sep(pf_df, sep="#~#", header=False).encode("utf-8")),
+                            file_name="PF_CHALLAN.txt",
+                            mime="text/plain"
+                        )
+                
+                with cols[1]:
+                    if esi_df is not None:
+                        st.download_button(
+                            label="📥 Download ESI File",
+                            data=result_store.file(handle, "esi", lambda: save_esi_excel(esi_df).getvalue()),
+                            file_name="ESI_CHALLAN.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        )
+            write_stages = write_log.as_dicts()
+
+        show_diagnostics(st.session_state.diagnostics, write_stages)
     
     except ValueError as e:
-        st.error(f"Processing Error (Validation):\n```\n{e}\n```")
-        traceback.print_exc()
-        st.session_state.pf_df = None
-        st.session_state.esi_df = None
+        validation_error(e, "Processing Error (Validation):", key="validation_error_csv")
+        PAGE_ERRORS.inc(page="esi_pf_calculator", kind="validation")
+        log.warning("validation failed", exc_info=True, extra={"company": company})
+        discard_results()
         st.session_state.approved = False
         
     except Exception as e:
         st.error(f"An unexpected error occurred during processing: {e}")
         st.exception(e)
-        traceback.print_exc()
+        PAGE_ERRORS.inc(page="esi_pf_calculator", kind="unexpected")
+        log.exception("processing failed", extra={"company": company})
 
 else:
     st.info("Please upload the required payroll files and member lists to proceed.")
\ No newline at end of file
@@ -2,67 +2,139 @@
 
 import streamlit as st
 import pandas as pd
-from src.features.ifsc_checker import validate_ifsc_format, check_ifsc_exists
+from src.features.ifsc_checker import validate_ifsc_format, check_ifsc_exists, index_info, ifsc_cache
+from src.features.ifsc_checker.bulk import (
+    DEFAULT_WORKERS, STATUS_VALID, read_accounts_file, find_ifsc_columns, validate_accounts,
+    summarize_validation, annotated_file_bytes,
+)
 
 # --- Page Configuration ---
 st.set_page_config(layout="wide")
 st.title(":green[🔍 IFSC Code Checker]")
 
-# --- Input Section ---
-st.subheader(":blue[Enter IFSC Code]", divider="grey", width="content")
+offline_index = index_info()
+if offline_index:
+    st.caption(f"Offline IFSC index: {int(offline_index['count']):,} codes (built {offline_index['built_at']}). Codes not in it are checked online.")
 
-ifsc_input = st.text_input(
-    "Enter 11-character IFSC Code (e.g., HDFC0000123)",
-    key="ifsc_code_input",
-    label_visibility="visible",
-    width=300
-).upper().strip()
+single_tab, bulk_tab = st.tabs(["Single Code", "Bulk File"])
 
-# The entire logic now runs inside the button click condition
-if st.button("Validate and Search IFSC"):
+# The bulk tab is drawn first: the single-code flow below ends the run with st.stop() on bad input
+with bulk_tab:
+    st.subheader(":blue[Validate an Employee Bank-Account File]", divider="grey", width="content")
+    accounts_file = st.file_uploader("Employee file (.csv or .xlsx)", type=["csv", "xlsx"], key="ifsc_bulk_file")
+
+    if accounts_file is None:
+        st.session_state.ifsc_bulk_result = None
+        st.info("Upload a file with one or more IFSC columns to validate every code in it.")
+    else:
+        accounts_df = read_accounts_file(accounts_file)
+        ifsc_columns = st.multiselect(
+            "IFSC column(s)",
+            list(accounts_df.columns),
+            default=find_ifsc_columns(accounts_df),
+            key="ifsc_bulk_columns",
+        )
+        workers = st.slider("Parallel lookups", min_value=1, max_value=32, value=DEFAULT_WORKERS, key="ifsc_bulk_workers")
+
+        if st.button("Validate File", disabled=not ifsc_columns):
+            progress_bar = st.progress(0.0, text="Looking up IFSC codes...")
+            annotated = validate_accounts(
+                accounts_df,
+                ifsc_columns,
+                max_workers=workers,
+                progress=lambda done, total: progress_bar.progress(done / total, text=f"Looked up {done} of {total} distinct codes"),
+            )
+            progress_bar.empty()
+            st.session_state.ifsc_bulk_result = {
+                "file_id": accounts_file.file_id,
+                "columns": ifsc_columns,
+                "annotated": annotated,
+            }
+
+        bulk_result = st.session_state.get("ifsc_bulk_result")
+        if bulk_result and bulk_result["file_id"] == accounts_file.file_id:
+            annotated, checked_columns = bulk_result["annotated"], bulk_result["columns"]
+            summary = summarize_validation(annotated, checked_columns)
+
+            cols = st.columns(3)
+            cols[0].metric("Rows", len(annotated))
+            cols[1].metric("Valid codes", int(summary[STATUS_VALID].sum()))
+            cols[2].metric("Problems", int(summary.drop(columns=STATUS_VALID).to_numpy().sum()))
+            st.dataframe(summary)
+            cache_stats = ifsc_cache.stats()
+            st.caption(
+                f"IFSC cache since startup: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits "
+                f"({cache_stats['disk_hits']} from disk), {cache_stats['misses']} API lookups."
+            )
+
+            problems = annotated[(annotated[[f"{col} Status" for col in checked_columns]] != STATUS_VALID).any(axis=1)]
+            with st.expander(f"Rows with problems ({len(problems)})", expanded=not problems.empty):
+                st.dataframe(problems)
+
+            stem, dot, suffix = accounts_file.name.rpartition(".")
+            st.download_button(
+                label="📥 Download Annotated File",
+                data=annotated_file_bytes(annotated, accounts_file.name),
+                file_name=f"{stem}_ifsc_checked.{suffix}",
+                mime="text/csv" if suffix.lower() == "csv" else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+
+with single_tab:
+    # --- Input Section ---
+    st.subheader(":blue[Enter IFSC Code]", divider="grey", width="content")
+
+    ifsc_input = st.text_input(
+        "Enter 11-character IFSC Code (e.g., HDFC0000123)",
+        key="ifsc_code_input",
+        label_visibility="visible",
+        width=300
+    ).upper().strip()
+
+    # The entire logic now runs inside the button click condition
+    if st.button("Validate and Search IFSC"):
     
-    # --- Step 1: Validate Input ---
-    if not ifsc_input:
-        st.warning("Please enter an IFSC code to search.")
-        st.stop()
+        # --- Step 1: Validate Input ---
+        if not ifsc_input:
+            st.warning("Please enter an IFSC code to search.")
+            st.stop()
         
-    if not validate_ifsc_format(ifsc_input):
-        st.error(
-            f"❌ Invalid IFSC Format: '{ifsc_input}'. Must be 4 letters, '0', then 6 alphanumeric characters."
-        )
-        st.stop()
+        if not validate_ifsc_format(ifsc_input):
+            st.error(
+                f"❌ Invalid IFSC Format: '{ifsc_input}'. Must be 4 letters, '0', then 6 alphanumeric characters."
+            )
+            st.stop()
     
-    # --- Step 2: Call API ---
-    with st.spinner(f"Searching for {ifsc_input}..."):
-        # Use a local variable, not session_state
-        result = check_ifsc_exists(ifsc_input)
+        # --- Step 2: Call API ---
+        with st.spinner(f"Searching for {ifsc_input}..."):
+            # Use a local variable, not session_state
+            result = check_ifsc_exists(ifsc_input)
         
-    # --- Step 3: Display Results ---
-    st.header(":blue[Verification Result]")
-    st.subheader(":grey[Details]", divider="grey", width="content")
+        # --- Step 3: Display Results ---
+        st.header(":blue[Verification Result]")
+        st.subheader(":grey[Details]", divider="grey", width="content")
     
-    if result['status'] == 'success':
-        data = result['data']
-        st.success(f"✅ IFSC Code Found and Verified!")
+        if result['status'] == 'success':
+            data = result['data']
+            st.success(f"✅ IFSC Code Found and Verified!")
         
-        col1, col2, col3 = st.columns(3)
-        col1.metric(":green[Bank Name]", data.get("BANK"))
-        col2.metric(":blue[Branch Name]", data.get("BRANCH"))
-        col3.metric(":orange[City / District]", f"{data.get('CITY')} / {data.get('DISTRICT')}")
+            col1, col2, col3 = st.columns(3)
+            col1.metric(":green[Bank Name]", data.get("BANK"))
+            col2.metric(":blue[Branch Name]", data.get("BRANCH"))
+            col3.metric(":orange[City / District]", f"{data.get('CITY')} / {data.get('DISTRICT')}")
 
-        st.info(f"**Address:** {data.get('ADDRESS')}")
+            st.info(f"**Address:** {data.get('ADDRESS')}")
         
-        with st.expander("Show Full Response Data"):
-            df = pd.DataFrame(data.items(), columns=['Key', 'Value'])
-            df['Value'] = df['Value'].astype(str)
-            st.dataframe(df, hide_index=True)
+            with st.expander("Show Full Response Data"):
+                df = pd.DataFrame(data.items(), columns=['Key', 'Value'])
+                df['Value'] = df['Value'].astype(str)
+                st.dataframe(df, hide_index=True)
 
-    elif result['status'] == 'error':
-        st.error(f"⚠️ Search Failed: {result['message']}")
+        elif result['status'] == 'error':
+            st.error(f"⚠️ Search Failed: {result['message']}")
         
-        if result['data']:
-            with st.expander("Show Detailed Error Data"):
-                st.json(result['data'])
-else:
-    # This message is shown only when the button has not been clicked in the current run
-    st.info("Enter an IFSC code and click search to see the results.")
\ No newline at end of file
+            if result['data']:
+                with st.expander("Show Detailed Error Data"):
+                    st.json(result['data'])
+    else:
+        # This message is shown only when the button has not been clicked in the current run
+        st.info("Enter an IFSC code and click search to see the results.")
\ No newline at end of file
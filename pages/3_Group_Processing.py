@@ -0,0 +1,187 @@
+# pages/3_Group_Processing.py
+
+import logging
+from functools import partial
+import streamlit as st
+
+from config.state_manager import initialize_session_state
+from src.ui import paginated_preview, job_progress, validation_error
+from src.features.esi_pf_challan import (
+    COMPANIES, PROFILES, process_many, compute_totals, combine_totals, save_esi_excel, save_pf_custom_sep, result_store,
+    job_queue, snapshot, CANCELLED, FAILED,
+)
+from src.monitoring import PAGE_ERRORS
+
+log = logging.getLogger("pages.group_processing")
+
+st.set_page_config(layout="wide", initial_sidebar_state="collapsed")
+
+initialize_session_state()
+
+st.title(":green[🏢 Group Processing]")
+st.markdown("Process many establishments in one go. Each establishment is calculated in its own worker.")
+
+
+def run_group(job, jobs, upload_ids):
+    """
+    Background job: processes every establishment, stores each one's frames and works out the group totals once.
+
+    Returns:
+        dict: The new st.session_state.group_results.
+    """
+    results = process_many(jobs, progress=job.report)
+    job.report("Storing results", 1.0)
+    succeeded = {name: r for name, r in results.items() if not isinstance(r, Exception)}
+    summary_df = combine_totals({name: compute_totals(r["pf_df"], r["esi_df"]) for name, r in succeeded.items()}) if succeeded else None
+    handles = {name: r if isinstance(r, Exception) else result_store.put(r) for name, r in results.items()}
+    return {"results": handles, "summary": summary_df, "upload_ids": upload_ids}
+
+
+# ===== Step 1: Establishments =====
+st.header(":blue[Step 1: Establishments and Files]")
+
+count = st.number_input("Number of establishments", min_value=1, max_value=50, value=2, step=1)
+
+jobs = {}         # name -> (company, pf_payroll, esi_payroll, pf_members, esi_members)
+upload_ids = {}   # name -> uploaded file ids, to detect changes after processing
+incomplete = []
+
+for i in range(int(count)):
+    with st.expander(f"Establishment {i + 1}", expanded=st.session_state.group_results is None):
+        name_cols = st.columns(2)
+        name = name_cols[0].text_input("Name / PF code", value=f"Establishment {i + 1}", key=f"group_name_{i}").strip()
+        company = name_cols[1].selectbox("Company", COMPANIES, key=f"group_company_{i}")
+
+        single_payroll = PROFILES[company].single_payroll
+        upload_cols = st.columns(3 if single_payroll else 4)
+        if single_payroll:
+            pf_payroll = esi_payroll = upload_cols[0].file_uploader("Payroll (.xlsx)", type=["xlsx"], key=f"group_payroll_{i}")
+            col_offset = 1
+        else:
+            pf_payroll = upload_cols[0].file_uploader("PF Payroll (.xlsx)", type=["xlsx"], key=f"group_pf_payroll_{i}")
+            esi_payroll = upload_cols[1].file_uploader("ESI Payroll (.xlsx)", type=["xlsx"], key=f"group_esi_payroll_{i}")
+            col_offset = 2
+        pf_members = upload_cols[col_offset].file_uploader("PF Active Members (.csv)", type=["csv"], key=f"group_pf_members_{i}")
+        esi_members = upload_cols[col_offset + 1].file_uploader("ESI Employees (.xls/.xlsx)", type=["xls", "xlsx"], key=f"group_esi_members_{i}")
+
+    files = (pf_payroll, esi_payroll, pf_members, esi_members)
+    if not name or name in jobs or name in incomplete:
+        st.warning(f"Establishment {i + 1}: please give it a unique name.")
+        incomplete.append(name)
+    elif any(f is None for f in files):
+        incomplete.append(name)
+    else:
+        jobs[name] = (company, *files)
+        upload_ids[name] = (company,) + tuple(f.file_id for f in files)
+
+
+# ===== Step 2: Processing =====
+st.header(":blue[Step 2: Processing]")
+
+if incomplete:
+    st.info(f"{len(jobs)} of {int(count)} establishments have all files uploaded.")
+
+group_job = job_queue.get(st.session_state.group_job)
+if group_job is not None and group_job.finished:
+    job_queue.discard(group_job.id)
+    st.session_state.group_job = None
+    if group_job.status == CANCELLED:
+        st.warning("Processing was cancelled.")
+    elif group_job.status == FAILED:
+        st.error(f"An unexpected error occurred during processing: {group_job.error}")
+        PAGE_ERRORS.inc(page="group_processing", kind="unexpected")
+        log.error("group processing failed", exc_info=group_job.error, extra={"job_id": group_job.id})
+    else:
+        if st.session_state.group_results:
+            for old in st.session_state.group_results["results"].values():
+                if isinstance(old, str):
+                    result_store.discard(old)
+        st.session_state.group_results = group_job.result
+    group_job = None
+
+if st.button("⚙️ Process All", disabled=not jobs or group_job is not None):
+    # The job gets its own copies of the uploads; earlier results stay reviewable meanwhile
+    snapshots = {name: (company, *(snapshot(f) for f in files)) for name, (company, *files) in jobs.items()}
+    group_job = job_queue.submit(partial(run_group, jobs=snapshots, upload_ids=upload_ids), label=f"Processing {len(jobs)} establishments", kind="group")
+    st.session_state.group_job = group_job.id
+
+if group_job is not None:
+    job_progress(group_job.id, "group_job")
+
+
+# ===== Step 3: Review =====
+group_results = st.session_state.group_results
+
+if group_results:
+    results = group_results["results"]
+    st.header(":blue[Step 3: Review]")
+
+    if group_results["upload_ids"] != upload_ids:
+        st.warning("Establishments or files changed since the last run. Click **Process All** to refresh the results.")
+
+    failed = {name: r for name, r in results.items() if isinstance(r, Exception)}
+
+    # --- Group totals (same figures as the calculator page's Totals Summary) ---
+    summary_df = group_results["summary"]
+    if summary_df is not None:
+        group_total = summary_df.loc["Group Total"]
+
+        st.subheader(":grey[Group Totals Summary]", divider="grey", width="content")
+        sum_cols = st.columns(4)
+        with sum_cols[0]:
+            st.metric(":blue[Total Number of Employees]", int(group_total["Employees"]), border=True)
+        with sum_cols[1]:
+            st.metric(":green[PF Gross Wages]", int(group_total["PF Gross Wages"]), border=True)
+        with sum_cols[2]:
+            st.metric(":red[ESI Total Days]", int(group_total["ESI Total Days"]), border=True)
+        with sum_cols[3]:
+            st.metric(":orange[ESI Gross Wages]", int(group_total["ESI Gross Wages"]), border=True)
+        st.dataframe(summary_df, width='stretch')
+
+    if failed:
+        st.error(f"{len(failed)} establishment(s) failed: {', '.join(failed)}")
+
+    # --- Per-establishment review (one at a time, so reruns stay cheap) ---
+    st.subheader(":grey[Review Establishment]", divider="grey", width="content")
+    selected = st.selectbox(
+        "Select establishment",
+        list(results),
+        format_func=lambda n: f"{'❌' if isinstance(results[n], Exception) else '✅'} {n}",
+        key="group_review_select",
+    )
+    result = results.get(selected)
+    frames = result_store.get(result) if isinstance(result, str) else None
+
+    if isinstance(result, ValueError):
+        validation_error(result, "Processing Error:", key="group_validation_error_csv")
+    elif isinstance(result, Exception):
+        st.error(f"Processing Error:\n```\n{result}\n```")
+    elif result is not None and frames is None:
+        st.warning("These results were released after a period of inactivity. Click **Process All** to recalculate them.")
+    elif frames is not None:
+        with st.expander("📊 Preview Names of Labours (PF)"):
+            paginated_preview(frames["verify_pf"], "group_verify_pf", search_cols=["UAN", "Name in Payment Sheet", "Name in Active List"])
+        with st.expander("📊 Preview Names of Labours (ESI)"):
+            paginated_preview(frames["verify_esi"], "group_verify_esi", search_cols=["IP Number", "Name in Payment Sheet", "Name in ESI Active List"])
+        with st.expander("📊 Preview Processed PF Data"):
+            paginated_preview(frames["pf_df"], "group_pf_preview", search_cols=["UAN", "MEMBER_NAME"])
+        with st.expander("📊 Preview Processed ESI Data"):
+            paginated_preview(frames["esi_df"], "group_esi_preview", search_cols=["IP Number", "IP Name"])
+
+        download_cols = st.columns(8)
+        with download_cols[0]:
+            st.download_button(
+                label="📥 Download PF File",
+                data=result_store.file(result, "pf", lambda: save_pf_custom_sep(frames["pf_df"], sep="#~#", header=False).encode("utf-8")),
+                file_name=f"{selected}_PF_CHALLAN.txt",
+                mime="text/plain",
+            )
+        with download_cols[1]:
+            st.download_button(
+                label="📥 Download ESI File",
+                data=result_store.file(result, "esi", lambda: save_esi_excel(frames["esi_df"]).getvalue()),
+                file_name=f"{selected}_ESI_CHALLAN.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+else:
+    st.info("Upload files for each establishment and click Process All.")
@@ -1,3 +1,64 @@
-from .Somany.calculate import calculate_pf as somany_pf, calculate_esi as somany_esi
-from .HNG.calculate import calculate_pf as hng_pf, calculate_esi as hng_esi
-from .helpers.save_output import save_pf_custom_sep, save_esi_excel
\ No newline at end of file
+# Names are imported from their modules on first use (PEP 562), so importing the
+# package (or one name from it) does not load pandas, openpyxl or the company
+# pipelines up front. Add new exports to _EXPORTS. Modules here import streamlit
+# only for annotations (under TYPE_CHECKING), so the batch CLI and worker
+# processes never load it.
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    ".Somany.calculate": {"somany_pf": "calculate_pf", "somany_esi": "calculate_esi", "read_somany_payroll": "read_payroll"},
+    ".HNG.calculate": {"hng_pf": "calculate_pf", "hng_esi": "calculate_esi"},
+    ".helpers.save_output": ["save_pf_custom_sep", "iter_pf_custom_sep", "save_esi_excel"],
+    ".profiles": ["PROFILES", "CompanyProfile", "load_profile"],
+    ".engine": ["CompanyPipeline", "pipeline"],
+    ".runner": ["COMPANIES", "process_company", "cached_process_company", "process_many", "stream_company"],
+    ".jobs": ["job_queue", "snapshot", "JobCancelled", "CANCELLED", "FAILED"],
+    ".helpers.result_cache": ["result_cache", "file_digest"],
+    ".helpers.result_store": ["result_store", "frame_to_bytes", "frame_from_bytes"],
+    ".helpers.summary": ["compute_totals", "combine_totals"],
+    ".helpers.validation": ["ValidationError"],
+    ".helpers.diagnostics": ["record_stages", "stage", "StageLog", "DIAGNOSTICS_COLUMNS"],
+    ".helpers.member_master": ["member_master", "read_pf_members", "read_esi_members"],
+    ".helpers.incremental": ["RowReuse", "baseline_store", "diff_challans"],
+    ".helpers.name_match": ["DEFAULT_NAME_THRESHOLD", "name_scores", "normalize_names"],
+}
+
+# Exported name -> (module, attribute)
+_LAZY = {}
+for _module, _names in _EXPORTS.items():
+    for _name, _attribute in (_names.items() if isinstance(_names, dict) else zip(_names, _names)):
+        _LAZY[_name] = (_module, _attribute)
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY[name]
+    value = getattr(importlib.import_module(module, __name__), attribute)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .Somany.calculate import calculate_pf as somany_pf, calculate_esi as somany_esi, read_payroll as read_somany_payroll
+    from .HNG.calculate import calculate_pf as hng_pf, calculate_esi as hng_esi
+    from .helpers.save_output import save_pf_custom_sep, iter_pf_custom_sep, save_esi_excel
+    from .profiles import PROFILES, CompanyProfile, load_profile
+    from .engine import CompanyPipeline, pipeline
+    from .runner import COMPANIES, process_company, cached_process_company, process_many, stream_company
+    from .jobs import job_queue, snapshot, JobCancelled, CANCELLED, FAILED
+    from .helpers.result_cache import result_cache, file_digest
+    from .helpers.result_store import result_store, frame_to_bytes, frame_from_bytes
+    from .helpers.summary import compute_totals, combine_totals
+    from .helpers.validation import ValidationError
+    from .helpers.diagnostics import record_stages, stage, StageLog, DIAGNOSTICS_COLUMNS
+    from .helpers.member_master import member_master, read_pf_members, read_esi_members
+    from .helpers.incremental import RowReuse, baseline_store, diff_challans
+    from .helpers.name_match import DEFAULT_NAME_THRESHOLD, name_scores, normalize_names
@@ -0,0 +1,41 @@
+# Headless batch challan generation:
+#   python -m src.features.esi_pf_challan manifest.json [--workers N] [--chunk-size ROWS]
+
+import argparse
+import sys
+import time
+
+from .batch import load_manifest, run_batch, format_summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.features.esi_pf_challan",
+        description="Generate PF/ESI challan files for every establishment listed in a manifest.",
+    )
+    parser.add_argument("manifest", help="JSON manifest of jobs (see batch.load_manifest for the format)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help="Stream payrolls in batches of this many rows to bound memory (skips the name comparison)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Invalid manifest: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    summaries = run_batch(jobs, max_workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(summaries))
+    failed = sum(s["status"] != "ok" for s in summaries)
+    print(f"{len(summaries) - failed} succeeded, {failed} failed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
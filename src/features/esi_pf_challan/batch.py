@@ -0,0 +1,147 @@
+import json
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tabulate import tabulate
+
+from .runner import COMPANIES, process_company, stream_company
+from .profiles import PROFILES
+from .helpers.save_output import iter_pf_custom_sep, save_esi_excel
+from .helpers.validation import ValidationError
+
+PF_OUTPUT_NAME = "PF_CHALLAN.txt"
+ESI_OUTPUT_NAME = "ESI_CHALLAN.xlsx"
+ERROR_OUTPUT_NAME = "ERRORS.txt"
+# Every offending row of a validation error (ERRORS.txt only shows the first few)
+ERROR_ROWS_NAME = "ERRORS.csv"
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Loads and validates a batch manifest (a JSON list of jobs, see README).
+
+    Single-payroll companies give "payroll"; relative paths are resolved against the manifest's directory.
+
+    Returns:
+        List[Dict[str, Any]]: Jobs with absolute paths and "pf_payroll"/"esi_payroll" always set.
+
+    Raises:
+        ValueError: If an entry has an unknown company or is missing a required key.
+    """
+    manifest_path = Path(manifest_path)
+    base_dir = manifest_path.parent
+    entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise ValueError("Manifest must be a JSON list of jobs.")
+
+    jobs = []
+    for i, entry in enumerate(entries, start=1):
+        name = entry.get("name") or f"job-{i}"
+        company = entry.get("company")
+        if company not in COMPANIES:
+            raise ValueError(f"{name}: unknown company {company!r} (expected one of {COMPANIES})")
+
+        job = dict(entry, name=name)
+        if PROFILES[company].single_payroll:
+            job.setdefault("pf_payroll", entry.get("payroll"))
+            job.setdefault("esi_payroll", entry.get("payroll"))
+
+        required = ["pf_payroll", "esi_payroll", "pf_members", "esi_members", "output_dir"]
+        missing = [key for key in required if not job.get(key)]
+        if missing:
+            raise ValueError(f"{name}: missing {', '.join(missing)}")
+
+        for key in required:
+            job[key] = str((base_dir / job[key]).resolve())
+        jobs.append(job)
+    return jobs
+
+
+def run_job(job: Dict[str, Any], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Calculates PF/ESI for one manifest entry and writes the challan files, streaming when chunk_size is given.
+
+    Never raises: failures go into the returned summary and ERRORS.txt (ERRORS.csv for validation errors).
+    """
+    start = time.perf_counter()
+    output_dir = Path(job["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = {"name": job["name"], "company": job["company"], "status": "ok", "pf_rows": None, "esi_rows": None, "message": ""}
+
+    try:
+        if chunk_size:
+            summary.update(_stream_job(job, output_dir, chunk_size))
+            summary["seconds"] = round(time.perf_counter() - start, 2)
+            return summary
+
+        results = process_company(
+            job["company"],
+            Path(job["pf_payroll"]),
+            Path(job["esi_payroll"]),
+            Path(job["pf_members"]),
+            Path(job["esi_members"]),
+        )
+        with open(output_dir / PF_OUTPUT_NAME, "wb") as fh:
+            fh.writelines(iter_pf_custom_sep(results["pf_df"], sep="#~#", header=False))
+        (output_dir / ESI_OUTPUT_NAME).write_bytes(save_esi_excel(results["esi_df"]).getvalue())
+        summary["pf_rows"] = len(results["pf_df"])
+        summary["esi_rows"] = len(results["esi_df"])
+    except Exception as e:
+        # Validation errors carry a table of bad rows; keep only the headline in the summary
+        summary["status"] = "failed"
+        summary["message"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+        (output_dir / ERROR_OUTPUT_NAME).write_text(traceback.format_exc(), encoding="utf-8")
+        if isinstance(e, ValidationError):
+            summary["message"] = f"{e.message} {e.count} rows (see {ERROR_ROWS_NAME})"
+            (output_dir / ERROR_ROWS_NAME).write_bytes(e.to_csv())
+
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    return summary
+
+
+def _stream_job(job: Dict[str, Any], output_dir: Path, chunk_size: int) -> Dict[str, int]:
+    # Write to temporary names so a failed run never leaves a half-written challan behind
+    pf_path, esi_path = output_dir / PF_OUTPUT_NAME, output_dir / ESI_OUTPUT_NAME
+    pf_tmp, esi_tmp = pf_path.with_suffix(".part"), esi_path.with_name(esi_path.name + ".part")
+    try:
+        with open(pf_tmp, "wb") as pf_out:
+            counts = stream_company(
+                job["company"],
+                Path(job["pf_payroll"]),
+                Path(job["esi_payroll"]),
+                Path(job["pf_members"]),
+                Path(job["esi_members"]),
+                pf_out,
+                str(esi_tmp),
+                chunk_size,
+            )
+        pf_tmp.replace(pf_path)
+        esi_tmp.replace(esi_path)
+    finally:
+        pf_tmp.unlink(missing_ok=True)
+        esi_tmp.unlink(missing_ok=True)
+    return counts
+
+
+def run_batch(jobs: List[Dict[str, Any]], max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Runs jobs in parallel across a process pool and returns their summaries in manifest order."""
+    if max_workers == 1:
+        return [run_job(job, chunk_size) for job in jobs]
+
+    summaries: Dict[int, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(run_job, job, chunk_size): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            summary = future.result()
+            print(f"[{summary['status']:>6}] {summary['name']} ({summary['seconds']}s)", flush=True)
+            summaries[futures[future]] = summary
+    return [summaries[i] for i in range(len(jobs))]
+
+
+def format_summary(summaries: List[Dict[str, Any]]) -> str:
+    headers = ["name", "company", "status", "pf_rows", "esi_rows", "seconds", "message"]
+    rows = [[s.get(h) for h in headers] for s in summaries]
+    return tabulate(rows, headers=headers, tablefmt="rounded_grid")
@@ -0,0 +1,337 @@
+import operator
+from functools import reduce
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+from .profiles import PROFILES, CompanyProfile, SheetName
+from .helpers.verification import verify_pf, verify_esi
+from .helpers.validation import check_rows
+from .helpers.contributions import RETIREMENT_AGE, EPF_WAGE_CAP, ages_on, pf_cutoff_date, pf_contributions, round_esi_days
+from .helpers.dtypes import TEXT_DTYPE, AMOUNT_DTYPE, ESI_NUMBER_COLUMNS, pf_dtypes, as_text, compact_amounts
+from .helpers.incremental import RowReuse
+from .helpers.diagnostics import stage
+from .helpers.excel_reader import read_sheet, read_sheets, iter_sheet_chunks
+from .helpers.save_output import iter_pf_custom_sep, write_esi_excel
+from .helpers.streaming import RowIssues, member_keys, parse_dobs, read_pf_member_dobs, read_esi_member_keys
+
+PF_MEMBER_COLUMNS = ["UAN", "Name", "Father's/Husband's Name", "DoB"]
+ESI_MEMBER_COLUMNS = ["empe_ip_number", "empe_name"]
+
+
+def _total(sheet: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """Row-wise sum of columns (a blank in any of them stays blank)."""
+    return reduce(operator.add, (sheet[col] for col in columns))
+
+
+class CompanyPipeline:
+    """
+    The PF and ESI calculators of one company, compiled from its profile.
+
+    The profile decides which sheets and columns are read and how wages are built from them.
+    """
+
+    def __init__(self, profile: CompanyProfile):
+        self.profile = profile
+        self.pf = profile.pf
+        self.esi = profile.esi
+        self.pf_row_inputs = profile.pf_row_inputs()
+
+    def __repr__(self) -> str:
+        return f"CompanyPipeline({self.profile.company!r})"
+
+    def read_payroll(self, payroll_file: "UploadedFile", parts=("pf", "esi")) -> Dict[SheetName, pd.DataFrame]:
+        """
+        Parses the payroll sheets used by the given parts in a single pass.
+
+        Args:
+            payroll_file (UploadedFile): Payroll workbook.
+            parts: "pf" and/or "esi".
+
+        Returns:
+            Dict[SheetName, pd.DataFrame]: Parsed sheets keyed by sheet name or index.
+        """
+        reads = self.profile.payroll_reads(parts)
+        with stage("read payroll") as record:
+            sheets = read_sheets(payroll_file, reads)
+            record.rows = len(next(iter(sheets.values())))
+        return sheets
+
+    # ===== PF =====
+
+    def calculate_pf(
+        self,
+        payroll_file: "UploadedFile",
+        active_pf_file: Union["UploadedFile", pd.DataFrame],
+        payroll_sheets: Optional[Dict[SheetName, pd.DataFrame]] = None,
+        reuse: Optional[RowReuse] = None,
+    ) -> List[pd.DataFrame]:
+        pf = self.pf
+        uan = pf["uan"]
+        if payroll_sheets is None:
+            payroll_sheets = self.read_payroll(payroll_file, parts=("pf",))
+        wages_sheet = payroll_sheets[pf["sheet"]]
+
+        with stage("read PF members") as record:
+            active_pf = self._read_pf_members(active_pf_file)
+            record.rows = len(active_pf)
+
+        with stage("merge PF members", rows=len(wages_sheet)):
+            wages_sheet = wages_sheet.merge(active_pf[["UAN", "DoB"]].rename(columns={"UAN": uan}), on=uan, how="left")
+            wages_sheet["DoB"] = parse_dobs(wages_sheet["DoB"], pf["dob_format"])
+        active_pf = as_text(active_pf[["UAN", "Name", "Father's/Husband's Name"]])
+
+        # clean up input data
+        check_rows("Missing UAN in WAGES sheet for the following rows:", wages_sheet[wages_sheet[uan].isna()], [pf["code"], pf["name"]])
+
+        if self.profile.ncp_sheet() != pf["sheet"]:
+            with stage("merge NCP days", rows=len(wages_sheet)):
+                wages_sheet = wages_sheet.merge(
+                    payroll_sheets[self.profile.ncp_sheet()][[uan, pf["ncp_days"]]],
+                    on=uan,
+                    how="left"  # keep only wages_sheet rows
+                )
+
+        if reuse is None:
+            out_df = self._pf_rows(wages_sheet)
+        else:
+            # Age only matters through EPS eligibility, which can change from one month to the next
+            inputs = wages_sheet[self.pf_row_inputs].assign(eps_eligible=ages_on(wages_sheet["DoB"], pf_cutoff_date()) < RETIREMENT_AGE)
+            out_df = reuse.rows(inputs, wages_sheet[uan], lambda rows: self._pf_rows(wages_sheet.loc[rows]))
+
+        payroll_df = out_df[["UAN", "MEMBER_NAME"]].copy()
+        payroll_df["father"] = wages_sheet[pf["father"]].astype(TEXT_DTYPE)
+        with stage("verify", rows=len(payroll_df)):
+            verify_df = verify_pf(payroll_df, active_pf)
+        return [verify_df, out_df]
+
+    def _read_pf_members(self, active_pf_file: Union["UploadedFile", pd.DataFrame]) -> pd.DataFrame:
+        """The PF member list with UANs typed like the payroll's (see uan_type)."""
+        as_numbers = self.pf["uan_type"] == "number"
+        if isinstance(active_pf_file, pd.DataFrame):
+            # From the member master: UANs are text there and DoB already parsed
+            if as_numbers:
+                return active_pf_file.assign(UAN=pd.to_numeric(active_pf_file["UAN"]))
+            return active_pf_file
+        return pd.read_csv(active_pf_file, usecols=PF_MEMBER_COLUMNS, dtype=None if as_numbers else {"UAN": str})
+
+    def _pf_rows(self, wages_sheet: pd.DataFrame) -> pd.DataFrame:
+        """Builds PF challan rows from payroll rows that already carry the member's DoB and NCP days."""
+        pf = self.pf
+        # age calculation
+        with stage("age calculation", rows=len(wages_sheet)):
+            ages = ages_on(wages_sheet["DoB"], pf_cutoff_date())
+
+        # Wage calculations
+        with stage("contributions", rows=len(wages_sheet)):
+            gross_wages = _total(wages_sheet, pf["gross_wages"])
+            epf_wages = gross_wages.clip(upper=EPF_WAGE_CAP) if pf["cap_epf_wages"] else gross_wages
+            contributions = pf_contributions(epf_wages, ages)
+
+        # Output DataFrame
+        out_df = pd.DataFrame({
+            "UAN": wages_sheet[pf["uan"]],
+            "MEMBER_NAME": wages_sheet[pf["name"]],
+            "GROSS_WAGES": gross_wages,
+            "EPF_WAGES": epf_wages,
+            "EPS_WAGES": contributions["EPS_WAGES"],
+            "EDLI_WAGES": wages_sheet[pf["edli_wages"]] if pf["edli_wages"] else epf_wages,
+            "EPF_CONTRI_REMITTED": contributions["EPF_CONTRI_REMITTED"],
+            "EPS_CONTRI_REMITTED": contributions["EPS_CONTRI_REMITTED"],
+            "EPF_EPS_DIFF_REMITTED": contributions["EPF_EPS_DIFF_REMITTED"],
+            pf["ncp_days_output"]: wages_sheet[pf["ncp_days"]],
+            "REFUND_OF_ADVANCES": 0
+        })
+
+        with stage("dtype conversion", rows=len(out_df)):
+            return out_df.astype(pf_dtypes(out_df.columns))
+
+    # ===== ESI =====
+
+    def calculate_esi(
+        self,
+        payroll_file: "UploadedFile",
+        active_esi_file: Union["UploadedFile", pd.DataFrame],
+        payroll_sheets: Optional[Dict[SheetName, pd.DataFrame]] = None,
+    ) -> List[pd.DataFrame]:
+        esi = self.esi
+        if payroll_sheets is None:
+            payroll_sheets = self.read_payroll(payroll_file, parts=("esi",))
+        wages_sheet = payroll_sheets[esi["sheet"]]
+        if esi["numbers_as_text"]:
+            wages_sheet = self._parse_esi_numbers(wages_sheet)
+
+        with stage("read ESI members") as record:
+            active_esi_df = self._read_esi_members(active_esi_file)
+            record.rows = len(active_esi_df)
+
+        # clean up input data
+        missing_esi = wages_sheet[wages_sheet[esi["esi_number"]].isna()]
+        check_rows("Missing ESI number in WAGES sheet for the following rows:", missing_esi, [esi["code"], esi["name"]])
+
+        out_df, _ = self._esi_rows(wages_sheet)
+
+        with stage("verify", rows=len(out_df)):
+            verify_esi_df = verify_esi(out_df, active_esi_df)
+
+        return [verify_esi_df, out_df]
+
+    def _read_esi_members(self, active_esi_file: Union["UploadedFile", pd.DataFrame]) -> pd.DataFrame:
+        """The ESI list of employees (portal .xls export, workbook or member master frame) as text columns."""
+        if isinstance(active_esi_file, pd.DataFrame):
+            active_esi_df = active_esi_file[ESI_MEMBER_COLUMNS]  # From the member master
+        elif Path(active_esi_file.name).suffix == ".xls":
+            active_esi_df = pd.read_html(active_esi_file)
+            if isinstance(active_esi_df, list):
+                active_esi_df = active_esi_df[0]
+        else:
+            active_esi_df = read_sheet(active_esi_file, usecols=lambda col: col in ESI_MEMBER_COLUMNS)
+        return as_text(active_esi_df.filter(items=ESI_MEMBER_COLUMNS))
+
+    def _parse_esi_numbers(self, wages_sheet: pd.DataFrame) -> pd.DataFrame:
+        """For numbers_as_text payrolls: days as Float64, wages as Int64 (unparseable -> <NA>), IP numbers as digit text."""
+        esi = self.esi
+        wages_sheet = wages_sheet.copy()
+        wages_sheet[esi["days"]] = wages_sheet[esi["days"]].astype("Float64")
+        for col in esi["wages"]:
+            wages_sheet[col] = pd.to_numeric(wages_sheet[col], errors="coerce").astype("Int64")
+        wages_sheet[esi["esi_number"]] = wages_sheet[esi["esi_number"]].astype("Int64").astype(TEXT_DTYPE)
+        return wages_sheet
+
+    def _esi_rows(self, wages_sheet: pd.DataFrame, ceil_count: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+        """Builds ESI challan rows; see round_esi_days for ceil_count."""
+        esi = self.esi
+        with stage("contributions", rows=len(wages_sheet)):
+            days, ceil_count = round_esi_days(wages_sheet[esi["days"]], ceil_count)
+            total_wages = _total(wages_sheet, esi["wages"])
+
+        # Output DataFrame
+        out_df = pd.DataFrame({
+            "IP Number": wages_sheet[esi["esi_number"]],
+            "IP Name": wages_sheet[esi["name"]],
+            "No of Days for which wages paid/payable during the month": days.astype(AMOUNT_DTYPE),
+            "Total Monthly Wages": compact_amounts(total_wages),
+            " Reason Code for Zero workings days(numeric only; provide 0 for all other reasons- Click on the link for reference)": "",
+            " Last Working Day": ""
+        })
+        # Numbers stay numeric until the workbook is written
+        with stage("dtype conversion", rows=len(out_df)):
+            out_df = out_df.astype({col: TEXT_DTYPE for col in out_df.columns if col not in ESI_NUMBER_COLUMNS})
+        return out_df, ceil_count
+
+    # ===== Streaming (bounded memory) =====
+
+    def _chunks(self, payroll_file: "UploadedFile", sheet: SheetName, usecols: List[str], chunk_size: int):
+        return iter_sheet_chunks(payroll_file, sheet, usecols=usecols, chunk_size=chunk_size, **self.profile.sheet_options.get(sheet, {}))
+
+    def stream_pf(self, payroll_file: "UploadedFile", active_pf_file: "UploadedFile", out: BinaryIO, chunk_size: int = 10000) -> int:
+        """
+        Writes the PF challan of a payroll to `out` batch by batch, chunk_size payroll rows at a time.
+
+        Produces the same lines as save_pf_custom_sep(calculate_pf(...)[1]) but skips the name comparison.
+
+        Returns:
+            int: Number of challan lines written.
+
+        Raises:
+            ValidationError: If UANs are missing or not in the active PF list (after scanning every batch).
+        """
+        pf = self.pf
+        uan = pf["uan"]
+        columns = self.profile.columns("pf")
+        dobs = read_pf_member_dobs(active_pf_file, pf["dob_format"] or None)
+        member_dobs = dobs.rename_axis(uan).reset_index()
+        ncp_sheet = self.profile.ncp_sheet()
+        ncp_days = None
+        if ncp_sheet != pf["sheet"]:
+            ncp_days = pd.concat([
+                chunk[[uan, pf["ncp_days"]]].assign(**{uan: lambda df: member_keys(df[uan])})
+                for chunk in self._chunks(payroll_file, ncp_sheet, columns[ncp_sheet], chunk_size)
+            ], ignore_index=True)
+
+        missing_uan = RowIssues("Missing UAN in WAGES sheet for the following rows:", [pf["code"], pf["name"]])
+        not_active = RowIssues("Error: The following UANs from WAGES sheet were not found in active PF list:", [uan, pf["name"]])
+
+        written = 0
+        for chunk in self._chunks(payroll_file, pf["sheet"], columns[pf["sheet"]], chunk_size):
+            missing = chunk[uan].isna()
+            missing_uan.add(chunk[missing])
+            chunk = chunk[~missing].assign(**{uan: lambda df: member_keys(df[uan])})
+
+            known = chunk[uan].isin(dobs.index)
+            not_active.add(chunk[~known])
+            if missing_uan.count or not_active.count:
+                continue  # Keep scanning so the error lists every bad row, but stop writing
+
+            # Merged like calculate_pf: a UAN repeated in the member list or NCP sheet repeats the row
+            chunk = chunk.merge(member_dobs, on=uan, how="left")
+            if ncp_days is not None:
+                chunk = chunk.merge(ncp_days, on=uan, how="left")
+            out_df = self._pf_rows(chunk)
+            out.writelines(iter_pf_custom_sep(out_df, sep="#~#", header=False, continued=written > 0))
+            written += len(out_df)
+
+        missing_uan.raise_if_any()
+        not_active.raise_if_any()
+        return written
+
+    def stream_esi(self, payroll_file: "UploadedFile", active_esi_file: "UploadedFile", output, chunk_size: int = 10000) -> int:
+        """
+        Writes the ESI challan workbook of a payroll to `output` (path or binary buffer) batch by batch.
+
+        The sheet is read twice, first to count fractional-day rows so they round as in calculate_esi.
+
+        Returns:
+            int: Number of challan rows written.
+
+        Raises:
+            ValidationError: If ESI numbers are missing or not in the ESI list of employees.
+        """
+        esi = self.esi
+        key, sheet = esi["esi_number"], esi["sheet"]
+        fractional = sum(
+            int((pd.to_numeric(c[esi["days"]]) % 1 != 0).sum())
+            for c in self._chunks(payroll_file, sheet, [esi["days"]], chunk_size)
+        )
+        member_index = read_esi_member_keys(active_esi_file)
+        missing_esi = RowIssues("Missing ESI number in WAGES sheet for the following rows:", [esi["code"], esi["name"]])
+        not_active = RowIssues("Error: The following ESI number from WAGES sheet were not found in ESI List of employees:", [key, esi["name"]])
+        written = 0
+
+        def batches():
+            nonlocal written
+            ceil_count = fractional // 2
+            for chunk in self._chunks(payroll_file, sheet, self.profile.columns("esi")[sheet], chunk_size):
+                missing = chunk[key].isna()
+                missing_esi.add(chunk[missing])
+                if esi["numbers_as_text"]:
+                    chunk = self._parse_esi_numbers(chunk[~missing])
+                else:
+                    chunk = chunk[~missing].assign(**{key: lambda df: member_keys(df[key])})
+                not_active.add(chunk[~chunk[key].isin(member_index)])
+                if missing_esi.count or not_active.count:
+                    continue
+                out_df, ceil_count = self._esi_rows(chunk, ceil_count)
+                written += len(out_df)
+                yield out_df
+            missing_esi.raise_if_any()
+            not_active.raise_if_any()
+
+        write_esi_excel(batches(), output)
+        return written
+
+
+_pipelines: Dict[str, CompanyPipeline] = {}
+
+
+def pipeline(company: str) -> CompanyPipeline:
+    """The compiled pipeline of a company in PROFILES (built once per process)."""
+    if company not in PROFILES:
+        raise ValueError(f"Unknown company: {company}")
+    if company not in _pipelines:
+        _pipelines[company] = CompanyPipeline(PROFILES[company])
+    return _pipelines[company]
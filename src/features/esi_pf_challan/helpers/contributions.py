@@ -0,0 +1,82 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# constants
+EPF_RATE = 0.12
+EPS_RATE = 0.0833
+EPF_WAGE_CAP = 15000
+RETIREMENT_AGE = 58
+
+
+def pf_cutoff_date(today: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+    """
+    Returns the date ages are measured on: the last day of the month before the processing month
+    (a run in August processes July, so 30 June).
+    """
+    today = pd.Timestamp.today() if today is None else today
+    processing_month = today - pd.DateOffset(months=1)  # July
+    return processing_month.replace(day=1) - pd.DateOffset(days=1)  # Last day of June
+
+
+def ages_on(dob: pd.Series, cutoff_date: pd.Timestamp) -> pd.Series:
+    """Completed years of age on cutoff_date for a Series of birth dates."""
+    return (
+        cutoff_date.year - dob.dt.year
+        - (
+            (cutoff_date.month < dob.dt.month) |
+            ((cutoff_date.month == dob.dt.month) &
+            (cutoff_date.day < dob.dt.day))
+        )
+    )
+
+
+def pf_contributions(epf_wages: pd.Series, ages: pd.Series) -> Dict[str, pd.Series]:
+    """
+    Computes EPS wages and the remitted contributions from EPF wages.
+
+    Members aged RETIREMENT_AGE or more (or with an unknown age) get no EPS wages.
+
+    Returns:
+        Dict[str, pd.Series]: EPS_WAGES, EPF_CONTRI_REMITTED, EPS_CONTRI_REMITTED and EPF_EPS_DIFF_REMITTED.
+    """
+    eps_wages = epf_wages.where(ages < RETIREMENT_AGE, 0)
+    epf_contri_remitted = round(epf_wages * EPF_RATE)
+    eps_contri_remitted = round(eps_wages * EPS_RATE)
+    return {
+        "EPS_WAGES": eps_wages,
+        "EPF_CONTRI_REMITTED": epf_contri_remitted,
+        "EPS_CONTRI_REMITTED": eps_contri_remitted,
+        "EPF_EPS_DIFF_REMITTED": epf_contri_remitted - eps_contri_remitted,
+    }
+
+
+def round_esi_days(days: pd.Series, ceil_count: Optional[int] = None) -> Tuple[pd.Series, int]:
+    """
+    Rounds fractional ESI days: the first half of fractional rows is rounded up, the rest down.
+
+    Args:
+        days (pd.Series): Days worked, possibly fractional.
+        ceil_count (Optional[int]): How many fractional rows to round up. Defaults to half of
+            this Series' fractional rows; pass the remaining budget when rounding in batches.
+
+    Returns:
+        Tuple[pd.Series, int]: Rounded days, and how many round-ups are left for later batches.
+    """
+    days = days.copy()
+
+    # Find fractional day rows
+    fractional_rows = days[days % 1 != 0]
+    if ceil_count is None:
+        ceil_count = len(fractional_rows) // 2
+    if not fractional_rows.empty:
+        # Keep row order for deterministic behavior
+        frac_indices = fractional_rows.index.to_numpy()
+        half = min(ceil_count, len(frac_indices))
+
+        # Apply ceil to first half, floor to second half
+        days.loc[frac_indices[:half]] = np.ceil(days.loc[frac_indices[:half]])
+        days.loc[frac_indices[half:]] = np.floor(days.loc[frac_indices[half:]])
+        ceil_count -= half
+    return days, ceil_count
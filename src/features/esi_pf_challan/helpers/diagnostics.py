@@ -0,0 +1,174 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from ....monitoring import registry
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+# The StageLog of the run in progress; None (the default) turns every stage() into a no-op
+_current: ContextVar[Optional["StageLog"]] = ContextVar("esi_pf_stage_log", default=None)
+
+DIAGNOSTICS_COLUMNS = ["stage", "seconds", "rows", "peak traced MiB", "peak RSS MiB"]
+
+# tracemalloc's peak is process-wide, so only one run at a time may reset and read it
+_TRACE_LOCK = threading.Lock()
+
+STAGE_SECONDS = registry.histogram("esi_pf_stage_seconds", "Time of each recorded calculation and file-writing stage.", ["stage"])
+
+
+def _peak_rss_mib() -> Optional[float]:
+    """Peak resident memory of the process so far (it never goes down)."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageRecord:
+    """One finished (or running) stage; set `rows` inside the with block when the count is only known then."""
+
+    __slots__ = ("name", "rows", "seconds", "peak_traced", "peak_rss_mib", "_start", "_start_traced")
+
+    def __init__(self, name: str, rows: Optional[int]):
+        self.name = name  # "PF / merge" for stage "merge" inside stage "PF"
+        self.rows = rows
+        self.seconds = 0.0
+        self.peak_traced = 0
+        self.peak_rss_mib: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "seconds": round(self.seconds, 4),
+            "rows": self.rows,
+            "peak traced MiB": round(self.peak_traced / 1024 / 1024, 2) if self.peak_traced else None,
+            "peak RSS MiB": round(self.peak_rss_mib, 1) if self.peak_rss_mib is not None else None,
+        }
+
+
+class StageLog:
+    """
+    Stages recorded by stage() while record_stages() is active, in the order they started.
+
+    Nested stages are named after their parent ("PF / merge"); traced memory is only measured when tracing is on.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.records: List[StageRecord] = []
+        self._open: List[StageRecord] = []
+
+    def _flush_peak(self) -> None:
+        # Credit the traced peak since the last reset to every open stage, then start a new interval
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self._open:
+            record.peak_traced = max(record.peak_traced, peak - record._start_traced)
+        tracemalloc.reset_peak()
+
+    def _enter(self, record: StageRecord) -> None:
+        if self.trace_memory:
+            self._flush_peak()
+            record._start_traced = tracemalloc.get_traced_memory()[0]
+        self.records.append(record)
+        self._open.append(record)
+        record._start = time.perf_counter()
+
+    def _exit(self, record: StageRecord) -> None:
+        record.seconds = time.perf_counter() - record._start
+        if self.trace_memory:
+            self._flush_peak()
+        self._open.pop()
+        record.peak_rss_mib = _peak_rss_mib()
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """The structured result: one dict per stage with DIAGNOSTICS_COLUMNS as keys."""
+        return [record.as_dict() for record in self.records]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.as_dicts(), columns=DIAGNOSTICS_COLUMNS).astype({"rows": "Int64"})
+
+
+class _Stage:
+    __slots__ = ("log", "record")
+
+    def __init__(self, log: StageLog, name: str, rows: Optional[int]):
+        self.log = log
+        self.record = StageRecord(f"{log._open[-1].name} / {name}" if log._open else name, rows)
+
+    def __enter__(self) -> StageRecord:
+        self.log._enter(self.record)
+        return self.record
+
+    def __exit__(self, *exc_info) -> None:
+        self.log._exit(self.record)
+
+
+class _NoStage:
+    """What stage() returns when nothing is recording: entering and leaving it does no work."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> StageRecord:
+        return _DISCARDED
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_DISCARDED = StageRecord("", None)  # rows set on it are ignored
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str, rows: Optional[int] = None):
+    """
+    Times the with block as stage `name` of the run being recorded, if any; the yielded record's rows can be set inside.
+
+    Args:
+        name (str): Stage name shown in the diagnostics.
+        rows (Optional[int]): Rows handled, when known up front.
+    """
+    log = _current.get()
+    if log is None:
+        return _NO_STAGE
+    return _Stage(log, name, rows)
+
+
+@contextmanager
+def record_stages(trace_memory: bool = False) -> Iterator[StageLog]:
+    """
+    Records every stage() entered in this thread/context until the block ends.
+
+    The stage times also go into the esi_pf_stage_seconds metric.
+
+    Args:
+        trace_memory (bool): Also measure peak Python/NumPy allocations per stage
+            with tracemalloc; while another block traces, this one records times only.
+
+    Yields:
+        StageLog: Filled in as the stages run.
+    """
+    traced = (trace_memory or tracemalloc.is_tracing()) and _TRACE_LOCK.acquire(blocking=False)
+    started_tracing = traced and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    log = StageLog(trace_memory=traced)
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+        if traced:
+            _TRACE_LOCK.release()
+        for record in log.records:
+            STAGE_SECONDS.observe(record.seconds, stage=record.name)
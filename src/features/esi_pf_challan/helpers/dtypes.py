@@ -0,0 +1,35 @@
+from typing import Dict, Iterable
+
+import pandas as pd
+
+from .summary import ESI_DAYS_COL, ESI_WAGES_COL
+
+# Arrow-backed text takes a fraction of the memory of Python str objects
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+# Wages, contributions and days all fit in 32 bits; nullable so blanks survive
+AMOUNT_DTYPE = "Int32"
+
+PF_TEXT_COLUMNS = ("UAN", "MEMBER_NAME")
+# Every other ESI challan column is text
+ESI_NUMBER_COLUMNS = (ESI_DAYS_COL, ESI_WAGES_COL)
+
+
+def pf_dtypes(columns: Iterable[str]) -> Dict[str, object]:
+    """astype() mapping for PF challan columns: TEXT_DTYPE for UAN and name, AMOUNT_DTYPE for the rest."""
+    return {col: TEXT_DTYPE if col in PF_TEXT_COLUMNS else AMOUNT_DTYPE for col in columns}
+
+
+def as_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts every column of df to TEXT_DTYPE; blanks stay <NA> instead of becoming "nan"."""
+    return df.astype(TEXT_DTYPE)
+
+
+def compact_amounts(series: pd.Series) -> pd.Series:
+    """
+    Stores whole-number amounts as AMOUNT_DTYPE.
+
+    Fractional amounts keep their float dtype so they are written exactly as before.
+    """
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype(AMOUNT_DTYPE)
+    return series
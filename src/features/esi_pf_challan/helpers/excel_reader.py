@@ -0,0 +1,130 @@
+import importlib.util
+import os
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+# Engines in order of preference. "calamine" (Rust, via the optional python-calamine
+# package) decodes large payrolls several times faster than openpyxl; "openpyxl" is
+# always installed and is what pandas uses by default.
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+}
+
+SheetName = Union[str, int]
+
+
+def available_engines() -> List[str]:
+    """Returns the installed Excel engines, fastest first."""
+    return [engine for engine, module in ENGINE_MODULES.items() if importlib.util.find_spec(module) is not None]
+
+
+def default_engine() -> str:
+    """Returns the engine used when none is given: ESI_PF_EXCEL_ENGINE if set, else the fastest installed one."""
+    forced = os.environ.get("ESI_PF_EXCEL_ENGINE")
+    if forced:
+        if forced not in ENGINE_MODULES:
+            raise ValueError(f"Unknown Excel engine {forced!r} (expected one of {list(ENGINE_MODULES)})")
+        return forced
+    return available_engines()[0]
+
+
+def read_sheets(file, sheets: Dict[SheetName, Dict[str, Any]], engine: Optional[str] = None) -> Dict[SheetName, pd.DataFrame]:
+    """
+    Opens a workbook once and parses several sheets from it, each with its own options.
+
+    Args:
+        file: Uploaded file, buffer or path of an .xlsx workbook.
+        sheets (Dict[SheetName, Dict[str, Any]]): Sheet name/index -> pandas parse options
+            (usecols, header, skipfooter, dtype, ...).
+        engine (Optional[str]): Excel engine; defaults to default_engine().
+
+    Returns:
+        Dict[SheetName, pd.DataFrame]: Parsed sheets keyed like `sheets`.
+    """
+    with pd.ExcelFile(file, engine=engine or default_engine()) as workbook:
+        return {sheet: workbook.parse(sheet, **options) for sheet, options in sheets.items()}
+
+
+def read_sheet(file, sheet_name: SheetName = 0, engine: Optional[str] = None, **options) -> pd.DataFrame:
+    """Parses a single sheet; see read_sheets for the options."""
+    return read_sheets(file, {sheet_name: options}, engine=engine)[sheet_name]
+
+
+def iter_sheet_chunks(
+    file,
+    sheet_name: SheetName = 0,
+    usecols: Optional[List[str]] = None,
+    header: int = 0,
+    skipfooter: int = 0,
+    chunk_size: int = 10000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a sheet as DataFrames of at most chunk_size rows, read with openpyxl in read-only mode.
+
+    Row labels match read_sheet(); unlike it, numeric-looking text is not converted to numbers.
+
+    Args:
+        file: Uploaded file, buffer or path of an .xlsx workbook.
+        sheet_name (SheetName): Sheet name or 0-based index.
+        usecols (Optional[List[str]]): Header names to keep (all columns if None).
+        header (int): 0-based row number holding the column names.
+        skipfooter (int): Number of trailing data rows (e.g. totals) to drop.
+        chunk_size (int): Rows per yielded DataFrame.
+
+    Raises:
+        ValueError: If a column in usecols is not in the header row.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = sheet.iter_rows(min_row=header + 1, values_only=True)
+
+        header_row = next(rows, ())
+        names = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header_row)]
+        wanted = usecols if usecols is not None else names
+        missing = [col for col in wanted if col not in names]
+        if missing:
+            raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+        positions = [names.index(col) for col in wanted]
+        width = len(names)
+
+        # Hold back `skipfooter` rows so footer rows are never emitted
+        pending: Deque[tuple] = deque()
+        batch: List[tuple] = []
+        row_number = 0
+        blank_rows = 0  # held back until a non-blank row shows they are not trailing
+
+        def to_frame(batch_rows):
+            nonlocal row_number
+            frame = pd.DataFrame(batch_rows, columns=wanted, index=range(row_number, row_number + len(batch_rows)))
+            row_number += len(batch_rows)
+            return frame
+
+        for row in rows:
+            if not any(value is not None for value in row):
+                blank_rows += 1
+                continue
+            row = tuple(row) + (None,) * (width - len(row))
+            values = [(None,) * len(positions)] * blank_rows
+            blank_rows = 0
+            # Whole-number floats become ints, as pandas' own Excel readers do
+            values.append(tuple(
+                int(row[i]) if isinstance(row[i], float) and row[i].is_integer() else row[i]
+                for i in positions
+            ))
+            for value in values:
+                pending.append(value)
+                if len(pending) > skipfooter:
+                    batch.append(pending.popleft())
+                    if len(batch) == chunk_size:
+                        yield to_frame(batch)
+                        batch = []
+        if batch:
+            yield to_frame(batch)
+    finally:
+        workbook.close()
@@ -0,0 +1,165 @@
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from .result_store import frame_from_bytes, frame_to_bytes
+
+KEY_COL = "_key"
+SIGNATURE_COL = "_signature"
+
+DEFAULT_BASELINE_DIR = Path(__file__).resolve().parents[4] / "data" / "baselines"
+
+CHANGE_NEW = "New"
+CHANGE_LEFT = "Left"
+CHANGE_CHANGED = "Changed"
+
+
+def row_signatures(inputs: pd.DataFrame) -> pd.Series:
+    """64-bit hash of each row's values; equal inputs give equal signatures."""
+    return pd.util.hash_pandas_object(inputs, index=False)
+
+
+class RowReuse:
+    """
+    Reuses challan rows from a previous run whose key (UAN) and inputs have not changed.
+
+    Afterwards `baseline` holds this run's rows for next time.
+    """
+
+    def __init__(self, baseline: Optional[pd.DataFrame] = None):
+        self.previous = baseline
+        self.baseline: Optional[pd.DataFrame] = None
+        self.reused = 0
+        self.recomputed = 0
+
+    def rows(self, inputs: pd.DataFrame, keys: pd.Series, build_rows: Callable[[pd.Index], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Returns the output rows, copied from the baseline where unchanged and built otherwise.
+
+        Args:
+            inputs (pd.DataFrame): Every value a row's output depends on, one row per payroll row.
+            keys (pd.Series): Member key per payroll row (same index as inputs).
+            build_rows (Callable[[pd.Index], pd.DataFrame]): Builds output rows for the given payroll row labels.
+
+        Returns:
+            pd.DataFrame: Output rows in payroll order, indexed like inputs.
+        """
+        signatures = row_signatures(inputs)
+        keys = keys.astype(str)
+        reusable = pd.Series(False, index=inputs.index)
+        if self.previous is not None and not self.previous.empty:
+            previous = self.previous.drop_duplicates(subset=KEY_COL, keep=False).set_index(KEY_COL)
+            # Duplicate keys in this payroll are ambiguous; always rebuild them
+            reusable = keys.map(previous[SIGNATURE_COL]).eq(signatures) & ~keys.duplicated(keep=False)
+
+        fresh = build_rows(inputs.index[~reusable.to_numpy()])
+        parts = [fresh]
+        if reusable.any():
+            reused = previous.loc[keys[reusable], fresh.columns]
+            reused.index = inputs.index[reusable.to_numpy()]
+            parts.append(reused.astype(fresh.dtypes.to_dict()))
+        out_df = pd.concat(parts).reindex(inputs.index) if len(parts) > 1 else fresh
+
+        self.reused = int(reusable.sum())
+        self.recomputed = len(inputs) - self.reused
+        self.baseline = out_df.assign(**{KEY_COL: keys.to_numpy(), SIGNATURE_COL: signatures.to_numpy()}).reset_index(drop=True)
+        return out_df
+
+
+def diff_challans(previous: Optional[pd.DataFrame], current: pd.DataFrame, key: str, name: str) -> pd.DataFrame:
+    """
+    Lists members who are new, have left, or whose challan values changed since the previous run.
+
+    Args:
+        previous (Optional[pd.DataFrame]): Last run's challan rows (None: everyone is new).
+        current (pd.DataFrame): This run's challan rows.
+        key (str): Member key column ("UAN" / "IP Number").
+        name (str): Member name column.
+
+    Returns:
+        pd.DataFrame: key, name, "Change" and "Details" ("COLUMN: old → new; ...") per changed member.
+    """
+    value_cols = [col for col in current.columns if col != key and not col.startswith("_")]
+    if previous is None:
+        previous = current.iloc[0:0]
+    previous = previous.drop_duplicates(subset=key).astype({key: str})
+    current = current.drop_duplicates(subset=key).astype({key: str})
+
+    merged = current[[key] + value_cols].merge(
+        previous[[key] + value_cols], on=key, how="outer", suffixes=("", "_previous"), indicator=True,
+    )
+    both = merged["_merge"] == "both"
+    details = pd.Series("", index=merged.index)
+    for col in value_cols:
+        new, old = merged[col].astype("string"), merged[f"{col}_previous"].astype("string")
+        differs = both & ~(new.eq(old).fillna(False) | (new.isna() & old.isna()))
+        details[differs] = details[differs] + col + ": " + old[differs].fillna("") + " → " + new[differs].fillna("") + "; "
+
+    change = pd.Series(CHANGE_CHANGED, index=merged.index)
+    change[merged["_merge"] == "left_only"] = CHANGE_NEW
+    change[merged["_merge"] == "right_only"] = CHANGE_LEFT
+    keep = ~both | (details != "")
+
+    changes = pd.DataFrame({
+        key: merged[key],
+        name: merged[name].fillna(merged[f"{name}_previous"]),
+        "Change": change,
+        "Details": details.str.rstrip("; "),
+    })[keep]
+    changes.index = range(1, len(changes) + 1)
+    return changes
+
+
+class BaselineStore:
+    """
+    Last approved challan rows per establishment, one Arrow IPC file each under a data directory.
+
+    Files are replaced atomically and read without pickle; older *.pkl baselines are ignored.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, establishment: str) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", establishment.strip()) or "default"
+        return self.directory / f"{slug}.arrow"
+
+    def load(self, establishment: str) -> Optional[Dict[str, Any]]:
+        """Returns {"pf", "esi", "saved_at"} for the establishment, or None if nothing was saved."""
+        path = self._path(establishment)
+        if not path.exists():
+            return None
+        with pa.OSFile(str(path), "rb") as source:
+            table = pa.ipc.open_file(source).read_all()
+        frames = dict(zip(table["frame"].to_pylist(), table["data"].to_pylist()))
+        return {
+            "pf": frame_from_bytes(frames["pf"]) if "pf" in frames else None,
+            "esi": frame_from_bytes(frames["esi"]) if "esi" in frames else None,
+            "saved_at": table.schema.metadata[b"saved_at"].decode(),
+        }
+
+    def save(self, establishment: str, pf_baseline: pd.DataFrame, esi_df: pd.DataFrame) -> None:
+        """Stores this run's rows (RowReuse.baseline for PF) as the establishment's new baseline."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(establishment)
+        tmp = path.with_name(path.name + ".part")
+        frames = {name: frame_to_bytes(df) for name, df in [("pf", pf_baseline), ("esi", esi_df)] if df is not None}
+        table = pa.table(
+            {"frame": list(frames), "data": pa.array(list(frames.values()), pa.large_binary())},
+            metadata={"saved_at": time.strftime("%Y-%m-%d %H:%M:%S")},
+        )
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        tmp.replace(path)
+
+    def establishments(self) -> List[str]:
+        return sorted(path.stem for path in self.directory.glob("*.arrow"))
+
+
+# ESI_PF_BASELINE_DIR moves the baselines
+baseline_store = BaselineStore(Path(os.environ.get("ESI_PF_BASELINE_DIR") or DEFAULT_BASELINE_DIR))
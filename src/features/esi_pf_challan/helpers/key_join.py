@@ -0,0 +1,62 @@
+from typing import Dict, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class KeyJoin(NamedTuple):
+    """Result of join_on_key; every frame keeps the row labels of the side it came from."""
+
+    joined: pd.DataFrame  # Every payroll row (in order) with the active member's columns alongside; <NA> where unmatched
+    missing_from_active: pd.DataFrame  # Payroll rows whose key is not in the active list
+    missing_from_payroll: pd.DataFrame  # Active members without a payroll row
+    duplicate_payroll: pd.DataFrame  # Payroll rows sharing a key with another payroll row
+    duplicate_active: pd.DataFrame  # Active members sharing a key with another active member
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "matched": len(self.joined) - len(self.missing_from_active),
+            "missing_from_active": len(self.missing_from_active),
+            "missing_from_payroll": len(self.missing_from_payroll),
+            "duplicate_payroll_rows": len(self.duplicate_payroll),
+            "duplicate_active_rows": len(self.duplicate_active),
+        }
+
+
+def join_on_key(payroll: pd.DataFrame, active: pd.DataFrame, payroll_key: str, active_key: str) -> KeyJoin:
+    """
+    Matches payroll rows to an active member list in one pass over a single hash index.
+
+    Duplicate active keys match their first row.
+
+    Args:
+        payroll (pd.DataFrame): Payroll-side rows.
+        active (pd.DataFrame): Active member list.
+        payroll_key (str): Key column in payroll.
+        active_key (str): Key column in active.
+
+    Returns:
+        KeyJoin: The joined payroll rows plus the unmatched and duplicate rows of both sides.
+    """
+    active_keys = active[active_key]
+    first_active = active[~active_keys.duplicated()]
+    positions = pd.Index(first_active[active_key]).get_indexer(payroll[payroll_key])
+    found = positions >= 0
+
+    # Take the active columns by position; -1 (no match) becomes <NA>
+    extra = first_active.drop(columns=[payroll_key], errors="ignore") if payroll_key == active_key else first_active
+    taken = extra.reset_index(drop=True).reindex(positions)
+    taken.index = payroll.index
+    joined = pd.concat([payroll, taken], axis=1)
+
+    hit = np.zeros(len(first_active), dtype=bool)
+    hit[positions[found]] = True
+    missing_from_payroll = first_active[~hit]
+
+    return KeyJoin(
+        joined=joined,
+        missing_from_active=payroll[~found],
+        missing_from_payroll=missing_from_payroll,
+        duplicate_payroll=payroll[payroll[payroll_key].duplicated(keep=False)],
+        duplicate_active=active[active_keys.duplicated(keep=False)],
+    )
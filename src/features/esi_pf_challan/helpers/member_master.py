@@ -0,0 +1,198 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .dtypes import TEXT_DTYPE
+from .excel_reader import read_sheet
+from .streaming import member_keys, parse_dobs
+
+# Same columns the calculators read from the uploaded member lists
+PF_MEMBER_COLUMNS = ["UAN", "Name", "Father's/Husband's Name", "DoB"]
+ESI_MEMBER_COLUMNS = ["empe_ip_number", "empe_name"]
+
+DEFAULT_MASTER_PATH = Path(__file__).resolve().parents[4] / "data" / "employee_master.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pf_members (
+    establishment TEXT NOT NULL,
+    uan TEXT NOT NULL,
+    name TEXT,
+    father TEXT,
+    dob TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (establishment, uan)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS esi_members (
+    establishment TEXT NOT NULL,
+    ip_number TEXT NOT NULL,
+    name TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (establishment, ip_number)
+) WITHOUT ROWID;
+"""
+
+
+def read_pf_members(active_pf_file, dob_format: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parses a PF active member list (.csv) into PF_MEMBER_COLUMNS with digit-string UANs and parsed DoB.
+
+    Args:
+        dob_format (Optional[str]): The company profile's dob_format; without one each DoB is parsed on its own (see parse_dobs).
+    """
+    members = pd.read_csv(active_pf_file, usecols=PF_MEMBER_COLUMNS, dtype=str)
+    members["UAN"] = member_keys(members["UAN"])
+    members["DoB"] = parse_dobs(members["DoB"], dob_format)
+    return members
+
+
+def read_esi_members(active_esi_file) -> pd.DataFrame:
+    """Parses an ESI list of employees (.xls HTML export or .xlsx) into ESI_MEMBER_COLUMNS with digit-string IP numbers."""
+    if Path(active_esi_file.name).suffix == ".xls":
+        members = pd.read_html(active_esi_file)
+        if isinstance(members, list):
+            members = members[0]
+    else:
+        members = read_sheet(active_esi_file, usecols=lambda col: col in ESI_MEMBER_COLUMNS)
+    missing = [col for col in ESI_MEMBER_COLUMNS if col not in members.columns]
+    if missing:
+        raise ValueError(f"ESI List of employees is missing required columns: {', '.join(missing)}")
+    members = members[ESI_MEMBER_COLUMNS].copy()
+    members["empe_ip_number"] = member_keys(members["empe_ip_number"])
+    members["empe_name"] = members["empe_name"].astype(TEXT_DTYPE)  # blank names stay <NA>
+    return members
+
+
+class MemberMaster:
+    """
+    Persistent PF/ESI member lists per establishment, keyed by UAN and ESI IP number.
+
+    Uploads are merged in as deltas; pf_members/esi_members return frames the calculators accept in place of the files.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call; commits on success, rolls back on error
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                conn.executescript(_SCHEMA)
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _upsert(self, table: str, key: str, establishment: str, rows: pd.DataFrame, columns: List[str], replace: bool) -> Dict[str, int]:
+        # rows: key column + value columns, already normalized to text/None
+        rows = rows.drop_duplicates(subset=key, keep="last")
+        with self._connection() as conn:
+            existing = pd.read_sql_query(
+                f"SELECT {key}, {', '.join(columns)} FROM {table} WHERE establishment = ?",
+                conn, params=(establishment,),
+            )
+            merged = rows.merge(existing, on=key, how="left", suffixes=("", "_old"), indicator=True)
+            is_new = merged["_merge"] == "left_only"
+            changed = pd.Series(False, index=merged.index)
+            for col in columns:
+                new, old = merged[col], merged[f"{col}_old"]
+                changed |= ~((new == old) | (new.isna() & old.isna()))
+            is_updated = ~is_new & changed
+
+            to_write = merged.loc[is_new | is_updated, [key] + columns]
+            now = time.strftime("%Y-%m-%d %H:%M:%S")
+            conn.executemany(
+                f"INSERT INTO {table} (establishment, {key}, {', '.join(columns)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(columns) + 3))}) "
+                f"ON CONFLICT (establishment, {key}) DO UPDATE SET "
+                + ", ".join(f"{col} = excluded.{col}" for col in columns + ["updated_at"]),
+                [(establishment, *row, now) for row in to_write.itertuples(index=False, name=None)],
+            )
+
+            removed = 0
+            if replace:
+                # A full list: members missing from it have left
+                gone = existing.loc[~existing[key].isin(rows[key]), key]
+                conn.executemany(f"DELETE FROM {table} WHERE establishment = ? AND {key} = ?", [(establishment, k) for k in gone])
+                removed = len(gone)
+
+        return {
+            "added": int(is_new.sum()),
+            "updated": int(is_updated.sum()),
+            "unchanged": int(len(rows) - is_new.sum() - is_updated.sum()),
+            "removed": removed,
+        }
+
+    def upsert_pf(self, establishment: str, members: pd.DataFrame, replace: bool = False) -> Dict[str, int]:
+        """
+        Merges a PF member list (see read_pf_members) into the master.
+
+        Args:
+            establishment (str): Establishment the list belongs to.
+            members (pd.DataFrame): Full list or delta, in PF_MEMBER_COLUMNS.
+            replace (bool): Treat members as the complete list and drop members not in it.
+
+        Returns:
+            Dict[str, int]: Counts of "added", "updated", "unchanged" and "removed" members.
+        """
+        rows = pd.DataFrame({
+            "uan": members["UAN"].astype(str),
+            "name": members["Name"].astype(object).where(members["Name"].notna(), None),
+            "father": members["Father's/Husband's Name"].astype(object).where(members["Father's/Husband's Name"].notna(), None),
+            "dob": parse_dobs(members["DoB"]).dt.strftime("%Y-%m-%d").astype(object).where(members["DoB"].notna(), None),
+        })
+        return self._upsert("pf_members", "uan", establishment, rows, ["name", "father", "dob"], replace)
+
+    def upsert_esi(self, establishment: str, members: pd.DataFrame, replace: bool = False) -> Dict[str, int]:
+        """Merges an ESI list of employees (see read_esi_members) into the master; see upsert_pf."""
+        rows = pd.DataFrame({
+            "ip_number": members["empe_ip_number"].astype(str),
+            "name": members["empe_name"].astype(object).where(members["empe_name"].notna(), None),
+        })
+        return self._upsert("esi_members", "ip_number", establishment, rows, ["name"], replace)
+
+    def pf_members(self, establishment: str) -> pd.DataFrame:
+        """Returns the establishment's PF members in PF_MEMBER_COLUMNS (UAN as text, DoB as datetime)."""
+        with self._connection() as conn:
+            members = pd.read_sql_query(
+                "SELECT uan, name, father, dob FROM pf_members WHERE establishment = ? ORDER BY uan",
+                conn, params=(establishment,),
+            )
+        members.columns = PF_MEMBER_COLUMNS
+        members["DoB"] = pd.to_datetime(members["DoB"], format="%Y-%m-%d")
+        return members
+
+    def esi_members(self, establishment: str) -> pd.DataFrame:
+        """Returns the establishment's ESI members in ESI_MEMBER_COLUMNS."""
+        with self._connection() as conn:
+            members = pd.read_sql_query(
+                "SELECT ip_number, name FROM esi_members WHERE establishment = ? ORDER BY ip_number",
+                conn, params=(establishment,),
+            )
+        members.columns = ESI_MEMBER_COLUMNS
+        return members
+
+    def summary(self, establishment: str) -> Dict[str, Optional[object]]:
+        """Member counts and last update time of an establishment's lists."""
+        with self._connection() as conn:
+            pf = conn.execute("SELECT COUNT(*), MAX(updated_at) FROM pf_members WHERE establishment = ?", (establishment,)).fetchone()
+            esi = conn.execute("SELECT COUNT(*), MAX(updated_at) FROM esi_members WHERE establishment = ?", (establishment,)).fetchone()
+        return {"pf_members": pf[0], "pf_updated_at": pf[1], "esi_members": esi[0], "esi_updated_at": esi[1]}
+
+    def establishments(self) -> List[str]:
+        with self._connection() as conn:
+            rows = conn.execute("SELECT establishment FROM pf_members UNION SELECT establishment FROM esi_members ORDER BY 1").fetchall()
+        return [row[0] for row in rows]
+
+
+# Shared by every session of this process; ESI_PF_MASTER_PATH moves the file
+member_master = MemberMaster(Path(os.environ.get("ESI_PF_MASTER_PATH") or DEFAULT_MASTER_PATH))
@@ -0,0 +1,108 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .dtypes import TEXT_DTYPE
+
+# Rows scoring below this are flagged as likely mismatches
+DEFAULT_NAME_THRESHOLD = 0.8
+
+# Titles dropped before comparing names
+HONORIFICS = ["MR", "MRS", "MS", "MISS", "SMT", "SHRI", "SRI", "SH", "KM", "KUM", "DR", "LATE"]
+# "S/O", "D/O", "W/O", "C/O" in father's/husband's name fields
+_RELATION_PATTERN = r"\b[SDWC]\s*/\s*O\b"
+
+
+def _words(names: pd.Series) -> Tuple[pa.Array, np.ndarray, pa.ListArray]:
+    """Normalized words of every name: (words, row position of each word, words regrouped per row)."""
+    text = pa.Array.from_pandas(names.astype(TEXT_DTYPE))
+    if isinstance(text, pa.ChunkedArray):
+        text = text.combine_chunks()
+    text = pc.utf8_upper(text)
+    text = pc.replace_substring_regex(text, _RELATION_PATTERN, " ")
+    text = pc.replace_substring_regex(text, r"[^0-9A-Z]+", " ")
+
+    lists = pc.utf8_split_whitespace(text)
+    words = pc.list_flatten(lists)
+    rows = pc.list_parent_indices(lists)
+    keep = pc.and_(pc.invert(pc.is_in(words, value_set=pa.array(HONORIFICS, words.type))), pc.greater(pc.utf8_length(words), 0))
+    words, rows = words.filter(keep), rows.filter(keep).to_numpy()
+
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(names)))]).astype(np.int32)
+    per_row = pa.ListArray.from_arrays(pa.array(offsets), words.cast(pa.string()))
+    return words, rows, per_row
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Upper-cases names and strips honorifics, relation markers and punctuation.
+
+    "Mr. R.K. Sharma" and "R K  SHARMA" both become "R K SHARMA"; blanks become <NA>.
+    """
+    _, _, per_row = _words(names)
+    text = pd.Series(pc.binary_join(per_row, " ").to_numpy(zero_copy_only=False), index=names.index).astype(TEXT_DTYPE)
+    return text.where(text != "")
+
+
+def name_scores(left: pd.Series, right: pd.Series) -> pd.Series:
+    """
+    Dice similarity of the normalized word sets of two name columns, row by row, from 0 to 1.
+
+    An initial matches one unmatched word starting with it ("R K SHARMA" / "RAJESH KUMAR SHARMA" scores 1),
+    and names equal once spaces are removed score 1.
+
+    Args:
+        left (pd.Series): Names from the payroll.
+        right (pd.Series): Names from the member list, aligned with left.
+
+    Returns:
+        pd.Series: Scores rounded to 2 decimals (float32), indexed like left.
+    """
+    n_rows = len(left)
+    words_a, rows_a, lists_a = _words(left)
+    words_b, rows_b, lists_b = _words(right)
+
+    # One integer code per distinct word across both columns
+    encoded = pc.dictionary_encode(pa.concat_arrays([words_a, words_b]))
+    vocabulary = encoded.dictionary
+    codes = encoded.indices.to_numpy()
+    n_codes = max(len(vocabulary), 1)
+    keys_a = np.unique(rows_a.astype(np.int64) * n_codes + codes[:len(words_a)])
+    keys_b = np.unique(rows_b.astype(np.int64) * n_codes + codes[len(words_a):])
+
+    # Exact word matches
+    shared_a, shared_b = np.isin(keys_a, keys_b), np.isin(keys_b, keys_a)
+    matched = np.bincount(keys_a[shared_a] // n_codes, minlength=n_rows)
+    totals = np.bincount(keys_a // n_codes, minlength=n_rows) + np.bincount(keys_b // n_codes, minlength=n_rows)
+
+    # Initials against unmatched words with the same first letter, in both directions
+    letters = pc.utf8_slice_codeunits(vocabulary, 0, 1).dictionary_encode()
+    letter_of = letters.indices.to_numpy()
+    is_initial = (pc.utf8_length(vocabulary).to_numpy() == 1)
+    n_letters = max(len(letters.dictionary), 1)
+    rest_a, rest_b = keys_a[~shared_a], keys_b[~shared_b]
+    group_keys = np.concatenate([
+        (rest_a // n_codes) * n_letters + letter_of[rest_a % n_codes],
+        (rest_b // n_codes) * n_letters + letter_of[rest_b % n_codes],
+    ])
+    groups, group_of = np.unique(group_keys, return_inverse=True)
+    group_a, group_b = group_of[:len(rest_a)], group_of[len(rest_a):]
+    initial_a, initial_b = is_initial[rest_a % n_codes], is_initial[rest_b % n_codes]
+    count = lambda g: np.bincount(g, minlength=len(groups))
+    pairs = (
+        np.minimum(count(group_a[initial_a]), count(group_b[~initial_b]))
+        + np.minimum(count(group_b[initial_b]), count(group_a[~initial_a]))
+    )
+    matched = matched + np.bincount(groups // n_letters, weights=pairs, minlength=n_rows).astype(np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(totals > 0, 2 * matched / totals, 1.0)
+    blank_a = np.bincount(rows_a, minlength=n_rows) == 0
+    blank_b = np.bincount(rows_b, minlength=n_rows) == 0
+    scores = np.where(blank_a != blank_b, 0.0, scores)
+    squashed_equal = pc.equal(pc.binary_join(lists_a, ""), pc.binary_join(lists_b, "")).to_numpy(zero_copy_only=False)
+    scores = np.where(squashed_equal & ~blank_a, 1.0, scores)
+    return pd.Series(np.round(scores, 2).astype(np.float32), index=left.index)
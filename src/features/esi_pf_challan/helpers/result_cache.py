@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable
+
+import pandas as pd
+
+from ....monitoring import registry
+
+
+def file_digest(file) -> str:
+    """
+    Returns the SHA-256 hex digest of an uploaded file's contents.
+
+    Args:
+        file: A Streamlit UploadedFile / BytesIO, a path on disk, or a DataFrame
+            (e.g. a member list from the member master).
+
+    Returns:
+        str: Hex digest of the file bytes (or of the frame's columns and values).
+    """
+    if isinstance(file, pd.DataFrame):
+        digest = hashlib.sha256(repr(list(file.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(file, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+    if isinstance(file, (str, Path)):
+        data = Path(file).read_bytes()
+    else:
+        # getvalue() does not move the read position of the buffer
+        data = file.getvalue()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory footprint (bytes) of a cached result."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, dict):
+        return sum(_estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(v) for v in value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache for calculation results, bounded by entry count and estimated size.
+
+    Concurrent misses on one key compute once; failures are not cached.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable):
+        # Caller must hold self._lock
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the cached value for key, computing it with compute() on a miss."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another caller may have filled the entry while we waited
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    return entry[0]
+                self.misses += 1
+            try:
+                value = compute()
+                self._store(key, value)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        size = _estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return  # Too large to ever fit; don't flush everything else for it
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by every Streamlit session served by this process
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("ESI_PF_CACHE_MAX_ENTRIES", 32)),
+    max_bytes=int(os.environ.get("ESI_PF_CACHE_MAX_MB", 512)) * 1024 * 1024,
+)
+registry.callback("esi_pf_result_cache_hits_total", "Calculations served from the result cache.", "counter",
+                  lambda: result_cache.stats()["hits"])
+registry.callback("esi_pf_result_cache_misses_total", "Calculations the result cache had to run.", "counter",
+                  lambda: result_cache.stats()["misses"])
+registry.callback("esi_pf_result_cache_bytes", "Estimated memory held by the result cache.", "gauge",
+                  lambda: result_cache.stats()["bytes"])
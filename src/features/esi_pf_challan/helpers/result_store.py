@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from ....monitoring import registry
+from .dtypes import TEXT_DTYPE
+
+_TEXT_TYPES = {pa.string(): TEXT_DTYPE, pa.large_string(): TEXT_DTYPE}
+
+
+def frame_to_bytes(df: pd.DataFrame) -> bytes:
+    """Serializes df (with its index and dtypes) as zstd-compressed Arrow IPC stream bytes."""
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression="zstd")) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_from_bytes(data: bytes) -> pd.DataFrame:
+    """Inverse of frame_to_bytes; text columns come back as TEXT_DTYPE."""
+    return pa.ipc.open_stream(data).read_all().to_pandas(types_mapper=_TEXT_TYPES.get)
+
+
+class StoredResults(Mapping):
+    """The frames of one handle, each decoded on first access (a page rerun usually needs only some)."""
+
+    def __init__(self, handle: str, blobs: Dict[str, bytes], attrs: Dict[str, dict]):
+        self.handle = handle
+        self._blobs = blobs
+        self._attrs = attrs
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        if name not in self._frames:
+            df = frame_from_bytes(self._blobs[name])
+            # result_key lets previews tell a re-decoded frame from a new result
+            df.attrs.update(self._attrs[name], result_key=f"{self.handle}:{name}")
+            self._frames[name] = df
+        return self._frames[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blobs)
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+class _Entry:
+    __slots__ = ("blobs", "attrs", "files", "size", "last_access")
+
+    def __init__(self, blobs: Dict[str, bytes], attrs: Dict[str, dict], last_access: float):
+        self.blobs = blobs
+        self.attrs = attrs
+        self.files: Dict[str, bytes] = {}  # see ResultStore.file
+        self.size = sum(len(blob) for blob in blobs.values())
+        self.last_access = last_access
+
+
+class ResultStore:
+    """
+    Per-session calculation results as compressed Arrow bytes; sessions hold only the handle from put().
+
+    Idle entries and, over max_bytes, the least recently used go first; get() then returns None.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, idle_seconds: float = 3600, clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.evicted = 0
+
+    def put(self, frames: Dict[str, pd.DataFrame], replace: Optional[str] = None) -> str:
+        """
+        Stores a set of frames and returns their handle.
+
+        Args:
+            frames (Dict[str, pd.DataFrame]): Frames by name (e.g. "pf_df", "verify_pf").
+            replace (Optional[str]): The session's previous handle, discarded in the same step.
+
+        Returns:
+            str: Handle for get() / file() / discard().
+        """
+        entry = _Entry(
+            {name: frame_to_bytes(df) for name, df in frames.items()},
+            {name: dict(df.attrs) for name, df in frames.items()},
+            self._clock(),
+        )
+        handle = uuid.uuid4().hex
+        with self._lock:
+            if replace is not None:
+                self._drop(replace)
+            self._entries[handle] = entry
+            self._total_bytes += entry.size
+            self._evict(keep=handle)
+        return handle
+
+    def _touch(self, handle: str) -> Optional[_Entry]:
+        # Caller must hold self._lock
+        self._evict(keep=handle)
+        entry = self._entries.get(handle)
+        if entry is not None:
+            entry.last_access = self._clock()
+            self._entries.move_to_end(handle)
+        return entry
+
+    def get(self, handle: Optional[str]) -> Optional[StoredResults]:
+        """Returns the frames of handle (decoded as they are used), or None if it was never stored or has been dropped."""
+        if handle is None:
+            return None
+        with self._lock:
+            entry = self._touch(handle)
+        return None if entry is None else StoredResults(handle, entry.blobs, entry.attrs)
+
+    def file(self, handle: Optional[str], name: str, build: Callable[[], bytes]) -> bytes:
+        """A download built from handle's results; build() runs once and its bytes count towards the budget."""
+        with self._lock:
+            entry = self._touch(handle) if handle is not None else None
+            data = entry.files.get(name) if entry is not None else None
+        if data is not None:
+            return data
+        data = build()
+        with self._lock:
+            if entry is not None and self._entries.get(handle) is entry and name not in entry.files:
+                entry.files[name] = data
+                entry.size += len(data)
+                self._total_bytes += len(data)
+        return data
+
+    def discard(self, handle: Optional[str]) -> None:
+        if handle is None:
+            return
+        with self._lock:
+            self._drop(handle)
+
+    def _drop(self, handle: str) -> None:
+        # Caller must hold self._lock
+        entry = self._entries.pop(handle, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+    def _evict(self, keep: str) -> None:
+        # Caller must hold self._lock. The entry being used is never evicted, even if it alone exceeds the budget.
+        cutoff = self._clock() - self.idle_seconds
+        for handle in [h for h, entry in self._entries.items() if entry.last_access < cutoff and h != keep]:
+            self._drop(handle)
+            self.evicted += 1
+        for handle in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if handle != keep:
+                self._drop(handle)
+                self.evicted += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total_bytes, "evicted": self.evicted}
+
+
+result_store = ResultStore(
+    max_bytes=int(os.environ.get("ESI_PF_STORE_MAX_MB", 256)) * 1024 * 1024,
+    idle_seconds=float(os.environ.get("ESI_PF_STORE_IDLE_MINUTES", 60)) * 60,
+)
+registry.callback("esi_pf_session_results", "Session results held in the result store.", "gauge",
+                  lambda: result_store.stats()["entries"])
+registry.callback("esi_pf_session_results_bytes", "Compressed size of the session results held in the result store.", "gauge",
+                  lambda: result_store.stats()["bytes"])
+registry.callback("esi_pf_session_results_evicted_total", "Session results released for being idle or over the memory budget.", "counter",
+                  lambda: result_store.stats()["evicted"])
@@ -1,23 +1,141 @@
 import io
+from functools import lru_cache
 from io import BytesIO
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .diagnostics import stage
+
+ESI_SHEET_NAME = 'ESI Report'
+INSTRUCTIONS_SHEET_NAME = 'Instructions & Reason Codes'
+# Resolved from the package location so it works whatever the current directory is
+ESI_TEMPLATE_PATH = Path(__file__).resolve().parents[4] / "resources" / "MC_Template_scl_june_2025.xlsx"
+# Same look as the header row pandas writes
+HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+# Rows rendered per block by iter_pf_custom_sep
+PF_BLOCK_ROWS = 50000
 
 # ===== Save function =====
+def _text_column(series: pd.Series) -> pa.Array:
+    """Formats one column as text in a single vectorized pass; blanks (None, NaN, <NA>) become ""."""
+    if pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_string_dtype(series):
+        try:
+            return pc.fill_null(pc.cast(pa.Array.from_pandas(series), pa.string()), "")
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass  # mixed object column
+    # Anything else (floats, dates, mixed objects) renders like str() did, except missing values
+    text = series.astype(str).where(series.notna(), "")
+    return pa.array(text.to_numpy(dtype=object), type=pa.string())
+
+def _pf_text(df: pd.DataFrame, sep: str) -> str:
+    """Renders df as sep-joined lines separated by newlines (no trailing newline)."""
+    if df.empty or not len(df.columns):
+        return ""
+    lines = pc.binary_join_element_wise(*(_text_column(df[col]) for col in df.columns), sep)
+    # Join every line in one kernel call by viewing them as a single list
+    as_list = pa.ListArray.from_arrays(pa.array([0, len(lines)], pa.int32()), lines)
+    return pc.binary_join(as_list, "\n")[0].as_py()
+
 def save_pf_custom_sep(df: pd.DataFrame, sep="#~#", header=False) -> str:
-    buf = io.StringIO()
+    with stage("write PF text", rows=len(df)):
+        buf = io.StringIO()
+        if header:
+            buf.write(sep.join(df.columns) + "\n")
+        buf.write(_pf_text(df, sep))
+        return buf.getvalue()
+
+def iter_pf_custom_sep(
+    df: pd.DataFrame,
+    sep="#~#",
+    header=False,
+    continued: bool = False,
+    block_rows: int = PF_BLOCK_ROWS,
+) -> Iterator[bytes]:
+    """
+    Yields save_pf_custom_sep(df, sep, header) as UTF-8 bytes, block_rows lines at a time,
+    so large ECRs can be written without building the whole string.
+
+    Args:
+        df (pd.DataFrame): PF challan rows.
+        sep (str): Field separator.
+        header (bool): Whether to start with a line of column names.
+        continued (bool): The output follows earlier lines of the same file, so
+            start with a newline (used when appending batch after batch).
+        block_rows (int): Rows rendered per yielded block.
+    """
+    prefix = "\n" if continued else ""
     if header:
-        buf.write(sep.join(df.columns) + "\n")
-    rows = [sep.join(map(str, row)) for row in df.itertuples(index=False, name=None)]
-    buf.write("\n".join(rows))
-    return buf.getvalue()
+        yield (prefix + sep.join(df.columns) + "\n").encode("utf-8")
+        prefix = ""
+    for start in range(0, len(df), block_rows):
+        yield (prefix + _pf_text(df.iloc[start:start + block_rows], sep)).encode("utf-8")
+        prefix = "\n"
 
-def save_esi_excel(df: pd.DataFrame) -> BytesIO:
-    instructions_df = pd.read_excel("resources/MC_Template_scl_june_2025.xlsx", sheet_name="Instructions & Reason Codes")
+def _write_frame_rows(worksheet, df: pd.DataFrame, start_row: int) -> int:
+    """Writes df's values as text (no header) from start_row; blank cells are skipped. Returns the next free row."""
+    # The challan frames keep numbers numeric; the portal template expects text cells
+    columns = [_text_column(df[col]).to_pylist() for col in df.columns]
+    for row in zip(*columns):
+        for col, value in enumerate(row):
+            if value:
+                worksheet.write_string(start_row, col, value)
+        start_row += 1
+    return start_row
+
+@lru_cache(maxsize=4)
+def _read_template_rows(path: str, mtime: float) -> Tuple[tuple, ...]:
+    # mtime is part of the cache key so an updated template is picked up without a restart
+    from openpyxl import load_workbook  # only needed once per process; keeps it off the import path
 
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return tuple(workbook[INSTRUCTIONS_SHEET_NAME].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+def load_instructions_rows() -> Tuple[tuple, ...]:
+    """Returns the cell values of the ESI template's instructions sheet, parsed once per process."""
+    return _read_template_rows(str(ESI_TEMPLATE_PATH), ESI_TEMPLATE_PATH.stat().st_mtime)
+
+def write_esi_excel(chunks: Iterable[pd.DataFrame], output) -> None:
+    """
+    Writes ESI challan rows to an Excel workbook batch by batch, in xlsxwriter's constant-memory mode.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): ESI challan rows; all batches share the same columns.
+        output: Path or binary buffer to write the .xlsx to.
+    """
+    import xlsxwriter
+
+    instructions_rows = load_instructions_rows()
+
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    header_format = workbook.add_format(HEADER_FORMAT)
+    try:
+        worksheet = workbook.add_worksheet(ESI_SHEET_NAME)
+        next_row = 1
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                worksheet.write_row(0, 0, chunk.columns, header_format)
+            next_row = _write_frame_rows(worksheet, chunk, next_row)
+
+        # Copy the template's instructions sheet cell for cell
+        instructions = workbook.add_worksheet(INSTRUCTIONS_SHEET_NAME)
+        for row_number, row in enumerate(instructions_rows):
+            for col, value in enumerate(row):
+                if value is not None:
+                    instructions.write(row_number, col, value)
+    finally:
+        workbook.close()
+
+def save_esi_excel(df: pd.DataFrame) -> BytesIO:
     # Write to in-memory Excel file with two sheets
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='ESI Report')
-        instructions_df.to_excel(writer, index=False, sheet_name='Instructions & Reason Codes')
+    with stage("write ESI workbook", rows=len(df)):
+        write_esi_excel([df], output)
     output.seek(0)
-    return output
\ No newline at end of file
+    return output
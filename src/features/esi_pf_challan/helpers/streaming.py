@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from .validation import ValidationError
+
+# Offending rows kept for the error (and its CSV); the rest are only counted
+MAX_REPORTED_ROWS = 200
+
+
+def member_keys(series: pd.Series) -> pd.Series:
+    """Normalizes UAN / IP numbers, held as int, float (1.0e11) or text depending on the file, to plain digit strings."""
+    numeric = pd.to_numeric(series, errors="coerce")
+    as_text = series.astype(str).str.strip()
+    return as_text.where(numeric.isna(), numeric.astype("Int64").astype(str))
+
+
+def parse_dobs(dobs: pd.Series, dob_format: Optional[str] = None) -> pd.Series:
+    """
+    Parses dates of birth with dob_format, or each value on its own when there is none.
+
+    pd.to_datetime would apply the format guessed from the first value to every row.
+    """
+    if dob_format:
+        return pd.to_datetime(dobs, format=dob_format)
+    return dobs.astype("datetime64[ns]")
+
+
+def read_pf_member_dobs(active_pf_file, dob_format: Optional[str] = None) -> pd.Series:
+    """Returns the dates of birth of a PF active member list, indexed by normalized UAN; duplicates are kept."""
+    active_pf = pd.read_csv(active_pf_file, usecols=["UAN", "DoB"], dtype=str)
+    return pd.Series(parse_dobs(active_pf["DoB"], dob_format).to_numpy(), index=member_keys(active_pf["UAN"]), name="DoB")
+
+
+def read_esi_member_keys(active_esi_file) -> pd.Index:
+    """Returns the IP numbers of an ESI list of employees (.xls HTML export or .xlsx)."""
+    if Path(active_esi_file.name).suffix == ".xls":
+        active_esi_df = pd.read_html(active_esi_file)
+        if isinstance(active_esi_df, list):
+            active_esi_df = active_esi_df[0]
+    else:
+        active_esi_df = pd.read_excel(active_esi_file, usecols=lambda col: col == "empe_ip_number")
+    if "empe_ip_number" not in active_esi_df.columns:
+        raise ValueError("ESI List of employees is missing required column: empe_ip_number")
+    return pd.Index(member_keys(active_esi_df["empe_ip_number"]).unique())
+
+
+class RowIssues:
+    """Collects offending rows across batches, keeping the first MAX_REPORTED_ROWS, and raises one ValidationError."""
+
+    def __init__(self, message: str, display_cols: List[str]):
+        self.message = message
+        self.display_cols = display_cols
+        self.rows: List[pd.DataFrame] = []
+        self.kept = 0
+        self.count = 0
+
+    def add(self, bad_rows: pd.DataFrame) -> None:
+        if bad_rows.empty:
+            return
+        self.count += len(bad_rows)
+        room = MAX_REPORTED_ROWS - self.kept
+        if room > 0:
+            kept = bad_rows[self.display_cols].head(room)
+            kept.index = kept.index + 2
+            self.rows.append(kept)
+            self.kept += len(kept)
+
+    def raise_if_any(self) -> None:
+        if not self.count:
+            return
+        raise ValidationError(self.message, pd.concat(self.rows), self.count)
+
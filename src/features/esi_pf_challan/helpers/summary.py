@@ -0,0 +1,59 @@
+from typing import Any, Dict
+
+import pandas as pd
+
+ESI_DAYS_COL = "No of Days for which wages paid/payable during the month"
+ESI_WAGES_COL = "Total Monthly Wages"
+
+
+def compute_totals(pf_df: pd.DataFrame, esi_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Computes the figures shown in the "Totals Summary" block for one establishment.
+
+    Args:
+        pf_df (pd.DataFrame): Calculated PF challan data.
+        esi_df (pd.DataFrame): Calculated ESI challan data.
+
+    Returns:
+        Dict[str, Any]: Headline metrics plus "pf_column_totals", the sum of every numeric PF column.
+    """
+    esi_days = esi_df.get(ESI_DAYS_COL) if esi_df is not None else None
+    esi_wages = esi_df.get(ESI_WAGES_COL) if esi_df is not None else None
+    numeric_cols = pf_df.select_dtypes(include=["number"]).columns
+
+    return {
+        "employees": int(pf_df.shape[0]),
+        "pf_gross_wages": int(pf_df["GROSS_WAGES"].sum()),
+        # Blank day/wage cells are <NA> in the nullable columns and count as 0
+        "esi_total_days": int(esi_days.fillna(0).astype(int).sum()) if esi_days is not None else 0,
+        "esi_gross_wages": int(esi_wages.fillna(0).astype(int).sum()) if esi_wages is not None else 0,
+        "pf_column_totals": pf_df[numeric_cols].sum(),
+    }
+
+
+def combine_totals(totals_by_establishment: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Builds a group-level summary table from compute_totals() results.
+
+    Returns:
+        pd.DataFrame: One row per establishment plus a final "Group Total" row.
+    """
+    rows = {}
+    for name, totals in totals_by_establishment.items():
+        row = {
+            "Employees": totals["employees"],
+            "PF Gross Wages": totals["pf_gross_wages"],
+            "ESI Total Days": totals["esi_total_days"],
+            "ESI Gross Wages": totals["esi_gross_wages"],
+        }
+        row.update(totals["pf_column_totals"].to_dict())
+        rows[name] = row
+
+    summary_df = pd.DataFrame.from_dict(rows, orient="index")
+    if summary_df.empty:
+        return summary_df
+    # Companies don't share every PF column (e.g. "NCP DAYS" vs "NCP_DAYS")
+    summary_df = summary_df.fillna(0).astype("int64")
+    summary_df.loc["Group Total"] = summary_df.sum(numeric_only=True)
+    summary_df.index.name = "Establishment"
+    return summary_df
@@ -0,0 +1,81 @@
+import os
+from typing import List, Optional
+
+import pandas as pd
+from tabulate import tabulate
+
+# Offending rows shown in an error message; the full list goes to the CSV (to_csv)
+PREVIEW_ROWS = int(os.environ.get("ESI_PF_ERROR_PREVIEW_ROWS", 20))
+
+
+class ValidationError(ValueError):
+    """
+    Input rows failed a check (missing UAN, member not in the active list, ...).
+
+    The message previews the first PREVIEW_ROWS offending rows; to_csv() lists all that were kept.
+
+    Attributes:
+        message (str): What went wrong, without the rows.
+        rows (pd.DataFrame): The offending rows' identifying columns, labelled by sheet row.
+        count (int): Number of offending rows; more than len(rows) when only the first were kept (truncated).
+    """
+
+    def __init__(self, message: str, rows: pd.DataFrame, count: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.rows = rows
+        self.count = len(rows) if count is None else count
+        self._csv: Optional[bytes] = None
+
+    def __reduce__(self):
+        # Exceptions pickle as cls(*args); this one also needs its rows (process_many's worker processes)
+        return type(self), (self.message, self.rows, self.count)
+
+    def __str__(self) -> str:
+        return self.preview()
+
+    @property
+    def truncated(self) -> bool:
+        """Only the first of the offending rows were kept (see streaming.MAX_REPORTED_ROWS)."""
+        return self.count > len(self.rows)
+
+    def truncation_note(self) -> str:
+        return f"Only the first {len(self.rows)} of {self.count} offending rows are listed; the rest were counted but not kept."
+
+    def preview(self, limit: int = PREVIEW_ROWS) -> str:
+        """The message with a table of the first `limit` rows and how many more there are."""
+        shown = self.rows.head(limit)
+        table = tabulate(shown, headers=list(self.rows.columns), tablefmt='rounded_grid')
+        more = f"\n... and {self.count - len(shown)} more rows" if self.count > len(shown) else ""
+        if self.truncated:
+            more += f"\n{self.truncation_note()}"
+        return f"{self.message}\n{table}{more}"
+
+    def to_csv(self) -> bytes:
+        """
+        Every kept row as CSV (UTF-8 with BOM for Excel) with its sheet row number, built once.
+
+        When truncated, a last "..." row says how many offending rows there were in all.
+        """
+        if self._csv is None:
+            text = self.rows.to_csv(index_label="Row")
+            if self.truncated:
+                text += f'...,"{self.truncation_note()}"\n'
+            self._csv = text.encode("utf-8-sig")
+        return self._csv
+
+
+def check_rows(message: str, bad_rows: pd.DataFrame, display_cols: List[str]) -> None:
+    """
+    Raises ValidationError if bad_rows is not empty.
+
+    Args:
+        message (str): Headline of the error.
+        bad_rows (pd.DataFrame): Offending rows, labelled 0, 1, ... from the first data row.
+        display_cols (List[str]): Columns that identify a row to the user.
+    """
+    if bad_rows.empty:
+        return
+    rows = bad_rows[display_cols].copy()
+    rows.index = rows.index + 2  # sheet rows: row 1 is the header
+    raise ValidationError(message, rows)
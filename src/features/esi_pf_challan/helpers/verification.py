@@ -0,0 +1,107 @@
+import pandas as pd
+
+from .key_join import join_on_key
+from .validation import check_rows
+from .name_match import DEFAULT_NAME_THRESHOLD, name_scores
+
+def verify_pf(payroll_df: pd.DataFrame, active_pf: pd.DataFrame, threshold: float = DEFAULT_NAME_THRESHOLD) -> pd.DataFrame:
+    """
+    Validates and merges a payroll dataframe with an active PF members dataframe.
+
+    Args:
+        payroll_df (pd.DataFrame): DataFrame with payroll data, including "UAN", "MEMBER_NAME", and "father".
+        active_pf (pd.DataFrame): DataFrame with active PF members, including "UAN". "Name", and "Father's/Husband's Name".
+        threshold (float): Name similarity below which a row is flagged as a mismatch.
+
+    Returns:
+        pd.DataFrame: DataFrame containing UAN, names from payroll, names from active PF list,
+            their similarity scores and a "Mismatch" flag.
+
+    Raises:
+        ValidationError: If UANs are not in the active PF list.
+        ValueError: If a frame lacks a required column.
+    """
+    # --- 1. Check for UANs in payroll_df that are NOT in active_pf ---
+    required_payroll_cols = {"UAN", "MEMBER_NAME", "father"}
+    required_active_cols = {"UAN", "Name", "Father's/Husband's Name"}
+    if not required_payroll_cols.issubset(payroll_df.columns):
+        raise ValueError(f"Payroll DataFrame missing required columns: {required_payroll_cols - set(payroll_df.columns)}")
+    if not required_active_cols.issubset(active_pf.columns):
+        raise ValueError(f"Active PF DataFrame missing required columns: {required_active_cols - set(active_pf.columns)}")
+
+    # --- 1. Join on UAN once; the result also lists the UANs not in active_pf ---
+    join = join_on_key(payroll_df, active_pf[["UAN", "Name", "Father's/Husband's Name"]], "UAN", "UAN")
+    check_rows("Error: The following UANs from WAGES sheet were not found in active PF list:", join.missing_from_active, ["UAN", "MEMBER_NAME"])
+
+    # --- 2. Prepare verification DataFrame from the joined rows ---
+    verify_df = join.joined.rename(columns={
+        "MEMBER_NAME": "Name in Payment Sheet",
+        "Name": "Name in Active List",
+        "father": "Father's Name in Payment Sheet",
+        "Father's/Husband's Name": "Father's Name in Active List"
+    })[[
+        "UAN", "Name in Payment Sheet", "Name in Active List",
+        "Father's Name in Payment Sheet", "Father's Name in Active List"
+    ]]
+
+    # --- 3. Score names; father's names only count where both sides have one ---
+    name_score = name_scores(verify_df["Name in Payment Sheet"], verify_df["Name in Active List"])
+    father_score = name_scores(verify_df["Father's Name in Payment Sheet"], verify_df["Father's Name in Active List"])
+    father_known = _has_text(verify_df["Father's Name in Payment Sheet"]) & _has_text(verify_df["Father's Name in Active List"])
+    verify_df = verify_df.assign(**{
+        "Name Score": name_score,
+        "Father's Name Score": father_score.where(father_known),
+        "Mismatch": (name_score < threshold) | (father_known & (father_score < threshold)),
+    })
+
+    verify_df.index = range(2, len(verify_df) + 2)
+    verify_df.attrs["join_summary"] = join.summary()
+
+    return verify_df
+
+
+def _has_text(names: pd.Series) -> pd.Series:
+    return (names.str.strip().fillna("") != "").astype(bool)
+
+
+
+def verify_esi(payroll_df: pd.DataFrame, active_esi: pd.DataFrame, threshold: float = DEFAULT_NAME_THRESHOLD) -> pd.DataFrame:
+    """
+    Validates and merges an ESI challan dataframe with the ESI list of employees.
+
+    Args:
+        payroll_df (pd.DataFrame): DataFrame with calculated payroll data.
+        active_esi (pd.DataFrame): DataFrame with active ESI members, including "empe_ip_number" and "empe_name".
+        threshold (float): Name similarity below which a row is flagged as a mismatch.
+
+    Returns:
+        pd.DataFrame: DataFrame containing IP Number, IP Name from payroll, empe_name from active ESI list,
+            their similarity score and a "Mismatch" flag.
+
+    Raises:
+        ValidationError: If IP numbers are not in the ESI list of employees.
+        ValueError: If active_esi lacks a required column.
+    """
+    required_active_cols = {"empe_ip_number", "empe_name"}
+    if not required_active_cols.issubset(active_esi.columns):
+        raise ValueError(f"ESI list of employees missing required columns: {required_active_cols - set(active_esi.columns)}")
+
+    # --- 1. Join on IP number once; the result also lists the numbers not in active_esi ---
+    join = join_on_key(payroll_df[["IP Number", "IP Name"]], active_esi[["empe_ip_number", "empe_name"]], "IP Number", "empe_ip_number")
+    check_rows(
+        "Error: The following ESI number from WAGES sheet were not found in ESI List of employees:",
+        join.missing_from_active, ["IP Number", "IP Name"],
+    )
+    
+    # --- 2. Select and rename columns for clarity ---
+    verify_df = join.joined[["IP Number", "IP Name", "empe_name"]].rename(
+        columns={
+            "IP Name": "Name in Payment Sheet",
+            "empe_name": "Name in ESI Active List"
+        }
+    )
+    name_score = name_scores(verify_df["Name in Payment Sheet"], verify_df["Name in ESI Active List"])
+    verify_df = verify_df.assign(**{"Name Score": name_score, "Mismatch": name_score < threshold})
+    verify_df.index = range(2, len(verify_df) + 2)
+    verify_df.attrs["join_summary"] = join.summary()
+    return verify_df
\ No newline at end of file
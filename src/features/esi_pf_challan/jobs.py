@@ -0,0 +1,168 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from ...monitoring import registry, job_id_var
+
+log = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+JOBS = registry.counter("esi_pf_jobs_total", "Background jobs finished, by kind and final status.", ["kind", "status"])
+JOB_SECONDS = registry.histogram("esi_pf_job_seconds", "Time background jobs ran for, by kind.", ["kind"])
+JOB_WAIT_SECONDS = registry.histogram("esi_pf_job_wait_seconds", "Time background jobs waited for a free worker, by kind.", ["kind"])
+
+
+class JobCancelled(Exception):
+    """Raised inside a job (by Job.report) once it has been cancelled."""
+
+
+class Job:
+    """One unit of background work and its progress; the job function calls report() between stages."""
+
+    def __init__(self, label: str, kind: str = "job"):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.kind = kind
+        self.status = QUEUED
+        self.stage = "Waiting for a free worker"
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.info: Dict[str, Any] = {}
+        self.submitted_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def report(self, stage: str, fraction: float) -> None:
+        """
+        Records progress (fraction between 0 and 1) from inside the job.
+
+        Raises:
+            JobCancelled: If cancel() was called; the job ends here.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled(self.label)
+        self.stage = stage
+        self.progress = min(max(fraction, 0.0), 1.0)
+
+
+class JobQueue:
+    """
+    Runs calculations on worker threads; pages keep the job id and poll get() on later reruns.
+
+    Threads share result_cache and result_store, so a job can return just a store handle.
+    """
+
+    def __init__(self, max_workers: int = 2, keep_seconds: float = 3600):
+        self.keep_seconds = keep_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="esi-pf-job")
+        self._jobs: Dict[str, Job] = {}
+        self._futures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[Job], Any], label: str, kind: str = "job") -> Job:
+        """
+        Queues fn(job) on a worker and returns the job at once; fn's return value becomes job.result.
+
+        fn runs outside the script thread, so it must not call Streamlit.
+        """
+        job = Job(label, kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._pool.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        token = job_id_var.set(job.id)
+        started_at = time.monotonic()
+        JOB_WAIT_SECONDS.observe(started_at - job.submitted_at, kind=job.kind)
+        log.info("job started", extra={"kind": job.kind, "label": job.label})
+        try:
+            job.report("Starting", 0.0)
+            job.status = RUNNING
+            job.result = fn(job)
+            # Not report(): a result that is ready is kept even if cancel() came in meanwhile
+            job.stage, job.progress = "Done", 1.0
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+            log.warning("job failed", exc_info=True, extra={"kind": job.kind, "label": job.label})
+        finally:
+            job.finished_at = time.monotonic()
+            JOBS.inc(kind=job.kind, status=job.status)
+            JOB_SECONDS.observe(job.finished_at - started_at, kind=job.kind)
+            log.info("job finished", extra={"kind": job.kind, "status": job.status, "seconds": round(job.finished_at - started_at, 3)})
+            job_id_var.reset(token)
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: Optional[str]) -> None:
+        """Stops a queued job before it starts, or a running one at its next report()."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return
+        job._cancel.set()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.monotonic()
+            JOBS.inc(kind=job.kind, status=CANCELLED)  # never reached _run
+
+    def discard(self, job_id: Optional[str]) -> None:
+        """Cancels the job if it is still pending and forgets it."""
+        self.cancel(job_id)
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
+
+    def _prune(self) -> None:
+        # Caller must hold self._lock. Results nobody came back for are dropped after keep_seconds.
+        cutoff = time.monotonic() - self.keep_seconds
+        for job_id in [i for i, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+
+def snapshot(file):
+    """Copies an uploaded file into a buffer the job reads on its own, as the page keeps using the original."""
+    if file is None or isinstance(file, pd.DataFrame):
+        return file
+    buffer = BytesIO(file.getvalue())
+    buffer.name = file.name
+    return buffer
+
+
+job_queue = JobQueue(
+    max_workers=int(os.environ.get("ESI_PF_JOB_WORKERS", 2)),
+    keep_seconds=float(os.environ.get("ESI_PF_JOB_KEEP_MINUTES", 60)) * 60,
+)
+registry.callback("esi_pf_jobs_in_queue", "Background jobs known to the queue, by status.", "gauge",
+                  lambda: {(status,): count for status, count in job_queue.stats().items()}, ["status"])
@@ -0,0 +1,143 @@
+"""
+Company profiles: how each client company's payroll workbook is laid out, one .toml file each.
+
+engine.CompanyPipeline turns a profile into the calculators; only tomllib is imported here.
+"""
+import tomllib
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+PROFILE_DIR = Path(__file__).resolve().parent
+
+SheetName = Union[str, int]
+
+# key -> (type, default); keys without a default are required
+_SHEET_KEYS = {"sheet": ((str, int), None), "header": (int, 0), "skipfooter": (int, 0)}
+_PF_KEYS = {
+    "sheet": ((str, int), None),
+    "code": (str, None),
+    "name": (str, None),
+    "father": (str, None),
+    "uan": (str, None),
+    "uan_type": (str, "number"),  # "number" or "text": how UANs are read from the payroll and the member list
+    "dob_format": (str, ""),  # strftime format of the member list's DoB; "" lets pandas parse each date
+    "gross_wages": (list, None),  # summed
+    "cap_epf_wages": (bool, False),  # EPF wages = gross wages up to EPF_WAGE_CAP (else equal to gross)
+    "edli_wages": (str, ""),  # column; "" means the EPF wages
+    "ncp_days": (str, None),
+    "ncp_days_sheet": ((str, int), ""),  # sheet to look NCP days up on by UAN; "" means the PF sheet
+    "ncp_days_output": (str, "NCP_DAYS"),
+}
+_ESI_KEYS = {
+    "sheet": ((str, int), None),
+    "code": (str, None),
+    "name": (str, None),
+    "esi_number": (str, None),
+    "days": (str, None),
+    "wages": (list, None),  # summed
+    "numbers_as_text": (bool, False),  # parse days, wages and IP numbers from text cells
+}
+
+
+def _section(values: Dict[str, Any], keys: Dict[str, tuple], where: str) -> Dict[str, Any]:
+    """values checked against keys, with the defaults filled in."""
+    unknown = set(values) - set(keys)
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+    section = {}
+    for key, (kind, default) in keys.items():
+        if key not in values:
+            if default is None:
+                raise ValueError(f"{where}: missing required key {key!r}")
+            section[key] = default
+        elif not isinstance(values[key], kind) or (kind is list and not values[key]):
+            raise ValueError(f"{where}: {key!r} has an invalid value {values[key]!r}")
+        else:
+            section[key] = values[key]
+    return section
+
+
+class CompanyProfile:
+    """
+    A validated company profile and the columns it needs from each payroll sheet.
+
+    Attributes:
+        company (str): Name shown in the app and used in manifests.
+        order (int): Position in COMPANIES.
+        single_payroll (bool): One workbook serves PF and ESI (else one workbook each).
+        sheet_options (Dict[SheetName, Dict[str, int]]): header/skipfooter per sheet.
+        pf, esi (Dict[str, Any]): The [pf] and [esi] tables with defaults filled in.
+    """
+
+    def __init__(self, data: Dict[str, Any], source: str = "<profile>"):
+        top = {key: value for key, value in data.items() if key not in ("sheets", "pf", "esi")}
+        top = _section(top, {"company": (str, None), "order": (int, 0), "single_payroll": (bool, False)}, source)
+        self.company: str = top["company"]
+        self.order: int = top["order"]
+        self.single_payroll: bool = top["single_payroll"]
+        self.sheet_options: Dict[SheetName, Dict[str, int]] = {}
+        for i, sheet in enumerate(data.get("sheets", [])):
+            options = _section(sheet, _SHEET_KEYS, f"{source} sheets[{i}]")
+            self.sheet_options[options.pop("sheet")] = options
+        self.pf: Dict[str, Any] = _section(data.get("pf", {}), _PF_KEYS, f"{source} [pf]")
+        self.esi: Dict[str, Any] = _section(data.get("esi", {}), _ESI_KEYS, f"{source} [esi]")
+        if self.pf["uan_type"] not in ("number", "text"):
+            raise ValueError(f"{source} [pf]: uan_type must be 'number' or 'text', not {self.pf['uan_type']!r}")
+
+    def ncp_sheet(self) -> SheetName:
+        return self.pf["ncp_days_sheet"] if self.pf["ncp_days_sheet"] != "" else self.pf["sheet"]
+
+    def columns(self, part: str) -> Dict[SheetName, List[str]]:
+        """The payroll columns calculating "pf" or "esi" reads, per sheet."""
+        if part == "pf":
+            pf = self.pf
+            columns = {pf["sheet"]: [pf["code"], pf["name"], pf["father"], pf["uan"], *pf["gross_wages"]]}
+            if pf["edli_wages"]:
+                columns[pf["sheet"]].append(pf["edli_wages"])
+            ncp = columns.setdefault(self.ncp_sheet(), [pf["uan"]] if self.ncp_sheet() != pf["sheet"] else [])
+            ncp.append(pf["ncp_days"])
+        else:
+            esi = self.esi
+            columns = {esi["sheet"]: [esi["code"], esi["name"], esi["esi_number"], esi["days"], *esi["wages"]]}
+        return {sheet: list(dict.fromkeys(cols)) for sheet, cols in columns.items()}
+
+    def payroll_reads(self, parts=("pf", "esi")) -> Dict[SheetName, Dict[str, Any]]:
+        """
+        read_sheets() options for the given parts: only the sheets and columns they use.
+
+        Returns:
+            Dict[SheetName, Dict[str, Any]]: Sheet -> header/skipfooter, usecols and (for text UANs) dtype.
+        """
+        reads: Dict[SheetName, Dict[str, Any]] = {}
+        for part in parts:
+            for sheet, columns in self.columns(part).items():
+                options = reads.setdefault(sheet, dict(self.sheet_options.get(sheet, {}), usecols=[]))
+                options["usecols"] += [col for col in columns if col not in options["usecols"]]
+        if "pf" in parts and self.pf["uan_type"] == "text":
+            reads[self.pf["sheet"]]["dtype"] = {self.pf["uan"]: str}
+        return reads
+
+    def pf_row_inputs(self) -> List[str]:
+        """Payroll values a PF challan row depends on (besides the member's DoB), for RowReuse."""
+        pf = self.pf
+        inputs = [pf["uan"], pf["name"], *pf["gross_wages"], pf["ncp_days"]]
+        return inputs + ([pf["edli_wages"]] if pf["edli_wages"] else [])
+
+
+def load_profile(path: Path) -> CompanyProfile:
+    """Reads and validates one profile file; raises ValueError if it is malformed."""
+    path = Path(path)
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"{path.name}: {e}") from e
+    return CompanyProfile(data, source=path.name)
+
+
+def load_profiles(directory: Path = PROFILE_DIR) -> Dict[str, CompanyProfile]:
+    """Every profile in directory, keyed by company, in profile order."""
+    profiles = sorted((load_profile(path) for path in directory.glob("*.toml")), key=lambda p: (p.order, p.company))
+    return {profile.company: profile for profile in profiles}
+
+
+PROFILES = load_profiles()
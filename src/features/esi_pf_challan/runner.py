@@ -0,0 +1,233 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
+    from .engine import CompanyPipeline
+
+from .profiles import PROFILES
+from .helpers.result_cache import result_cache, file_digest
+from .helpers.contributions import pf_cutoff_date
+from .helpers.incremental import RowReuse
+from .helpers.diagnostics import stage
+from .jobs import JobCancelled
+from ...monitoring import registry
+
+log = logging.getLogger(__name__)
+
+CALCULATIONS = registry.counter("esi_pf_calculations_total", "Company calculations run (cache hits excluded), by outcome.", ["company", "outcome"])
+CALCULATION_SECONDS = registry.histogram("esi_pf_calculation_seconds", "Time a company calculation took.", ["company"])
+PAYROLL_ROWS = registry.histogram(
+    "esi_pf_payroll_rows", "PF challan rows per calculation.", ["company"],
+    buckets=(100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000),
+)
+
+# One per profile in profiles/
+COMPANIES = list(PROFILES)
+
+# progress(stage, fraction done): called between stages by long-running functions (see jobs.Job.report)
+Progress = Callable[[str, float], None]
+
+
+def _no_progress(stage: str, fraction: float) -> None:
+    pass
+
+
+def _calculator(company: str) -> "CompanyPipeline":
+    """The compiled pipeline of company; the engine (and pandas' Excel readers) load on first use."""
+    from .engine import pipeline
+
+    return pipeline(company)
+
+
+def process_company(
+    company: str,
+    pf_payroll_file: "UploadedFile",
+    esi_payroll_file: "UploadedFile",
+    pf_members_file: "UploadedFile",
+    esi_members_file: "UploadedFile",
+    reuse: Optional[RowReuse] = None,
+    progress: Progress = _no_progress,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Runs the PF and ESI calculators of a company on one set of files.
+
+    Args:
+        company (str): One of COMPANIES.
+        pf_payroll_file (UploadedFile): Payroll workbook used for PF (single-payroll companies: the payroll workbook).
+        esi_payroll_file (UploadedFile): Payroll workbook used for ESI (single-payroll companies: same as pf_payroll_file).
+        pf_members_file (UploadedFile): PF active member list (.csv), or the member master's pf_members frame.
+        esi_members_file (UploadedFile): ESI list of employees (.xls/.xlsx), or the member master's esi_members frame.
+        reuse (Optional[RowReuse]): Reuse unchanged PF rows from last month's baseline (same results, less work).
+            ESI rows are always rebuilt: fractional days are rounded across the whole sheet.
+        progress (Progress): Told which stage is starting; may raise to abort between stages.
+
+    Returns:
+        Dict[str, pd.DataFrame]: "pf_df", "verify_pf", "esi_df" and "verify_esi".
+
+    Raises:
+        ValidationError: If payroll rows fail validation (missing UAN, not in the member list, ...).
+        ValueError: If the company is unknown or an input file is malformed.
+    """
+    return _recorded(company, lambda: _process_company(
+        company, pf_payroll_file, esi_payroll_file, pf_members_file, esi_members_file, reuse, progress,
+    ))
+
+
+def _recorded(company: str, calculate: Callable[[], Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    """Runs calculate() and counts it in the metrics and the log, whether it succeeds or raises."""
+    start = time.perf_counter()
+    company_label = company if company in COMPANIES else "unknown"
+    try:
+        results = calculate()
+    except JobCancelled:
+        CALCULATIONS.inc(company=company_label, outcome="cancelled")
+        raise
+    except Exception as e:
+        CALCULATIONS.inc(company=company_label, outcome="error")
+        log.warning("calculation failed", extra={"company": company, "seconds": round(time.perf_counter() - start, 3), "error": str(e)})
+        raise
+    seconds = time.perf_counter() - start
+    CALCULATIONS.inc(company=company_label, outcome="ok")
+    CALCULATION_SECONDS.observe(seconds, company=company_label)
+    PAYROLL_ROWS.observe(len(results["pf_df"]), company=company_label)
+    log.info("calculation finished", extra={
+        "company": company, "seconds": round(seconds, 3), "pf_rows": len(results["pf_df"]), "esi_rows": len(results["esi_df"]),
+    })
+    return results
+
+
+def _process_company(company, pf_payroll_file, esi_payroll_file, pf_members_file, esi_members_file, reuse, progress):
+    calculator = _calculator(company)
+    if PROFILES[company].single_payroll:
+        # Parse the workbook once and share the sheets between PF and ESI
+        progress("Reading payroll", 0.0)
+        payroll_sheets = calculator.read_payroll(pf_payroll_file)
+        progress("Calculating PF", 0.35)
+        with stage("PF"):
+            verify_pf, pf_df = calculator.calculate_pf(pf_payroll_file, pf_members_file, payroll_sheets, reuse=reuse)
+        progress("Calculating ESI", 0.7)
+        with stage("ESI"):
+            verify_esi, esi_df = calculator.calculate_esi(esi_payroll_file, esi_members_file, payroll_sheets)
+    else:
+        # Separate PF and ESI workbooks: each calculator reads only its own columns
+        progress("Calculating PF", 0.0)
+        with stage("PF"):
+            verify_pf, pf_df = calculator.calculate_pf(pf_payroll_file, pf_members_file, reuse=reuse)
+        progress("Calculating ESI", 0.5)
+        with stage("ESI"):
+            verify_esi, esi_df = calculator.calculate_esi(esi_payroll_file, esi_members_file)
+
+    return {"pf_df": pf_df, "verify_pf": verify_pf, "esi_df": esi_df, "verify_esi": verify_esi}
+
+
+def stream_company(
+    company: str,
+    pf_payroll_file: "UploadedFile",
+    esi_payroll_file: "UploadedFile",
+    pf_members_file: "UploadedFile",
+    esi_members_file: "UploadedFile",
+    pf_out: BinaryIO,
+    esi_out,
+    chunk_size: int = 10000,
+) -> Dict[str, int]:
+    """
+    Bounded-memory alternative to process_company: rows are streamed in batches of chunk_size
+    and the challan files written as they are computed. Names are not compared.
+
+    Args:
+        pf_out (BinaryIO): Binary file the PF challan text is written to.
+        esi_out: Path or binary buffer the ESI challan workbook is written to.
+
+    Returns:
+        Dict[str, int]: Rows written, as "pf_rows" and "esi_rows".
+    """
+    module = _calculator(company)
+    return {
+        "pf_rows": module.stream_pf(pf_payroll_file, pf_members_file, pf_out, chunk_size),
+        "esi_rows": module.stream_esi(esi_payroll_file, esi_members_file, esi_out, chunk_size),
+    }
+
+
+def cached_process_company(
+    company: str,
+    pf_payroll_file: "UploadedFile",
+    esi_payroll_file: "UploadedFile",
+    pf_members_file: "UploadedFile",
+    esi_members_file: "UploadedFile",
+    progress: Progress = _no_progress,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Same as process_company, but cached across reruns and sessions by file contents.
+
+    The returned frames are shared between sessions and must not be modified in place.
+    """
+    files = (pf_payroll_file, esi_payroll_file, pf_members_file, esi_members_file)
+    return result_cache.get_or_compute(_cache_key(company, files), lambda: process_company(company, *files, progress=progress))
+
+
+def _cache_key(company: str, files) -> Tuple[str, ...]:
+    # EPS eligibility depends on age at pf_cutoff_date, which moves every month
+    return (company, pf_cutoff_date().strftime("%Y-%m-%d")) + tuple(file_digest(f) for f in files)
+
+
+def _process_buffers(company: str, buffers: List[Tuple[str, bytes]]) -> Dict[str, pd.DataFrame]:
+    """Worker entry point: rebuilds named in-memory files and runs process_company."""
+    files = []
+    for name, data in buffers:
+        buffer = BytesIO(data)
+        buffer.name = name  # calculators look at the name to tell .xls from .xlsx
+        files.append(buffer)
+    return process_company(company, *files)
+
+
+def process_many(
+    jobs: Dict[str, Tuple[str, "UploadedFile", "UploadedFile", "UploadedFile", "UploadedFile"]],
+    max_workers: Optional[int] = None,
+    progress: Progress = _no_progress,
+) -> Dict[str, Union[Dict[str, pd.DataFrame], Exception]]:
+    """
+    Processes several establishments concurrently in worker processes, reusing cached results.
+
+    Args:
+        jobs: Establishment name -> (company, pf_payroll_file, esi_payroll_file, pf_members_file, esi_members_file).
+        max_workers: Worker processes (default: CPU count).
+        progress: Told after each establishment finishes. If it raises, establishments
+            not yet started are cancelled and the exception propagates.
+
+    Returns:
+        Establishment name -> process_company() results, or the exception it raised.
+    """
+    # spawn: forking the multi-threaded Streamlit server is unsafe
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool, \
+            ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as waiters:
+
+        def run(job):
+            company, *files = job
+            buffers = [(f.name, f.getvalue()) for f in files]
+            # Recorded here too: what the worker process records is lost with it
+            return result_cache.get_or_compute(
+                _cache_key(company, files),
+                lambda: _recorded(company, lambda: pool.submit(_process_buffers, company, buffers).result()),
+            )
+
+        futures = {name: waiters.submit(run, job) for name, job in jobs.items()}
+        results = {}
+        try:
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = e
+                progress(f"{len(results)} of {len(jobs)} establishments done", len(results) / max(len(jobs), 1))
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return results
@@ -1 +1,3 @@
-from .main import validate_ifsc_format, check_ifsc_exists
\ No newline at end of file
+from .main import validate_ifsc_format, check_ifsc_exists
+from .index import build_index, lookup_ifsc, index_info
+from .cache import ifsc_cache
\ No newline at end of file
@@ -0,0 +1,47 @@
+# Offline IFSC index:
+#   python -m src.features.ifsc_checker build-index IFSC.csv [more dumps...] [--output PATH]
+#   python -m src.features.ifsc_checker lookup HDFC0000123
+
+import argparse
+import json
+import sys
+import time
+
+from .index import build_index, index_path, lookup_ifsc
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.features.ifsc_checker",
+        description="Build or query the offline IFSC index used by the IFSC Checker.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build-index", help="Build the index from the published IFSC dump (CSV or JSON)")
+    build.add_argument("sources", nargs="+", help="IFSC.csv or JSON dump files; later files win on duplicate codes")
+    build.add_argument("--output", default=None, help=f"Index file to write (default: {index_path()})")
+
+    lookup = commands.add_parser("lookup", help="Look up one code in the index (no API call)")
+    lookup.add_argument("ifsc_code")
+    args = parser.parse_args(argv)
+
+    if args.command == "build-index":
+        start = time.perf_counter()
+        try:
+            count = build_index(args.sources, args.output)
+        except (OSError, ValueError) as e:
+            print(f"Could not build index: {e}", file=sys.stderr)
+            return 2
+        print(f"Indexed {count} IFSC codes into {args.output or index_path()} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    data = lookup_ifsc(args.ifsc_code)
+    if data is None:
+        print(f"{args.ifsc_code.upper()} is not in the offline index", file=sys.stderr)
+        return 1
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
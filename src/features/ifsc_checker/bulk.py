@@ -0,0 +1,132 @@
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .main import IFSC_PATTERN, MAX_CONNECTIONS, NOT_FOUND_MESSAGE, check_ifsc_exists
+
+DEFAULT_WORKERS = 8
+
+# Outcome of one IFSC cell in the annotated file
+STATUS_VALID = "Valid"
+STATUS_MISSING = "Missing"
+STATUS_BAD_FORMAT = "Invalid format"
+STATUS_NOT_FOUND = "Not found"
+STATUS_LOOKUP_FAILED = "Lookup failed"
+
+
+def read_accounts_file(file) -> pd.DataFrame:
+    """Reads an employee bank-account file (.csv or .xlsx) with every column as text, so codes and account numbers keep leading zeros."""
+    if Path(file.name).suffix.lower() == ".csv":
+        return pd.read_csv(file, dtype=str, keep_default_na=False)
+    return pd.read_excel(file, dtype=str).fillna("")
+
+
+def find_ifsc_columns(df: pd.DataFrame) -> List[str]:
+    """Returns the columns whose header mentions IFSC."""
+    return [col for col in df.columns if "IFSC" in str(col).upper()]
+
+
+def resolve_ifsc_codes(
+    codes: Iterable[str],
+    max_workers: int = DEFAULT_WORKERS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Looks up many IFSC codes concurrently, sharing the keep-alive session of check_ifsc_exists.
+
+    Args:
+        codes (Iterable[str]): Format-valid, upper-case codes; duplicates are looked up once.
+        max_workers (int): Concurrent lookups (capped at the session's connection pool size).
+        progress (Optional[Callable[[int, int], None]]): Called with (done, total) after each lookup.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Code -> check_ifsc_exists result.
+    """
+    unique_codes = list(dict.fromkeys(codes))
+    results: Dict[str, Dict[str, Any]] = {}
+    if not unique_codes:
+        return results
+
+    max_workers = max(1, min(max_workers, MAX_CONNECTIONS, len(unique_codes)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(check_ifsc_exists, code): code for code in unique_codes}
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(done, len(unique_codes))
+    return results
+
+
+def _status(result: Dict[str, Any]) -> str:
+    if result['status'] == 'success':
+        return STATUS_VALID
+    return STATUS_NOT_FOUND if result['message'] == NOT_FOUND_MESSAGE else STATUS_LOOKUP_FAILED
+
+
+def validate_accounts(
+    df: pd.DataFrame,
+    columns: List[str],
+    max_workers: int = DEFAULT_WORKERS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> pd.DataFrame:
+    """
+    Validates the IFSC columns of an employee bank-account file; each distinct well-formed code is looked up once.
+
+    Args:
+        df (pd.DataFrame): Employee rows, e.g. from read_accounts_file.
+        columns (List[str]): Columns holding IFSC codes.
+        max_workers (int): Concurrent lookups.
+        progress (Optional[Callable[[int, int], None]]): Lookup progress callback.
+
+    Returns:
+        pd.DataFrame: df with "<col> Status", "<col> Bank", "<col> Branch" and
+            "<col> Message" added after each IFSC column.
+    """
+    normalized = {col: df[col].astype("string").str.strip().str.upper().fillna("") for col in columns}
+    well_formed = {col: codes.str.fullmatch(IFSC_PATTERN) for col, codes in normalized.items()}
+
+    to_lookup = pd.concat([codes[well_formed[col]] for col, codes in normalized.items()]) if columns else []
+    results = resolve_ifsc_codes(to_lookup, max_workers=max_workers, progress=progress)
+
+    out = df.copy()
+    for col in columns:
+        codes, ok = normalized[col], well_formed[col]
+        looked_up = codes[ok].map(results.__getitem__)
+
+        status = pd.Series(STATUS_BAD_FORMAT, index=df.index)
+        status[codes == ""] = STATUS_MISSING
+        status[ok] = looked_up.map(_status)
+        message = pd.Series("", index=df.index)
+        message[status == STATUS_BAD_FORMAT] = "Must be 4 letters, '0', then 6 alphanumeric characters."
+        message[ok] = looked_up.map(lambda result: result['message'])
+        data = looked_up.map(lambda result: result['data'] if result['status'] == 'success' else {})
+
+        annotations = pd.DataFrame({
+            f"{col} Status": status,
+            f"{col} Bank": data.map(lambda d: d.get("BANK") or "").reindex(df.index, fill_value=""),
+            f"{col} Branch": data.map(lambda d: d.get("BRANCH") or "").reindex(df.index, fill_value=""),
+            f"{col} Message": message,
+        })
+        position = out.columns.get_loc(col) + 1
+        for offset, name in enumerate(annotations.columns):
+            out.insert(position + offset, name, annotations[name])
+    return out
+
+
+def summarize_validation(annotated: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Counts the outcomes per IFSC column (rows: columns, columns: statuses)."""
+    statuses = [STATUS_VALID, STATUS_MISSING, STATUS_BAD_FORMAT, STATUS_NOT_FOUND, STATUS_LOOKUP_FAILED]
+    counts = {col: annotated[f"{col} Status"].value_counts().reindex(statuses, fill_value=0) for col in columns}
+    return pd.DataFrame(counts).T.rename_axis(index="IFSC column", columns=None)
+
+
+def annotated_file_bytes(annotated: pd.DataFrame, file_name: str) -> bytes:
+    """Serializes the annotated rows in the same format (.csv or .xlsx) as the uploaded file."""
+    if Path(file_name).suffix.lower() == ".csv":
+        return annotated.to_csv(index=False).encode("utf-8-sig")
+    output = io.BytesIO()
+    annotated.to_excel(output, index=False, sheet_name="IFSC Validation", engine="xlsxwriter")
+    return output.getvalue()
@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ...monitoring import registry
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[3] / "data" / "ifsc_cache.sqlite"
+
+
+class IFSCCache:
+    """
+    Two-tier TTL cache for IFSC API results: an in-process LRU in front of a SQLite file shared across processes.
+
+    "Not found" answers expire after the shorter negative_ttl, so a newly opened branch shows up soon.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        max_entries: int = 5000,
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        # Caller must hold self._lock; the one connection is shared by all threads under it
+        if self._conn is None and self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")  # no fsync per insert; losing the last few entries in a crash is harmless
+                conn.execute("CREATE TABLE IF NOT EXISTS ifsc_cache (code TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID")
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                self.path = None  # Disk tier unavailable (e.g. read-only install); memory only
+        return self._conn
+
+    def _remember(self, code: str, result: Dict[str, Any], expires_at: float) -> None:
+        # Caller must hold self._lock
+        self._memory[code] = (result, expires_at)
+        self._memory.move_to_end(code)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for code, or None if it is missing or expired."""
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(code)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(code)
+                self.memory_hits += 1
+                return entry[0]
+
+            db = self._db()
+            row = None
+            if db is not None:
+                try:
+                    row = db.execute("SELECT result, expires_at FROM ifsc_cache WHERE code = ? AND expires_at > ?", (code, now)).fetchone()
+                except sqlite3.Error:
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+            result = json.loads(row[0])
+            self._remember(code, result, row[1])
+            self.disk_hits += 1
+            return result
+
+    def put(self, code: str, result: Dict[str, Any], found: bool) -> None:
+        """Stores a definitive answer; found=False uses the shorter negative TTL."""
+        expires_at = self._clock() + (self.ttl if found else self.negative_ttl)
+        with self._lock:
+            self._remember(code, result, expires_at)
+            db = self._db()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute("INSERT OR REPLACE INTO ifsc_cache VALUES (?, ?, ?)", (code, json.dumps(result), expires_at))
+            except sqlite3.Error:
+                pass  # e.g. locked by another process for too long; the memory tier still has it
+
+    def purge_expired(self) -> int:
+        """Deletes expired rows from both tiers; returns how many disk rows were removed."""
+        now = self._clock()
+        with self._lock:
+            for code in [code for code, (_, expires_at) in self._memory.items() if expires_at <= now]:
+                del self._memory[code]
+            db = self._db()
+            if db is None:
+                return 0
+            with db:
+                return db.execute("DELETE FROM ifsc_cache WHERE expires_at <= ?", (now,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM ifsc_cache")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by every lookup in this process. IFSC_CACHE_PATH="" keeps the cache in memory only.
+_cache_path = os.environ.get("IFSC_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+ifsc_cache = IFSCCache(
+    path=Path(_cache_path) if _cache_path else None,
+    max_entries=int(os.environ.get("IFSC_CACHE_MAX_ENTRIES", 5000)),
+    ttl=float(os.environ.get("IFSC_CACHE_TTL_HOURS", 30 * 24)) * 3600,
+    negative_ttl=float(os.environ.get("IFSC_CACHE_NEGATIVE_TTL_HOURS", 24)) * 3600,
+)
+registry.callback("ifsc_cache_hits_total", "IFSC API results served from the cache, by tier.", "counter",
+                  lambda: {("memory",): ifsc_cache.stats()["memory_hits"], ("disk",): ifsc_cache.stats()["disk_hits"]}, ["tier"])
+registry.callback("ifsc_cache_misses_total", "IFSC codes not in the cache (looked up via the API).", "counter",
+                  lambda: ifsc_cache.stats()["misses"])
@@ -0,0 +1,169 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Built with `python -m src.features.ifsc_checker build-index <IFSC.csv>`;
+# IFSC_INDEX_PATH points lookups at another file.
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[3] / "data" / "ifsc_index.sqlite"
+
+# Columns of the published dump (https://github.com/razorpay/ifsc/releases) that hold yes/no flags
+BOOLEAN_FIELDS = {"IMPS", "RTGS", "NEFT", "UPI"}
+
+# What an existence-only record holds: IFSC.json lists codes per bank without branch details
+CODE_ONLY_KEYS = {"IFSC", "BANKCODE"}
+
+_BATCH_ROWS = 10000
+_local = threading.local()
+
+
+def index_path() -> Path:
+    """Returns the path of the offline IFSC index (IFSC_INDEX_PATH overrides the default)."""
+    return Path(os.environ.get("IFSC_INDEX_PATH") or DEFAULT_INDEX_PATH)
+
+
+def _clean_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    # Match the API's JSON: real booleans for the payment flags, None for blanks
+    cleaned = {}
+    for key, value in record.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                value = None
+            elif key in BOOLEAN_FIELDS and value.lower() in ("true", "false"):
+                value = value.lower() == "true"
+        cleaned[key] = value
+    return cleaned
+
+
+def _read_records(source: Path) -> Iterator[Dict[str, Any]]:
+    """Yields IFSC records from a CSV or JSON dump."""
+    if source.suffix.lower() == ".csv":
+        with open(source, newline="", encoding="utf-8-sig") as fh:
+            yield from csv.DictReader(fh)
+        return
+
+    data = json.loads(source.read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        # [{"IFSC": ..., "BANK": ...}, ...]
+        yield from data
+        return
+    for key, value in data.items():
+        if isinstance(value, dict):
+            # Per-bank file: {"HDFC0000001": {...}, ...}
+            yield dict(value, IFSC=value.get("IFSC", key))
+        elif isinstance(value, list):
+            # IFSC.json: {"HDFC": ["HDFC0000001", ...], ...} (codes only)
+            for code in value:
+                yield {"IFSC": code, "BANKCODE": key}
+
+
+def build_index(sources: Iterable[str], output: Optional[str] = None) -> int:
+    """
+    Builds the offline IFSC index (a SQLite table keyed on the code) from one or more dump files.
+
+    It is written to a temporary file and moved into place, so readers never see a partial index.
+
+    Args:
+        sources (Iterable[str]): CSV or JSON dump files; later files win on duplicate codes.
+        output (Optional[str]): Index file to write (defaults to index_path()).
+
+    Returns:
+        int: Number of IFSC codes in the index.
+
+    Raises:
+        ValueError: If a source has records without an IFSC code.
+    """
+    output = Path(output) if output else index_path()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".part")
+    tmp.unlink(missing_ok=True)
+
+    sources = [Path(source) for source in sources]
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("CREATE TABLE ifsc (code TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        for source in sources:
+            batch: List[tuple] = []
+            for record in _read_records(source):
+                code = str(record.get("IFSC") or "").upper().strip()
+                if not code:
+                    raise ValueError(f"{source.name}: record without an IFSC code: {record}")
+                record = _clean_record(dict(record, IFSC=code))
+                batch.append((code, json.dumps(record, ensure_ascii=False)))
+                if len(batch) == _BATCH_ROWS:
+                    conn.executemany("INSERT OR REPLACE INTO ifsc VALUES (?, ?)", batch)
+                    batch = []
+            conn.executemany("INSERT OR REPLACE INTO ifsc VALUES (?, ?)", batch)
+
+        count = conn.execute("SELECT COUNT(*) FROM ifsc").fetchone()[0]
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("built_at", time.strftime("%Y-%m-%d %H:%M:%S")),
+            ("sources", json.dumps([source.name for source in sources])),
+            ("count", str(count)),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+    tmp.replace(output)
+    return count
+
+
+def _connection() -> Optional[sqlite3.Connection]:
+    # One read-only connection per thread, reopened when the index file is rebuilt
+    path = index_path()
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    cached = getattr(_local, "index", None)
+    if cached and cached[0] == (path, mtime):
+        return cached[1]
+    if cached:
+        cached[1].close()
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    _local.index = ((path, mtime), conn)
+    return conn
+
+
+def has_details(record: Dict[str, Any]) -> bool:
+    """False for an existence-only record (see CODE_ONLY_KEYS): the code exists, but bank and branch are unknown."""
+    return any(value is not None for key, value in record.items() if key not in CODE_ONLY_KEYS)
+
+
+def lookup_ifsc(ifsc_code: str) -> Optional[Dict[str, Any]]:
+    """
+    Looks up an IFSC code in the offline index.
+
+    Returns:
+        Optional[Dict[str, Any]]: The branch record (same keys as the Razorpay API; only
+            CODE_ONLY_KEYS for codes from IFSC.json), or None if the code is not in the
+            index or no index has been built.
+    """
+    conn = _connection()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute("SELECT data FROM ifsc WHERE code = ?", (ifsc_code.upper().strip(),)).fetchone()
+    except sqlite3.DatabaseError:
+        # Not a valid index (e.g. an interrupted copy); behave as if there were none
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def index_info() -> Optional[Dict[str, str]]:
+    """Returns the build details (built_at, sources, count) of the offline index, or None if there is none."""
+    conn = _connection()
+    if conn is None:
+        return None
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    except sqlite3.DatabaseError:
+        return None
@@ -1,6 +1,57 @@
-import requests
+import os
+import threading
+import time
 import re
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+
+from ...monitoring import registry
+from .cache import ifsc_cache
+from .index import has_details, lookup_ifsc
+
+if TYPE_CHECKING:
+    # requests is imported on the first API call: most lookups are answered by the index or the cache
+    import requests
+
+# Standard IFSC format: 4 letters + 0 + 6 alphanumeric characters
+IFSC_PATTERN = r'[A-Z]{4}0[A-Z0-9]{6}'
+
+# IFSC_API_URL points lookups at another server (e.g. tools/ifsc_stub_server.py)
+DEFAULT_API_URL = "https://ifsc.razorpay.com"
+NOT_FOUND_MESSAGE = 'IFSC code not found in the database.'
+
+# Keep-alive connections shared by all lookups (and bulk worker threads)
+MAX_CONNECTIONS = 32
+_session = None
+_session_lock = threading.Lock()
+
+LOOKUP_SECONDS = registry.histogram("ifsc_lookup_seconds", "IFSC lookups by where the answer came from (index, cache or api).", ["source"])
+LOOKUP_ERRORS = registry.counter("ifsc_lookup_errors_total", "IFSC API lookups that returned no bank details, by reason.", ["reason"])
+
+def api_url() -> str:
+    return os.environ.get("IFSC_API_URL", DEFAULT_API_URL).rstrip("/")
+
+def get_session() -> "requests.Session":
+    """Returns the shared HTTP session, retrying connection errors, 429s and 5xx responses with backoff."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=MAX_CONNECTIONS)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
 
 def validate_ifsc_format(ifsc_code: str) -> bool:
     """
@@ -10,13 +61,14 @@ def validate_ifsc_format(ifsc_code: str) -> bool:
     if ifsc_code is None:
         return False
         
-    # Standard IFSC format regex
-    pattern = r'^[A-Z]{4}0[A-Z0-9]{6}$'
-    return bool(re.match(pattern, ifsc_code.upper()))
+    return bool(re.fullmatch(IFSC_PATTERN, ifsc_code.upper()))
 
 def check_ifsc_exists(ifsc_code: str) -> Dict[str, Any]:
     """
-    Check if a valid IFSC code exists via the Razorpay API.
+    Check if a valid IFSC code exists, using the offline index first, then the response cache, then the Razorpay API.
+
+    Codes the index lists without details (IFSC.json) still go to the cache/API for
+    bank and branch; if those fail, the index's word that the code exists stands.
     
     Args:
         ifsc_code: 11-character IFSC code string (already validated for format).
@@ -25,11 +77,61 @@ def check_ifsc_exists(ifsc_code: str) -> Dict[str, Any]:
         dict: {'status': 'success'/'error', 'message': str, 'data': dict or None}
     """
     ifsc_code = ifsc_code.upper().strip()
-    
-    url = f"https://ifsc.razorpay.com/{ifsc_code}"
-    
+    start = time.perf_counter()
+
+    data = lookup_ifsc(ifsc_code)
+    if data is not None and has_details(data):
+        LOOKUP_SECONDS.observe(time.perf_counter() - start, source="index")
+        return {
+            'status': 'success',
+            'message': f"IFSC code found for {data.get('BANK') or 'Unknown Bank'}.",
+            'data': data
+        }
+
+    result = ifsc_cache.get(ifsc_code)
+    if result is not None:
+        LOOKUP_SECONDS.observe(time.perf_counter() - start, source="cache")
+    else:
+        result = _fetch_ifsc(ifsc_code)
+        LOOKUP_SECONDS.observe(time.perf_counter() - start, source="api")
+        # Only definitive answers are cached; timeouts and server errors are retried next time
+        if result['status'] == 'success':
+            ifsc_cache.put(ifsc_code, result, found=True)
+        elif result['message'] == NOT_FOUND_MESSAGE:
+            ifsc_cache.put(ifsc_code, result, found=False)
+    if data is not None and result['status'] != 'success':
+        return {
+            'status': 'success',
+            'message': f"IFSC code found ({data.get('BANKCODE') or 'unknown bank'}); branch details are unavailable.",
+            'data': data
+        }
+    return result
+
+def _fetch_ifsc(ifsc_code: str) -> Dict[str, Any]:
+    """Looks up an upper-case IFSC code via the API; same result shape as check_ifsc_exists."""
+    url = f"{api_url()}/{ifsc_code}"
+    result = _request_ifsc(url, ifsc_code)
+    if result['status'] == 'error':
+        LOOKUP_ERRORS.inc(reason=_error_reason(result['message']))
+    return result
+
+def _error_reason(message: str) -> str:
+    """Short, fixed label for an error message of _request_ifsc (the messages themselves vary)."""
+    if message == NOT_FOUND_MESSAGE:
+        return "not_found"
+    if message.startswith("Request timed out"):
+        return "timeout"
+    if message.startswith("API connection error"):
+        return "http_status"
+    if message.startswith("Connection error"):
+        return "connection"
+    return "invalid_data"
+
+def _request_ifsc(url: str, ifsc_code: str) -> Dict[str, Any]:
+    import requests
+
     try:
-        response = requests.get(url, timeout=5)
+        response = get_session().get(url, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -51,7 +153,7 @@ def check_ifsc_exists(ifsc_code: str) -> Dict[str, Any]:
         elif response.status_code == 404:
             return {
                 'status': 'error',
-                'message': 'IFSC code not found in the database.',
+                'message': NOT_FOUND_MESSAGE,
                 'data': None
             }
         else:
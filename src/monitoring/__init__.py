@@ -0,0 +1,2 @@
+from .metrics import registry, start_exporter, write_metrics_file, PAGE_ERRORS
+from .logs import configure_logging, job_id_var, JsonFormatter
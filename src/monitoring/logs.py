@@ -0,0 +1,61 @@
+import json
+import logging
+import os
+import sys
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Id of the background job the current thread is running (set by jobs.JobQueue), added to every log line
+job_id_var: ContextVar[Optional[str]] = ContextVar("job_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, job_id and any `extra=` fields.
+
+        log.info("calculation finished", extra={"company": "HNG", "rows": 1200})
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "job_id": getattr(record, "job_id", None) or job_id_var.get(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+_configure_lock = threading.Lock()
+_handler: Optional[logging.Handler] = None
+
+
+def configure_logging() -> None:
+    """
+    Sends the app's logs (the src.* and pages.* loggers) to stderr as JSON lines; later calls do nothing.
+
+    ESI_PF_LOG_LEVEL sets the level (default INFO).
+    """
+    global _handler
+    with _configure_lock:
+        if _handler is not None:
+            return
+        _handler = logging.StreamHandler(sys.stderr)
+        _handler.setFormatter(JsonFormatter())
+        level = os.environ.get("ESI_PF_LOG_LEVEL", "INFO").upper()
+        for name in ("src", "pages"):
+            logger = logging.getLogger(name)
+            logger.addHandler(_handler)
+            logger.setLevel(level)
+            logger.propagate = False
@@ -0,0 +1,247 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+# Seconds: from a cached lookup up to a month-end payroll of several hundred thousand rows
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+CallbackValue = Union[float, Dict[Tuple[str, ...], float]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {list(self.labelnames)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """A count that only goes up, per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        return self._header() + [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values.items()]
+
+
+class Histogram(_Metric):
+    """Observed values counted into cumulative buckets (le = upper bound), with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], list] = {}  # labels -> [count per bucket (+Inf last), sum]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts[0][index] += 1
+            counts[1] += value
+
+    def render(self) -> list:
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        lines = self._header()
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Callback(_Metric):
+    """A gauge or counter read from fn() at export time, for figures other objects already keep (e.g. cache stats())."""
+
+    def __init__(self, name: str, help: str, kind: str, fn: Callable[[], CallbackValue], labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.fn = fn
+
+    def render(self) -> list:
+        value = self.fn()
+        values = value if isinstance(value, dict) else {(): value}
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values.items() if v is not None
+        ]
+
+
+class Registry:
+    """
+    The metrics of this process, rendered in the Prometheus text format.
+
+    Asking again for an existing name returns it, as Streamlit may re-import a module on a code change.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and type(existing) is type(metric) and not isinstance(metric, Callback):
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_add(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, kind: str, fn: Callable[[], CallbackValue], labelnames: Sequence[str] = ()) -> Callback:
+        """
+        Registers a metric read from fn() on every export.
+
+        Args:
+            kind (str): "gauge" or "counter".
+            fn: Returns the value, or a dict of label values (in labelnames order) -> value.
+        """
+        return self._get_or_add(Callback(name, help, kind, fn, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                continue  # a broken callback must not take the whole export down
+        return "\n".join(lines) + "\n"
+
+
+def _resident_memory_bytes() -> Optional[float]:
+    """Current resident memory of the process (Linux), else its peak (other Unixes), else None."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in bytes on macOS, KiB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# Shared by every module of the app in this process
+registry = Registry()
+_started_at = time.time()
+registry.callback("process_resident_memory_bytes", "Resident memory of the app process.", "gauge", _resident_memory_bytes)
+registry.callback("process_start_time_seconds", "Start time of the app process (Unix time).", "gauge", lambda: _started_at)
+# Incremented by the pages wherever they show an error to the user
+PAGE_ERRORS = registry.counter("app_page_errors_total", "Errors shown to users, by page and kind (validation or unexpected).", ["page", "kind"])
+
+
+def _serve(host: str, port: int) -> None:
+    # http.server is imported here: it is only needed when the exporter is switched on
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # one line per scrape is noise
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+
+def write_metrics_file(path: Path) -> None:
+    """Writes the current metrics to path, replacing it atomically so readers never see half a file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(registry.render(), encoding="utf-8")
+    os.replace(partial, path)
+
+
+def _flush_forever(path: Path, interval: float) -> None:
+    while True:
+        try:
+            write_metrics_file(path)
+        except OSError:
+            pass  # e.g. the directory went away; try again next time
+        time.sleep(interval)
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_exporter() -> None:
+    """Starts the exporters set up by ESI_PF_METRICS_PORT / ESI_PF_METRICS_FILE (see README), once per process."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+        port = os.environ.get("ESI_PF_METRICS_PORT")
+        if port:
+            _serve(os.environ.get("ESI_PF_METRICS_HOST", "0.0.0.0"), int(port))
+        path = os.environ.get("ESI_PF_METRICS_FILE")
+        if path:
+            interval = float(os.environ.get("ESI_PF_METRICS_FLUSH_SECONDS", 15))
+            threading.Thread(target=_flush_forever, args=(Path(path), interval), name="metrics-file", daemon=True).start()
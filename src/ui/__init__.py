@@ -0,0 +1,3 @@
+from .preview import paginated_preview
+from .progress import job_progress
+from .errors import validation_error
@@ -0,0 +1,25 @@
+import streamlit as st
+
+from src.features.esi_pf_challan import ValidationError
+
+
+def validation_error(error: ValueError, title: str, key: str) -> None:
+    """
+    Shows a validation error's message and, for a ValidationError, a CSV download of its rows.
+
+    Args:
+        error (ValueError): The error raised by the calculation.
+        title (str): Headline shown above the message.
+        key (str): Unique widget key.
+    """
+    st.error(f"{title}\n```\n{error}\n```")
+    if isinstance(error, ValidationError) and len(error.rows):
+        listed = f"all {error.count}" if error.count == len(error.rows) else f"the first {len(error.rows)} of {error.count}"
+        st.download_button(
+            label=f"📥 Download {listed} rows (CSV)",
+            data=error.to_csv(),
+            file_name="validation_errors.csv",
+            mime="text/csv",
+            key=key,
+            on_click="ignore",
+        )
@@ -0,0 +1,86 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [50, 100, 500, 1000]
+# Row labels match the sheet rows (row 1 is the header)
+ROW_OFFSET = 2
+_PAYROLL_ORDER = "(payroll order)"
+
+
+def _view_positions(df: pd.DataFrame, key: str, query: str, search_cols: Sequence[str], sort_col: Optional[str], descending: bool) -> np.ndarray:
+    """Row positions matching query, in display order; remembered until the frame, query or sort changes."""
+    signature = (df.attrs.get("result_key") or id(df), len(df), query, tuple(search_cols), sort_col, descending)
+    cached = st.session_state.get(f"{key}_view")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    positions = np.arange(len(df))
+    if query:
+        found = np.zeros(len(df), dtype=bool)
+        for col in search_cols:
+            found |= df[col].astype("string").str.contains(query, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        positions = positions[found]
+    if sort_col is not None:
+        values = df[sort_col].iloc[positions].reset_index(drop=True)
+        order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+        positions = positions[order]
+
+    st.session_state[f"{key}_view"] = (signature, positions)
+    return positions
+
+
+def paginated_preview(
+    df: pd.DataFrame,
+    key: str,
+    search_cols: Sequence[str] = (),
+    mask: Optional[np.ndarray] = None,
+    page_columns: Optional[Dict[str, np.ndarray]] = None,
+    page_size: int = 100,
+) -> None:
+    """
+    Shows one page of df, with search, sorting and paging done on the server; row labels are sheet row numbers.
+
+    Args:
+        df (pd.DataFrame): Frame to preview; not modified.
+        key (str): Unique widget key prefix.
+        search_cols (Sequence[str]): Columns searched (case-insensitive substring) by the search box.
+        mask (Optional[np.ndarray]): Boolean array over df's rows; only True rows are shown.
+        page_columns (Optional[Dict[str, np.ndarray]]): Extra full-length columns added to the shown page only.
+        page_size (int): Default rows per page (one of PAGE_SIZES).
+    """
+    controls = st.columns([3, 2, 1, 1])
+    query = controls[0].text_input(
+        "Search", key=f"{key}_search", placeholder=f"Search {', '.join(search_cols)}" if search_cols else "Search",
+        disabled=not search_cols, label_visibility="collapsed",
+    ).strip()
+    sort_choice = controls[1].selectbox("Sort by", [_PAYROLL_ORDER] + list(df.columns), key=f"{key}_sort", label_visibility="collapsed")
+    descending = controls[2].toggle("Desc", key=f"{key}_desc", disabled=sort_choice == _PAYROLL_ORDER)
+    size = controls[3].selectbox(
+        "Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+        key=f"{key}_size", label_visibility="collapsed", format_func=lambda n: f"{n} rows",
+    )
+
+    sort_col = None if sort_choice == _PAYROLL_ORDER else sort_choice
+    positions = _view_positions(df, key, query, search_cols, sort_col, descending)
+    if mask is not None:
+        positions = positions[np.asarray(mask, dtype=bool)[positions]]
+
+    n_pages = max(1, -(-len(positions) // size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1  # e.g. the search narrowed the rows
+    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key) if n_pages > 1 else 1
+
+    shown = positions[(page - 1) * size:page * size]
+    page_df = df.iloc[shown].copy()
+    for name, values in (page_columns or {}).items():
+        page_df[name] = np.asarray(values)[shown]
+    page_df.index = shown + ROW_OFFSET
+
+    start = (page - 1) * size
+    st.caption(f"Rows {start + 1 if len(shown) else 0}–{start + len(shown)} of {len(positions)}" + (f" (of {len(df)})" if len(positions) != len(df) else ""))
+    st.dataframe(page_df, width='stretch')
+
@@ -0,0 +1,25 @@
+import streamlit as st
+
+from src.features.esi_pf_challan import job_queue
+
+
+@st.fragment(run_every="1s")
+def job_progress(job_id: str, key: str) -> None:
+    """
+    Shows a background job's progress with a Cancel button, refreshing only itself every second.
+
+    Once the job has finished the whole page reruns to pick up the result.
+
+    Args:
+        job_id (str): Id of a job_queue job.
+        key (str): Unique widget key prefix.
+    """
+    job = job_queue.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+
+    status_cols = st.columns([6, 1])
+    status_cols[0].progress(job.progress, text=f"{job.label}: {job.stage}")
+    if status_cols[1].button("✖ Cancel", key=f"{key}_cancel"):
+        job_queue.cancel(job_id)
+        st.rerun()
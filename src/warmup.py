@@ -0,0 +1,79 @@
+import importlib
+import importlib.util
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def _import(*names: str) -> Callable[[], None]:
+    def step():
+        for name in names:
+            if importlib.util.find_spec(name) is not None:  # optional engines may be missing
+                importlib.import_module(name)
+    return step
+
+
+def _calculators() -> None:
+    from src.features.esi_pf_challan.engine import pipeline
+    from src.features.esi_pf_challan.profiles import PROFILES
+
+    for company in PROFILES:
+        pipeline(company)
+
+
+def _esi_template() -> None:
+    from src.features.esi_pf_challan.helpers.save_output import load_instructions_rows
+
+    load_instructions_rows()
+
+
+# In the order the first calculation needs them
+WARM_UP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("pandas", _import("pandas", "pyarrow")),
+    ("excel engines", _import("openpyxl", "python_calamine", "xlsxwriter")),
+    ("calculators", _calculators),
+    ("ESI template", _esi_template),
+    ("requests", _import("requests")),
+]
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Imports what the first calculation would otherwise import and parses the ESI template.
+
+    Failing steps are logged and skipped.
+
+    Returns:
+        Dict[str, float]: Seconds taken by each step that succeeded.
+    """
+    timings = {}
+    for name, step in WARM_UP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            log.warning("warm-up step failed", exc_info=True, extra={"step": name})
+            continue
+        timings[name] = round(time.perf_counter() - start, 3)
+    log.info("warm-up finished", extra={"seconds": timings})
+    return timings
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_warm_up() -> None:
+    """Runs warm_up() once per process on a background thread, unless ESI_PF_WARMUP=0."""
+    global _started
+    if os.environ.get("ESI_PF_WARMUP", "1") == "0":
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
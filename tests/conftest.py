@@ -0,0 +1,83 @@
+import argparse
+import io
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.features.ifsc_checker import main as ifsc_main  # noqa: E402
+from src.features.ifsc_checker.cache import IFSCCache  # noqa: E402
+from tools.ifsc_stub_server import Stats, make_handler  # noqa: E402
+
+# "15-May-2002" first: pandas would guess %d-%B-%Y from it and fail on "15-Mar-2008"
+DOBS = ["15-May-2002", "15-Mar-2008", "01-Sep-1960", "28-Feb-1975"]
+UANS = [100000000001, 100000000002, 100000000003, 100000000004]
+# The IFSC stub answers 404 for codes whose branch part starts with "9"
+UNKNOWN_IFSC = "SBIN0900001"
+
+
+def named_buffer(data: bytes, name: str) -> io.BytesIO:
+    """An in-memory file named like an upload (calculators look at the suffix)."""
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return buffer
+
+
+@pytest.fixture
+def pf_members_csv() -> bytes:
+    return pd.DataFrame({
+        "UAN": UANS,
+        "Name": ["ASHA DEVI", "RAVI KUMAR", "MOHAN LAL", "SITA RAM"],
+        "Father's/Husband's Name": ["RAM DEVI", "SURESH KUMAR", "HARI LAL", "GOPAL RAM"],
+        "DoB": DOBS,
+    }).to_csv(index=False).encode("utf-8")
+
+
+def somany_workbook(rows=None) -> bytes:
+    """A Somany workbook: WAGES, and PAYMENT with a title row above its header; rows picks (and may repeat) members."""
+    wages = pd.DataFrame({
+        "code": [1, 2, 3, 4],
+        "naam": ["ASHA DEVI", "RAVI KUMAR", "MOHAN LAL", "SITA RAM"],
+        "father": ["RAM DEVI", "SURESH KUMAR", "HARI LAL", "GOPAL RAM"],
+        "uan_no": UANS,
+        "esi_no": [2000000001, 2000000002, 2000000003, 2000000004],
+        "basic_sal": [9000, 12000, 8000, 15000],
+        "earn_pf": [1000, 4000, 500, 0],
+        "days": [26, 25.5, 24.5, 26],
+        "tot_earn": [10000, 16000, 8500, 15000],
+        "ot_amtord": [0, 500, 0, 250],
+    })
+    payment = pd.DataFrame({"uan_no": UANS, "NCP DAYS": [0, 1, 2, 0]})
+    if rows is not None:
+        wages, payment = wages.iloc[rows], payment.iloc[rows]
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        wages.to_excel(writer, sheet_name="WAGES", index=False)
+        payment.to_excel(writer, sheet_name="PAYMENT", index=False, startrow=1)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def somany_payroll() -> bytes:
+    return somany_workbook()
+
+
+@pytest.fixture
+def ifsc_stub(monkeypatch, tmp_path):
+    """The stub API on an ephemeral port, with lookups pointed at it and an empty memory-only cache."""
+    args = argparse.Namespace(latency=0.05, fail_rate=0.0, fail_first=0, verbose=False)
+    stats = Stats()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args, None, stats))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("IFSC_API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("IFSC_INDEX_PATH", str(tmp_path / "no_index.sqlite"))
+    monkeypatch.setattr(ifsc_main, "ifsc_cache", IFSCCache(None))
+    yield args, stats
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,32 @@
+import threading
+
+from src.features.esi_pf_challan.helpers.diagnostics import record_stages, stage
+
+
+def test_only_one_run_traces_memory_at_a_time():
+    inside, done = threading.Event(), threading.Event()
+    logs = {}
+
+    def first():
+        with record_stages(trace_memory=True) as log:
+            with stage("allocate"):
+                data = [bytes(1024) for _ in range(1000)]
+                inside.set()
+                done.wait(5)
+        logs["first"] = log
+        del data
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    inside.wait(5)
+    with record_stages(trace_memory=True) as log:
+        with stage("concurrent"):
+            pass
+    done.set()
+    thread.join()
+
+    assert logs["first"].trace_memory and logs["first"].as_dicts()[0]["peak traced MiB"]
+    assert not log.trace_memory and log.as_dicts()[0]["peak traced MiB"] is None
+    with record_stages(trace_memory=True) as log:
+        pass
+    assert log.trace_memory
@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+
+from conftest import UNKNOWN_IFSC as UNKNOWN
+from src.features.ifsc_checker import main
+from src.features.ifsc_checker.bulk import (
+    STATUS_BAD_FORMAT, STATUS_MISSING, STATUS_NOT_FOUND, STATUS_VALID, resolve_ifsc_codes, validate_accounts,
+)
+from src.features.ifsc_checker.index import build_index
+
+FOUND = [f"HDFC0{n:06d}" for n in range(1, 13)]
+
+
+def test_each_code_is_requested_once_within_the_concurrency_limit(ifsc_stub):
+    _, stats = ifsc_stub
+    results = resolve_ifsc_codes(FOUND * 3 + [UNKNOWN, UNKNOWN], max_workers=4)
+
+    assert set(results) == set(FOUND) | {UNKNOWN}
+    assert stats.by_code == {code: 1 for code in FOUND + [UNKNOWN]}
+    assert 1 < stats.peak <= 4
+
+
+def test_server_errors_are_retried(ifsc_stub):
+    args, stats = ifsc_stub
+    args.fail_first = 1
+    results = resolve_ifsc_codes(FOUND[:3])
+
+    assert all(result["status"] == "success" for result in results.values())
+    assert stats.by_code == {code: 2 for code in FOUND[:3]}
+    assert stats.by_status == {503: 3, 200: 3}
+
+
+def test_not_found_is_negative_cached(ifsc_stub):
+    _, stats = ifsc_stub
+    first = main.check_ifsc_exists(UNKNOWN)
+    again = main.check_ifsc_exists(UNKNOWN)
+
+    assert first["message"] == again["message"] == main.NOT_FOUND_MESSAGE
+    assert stats.by_code == {UNKNOWN: 1}
+    assert main.ifsc_cache.stats()["memory_hits"] == 1
+
+
+def test_validate_accounts_annotates_each_ifsc_column(ifsc_stub):
+    df = pd.DataFrame({"Name": ["A", "B", "C", "D"], "IFSC Code": [FOUND[0].lower(), "", "HDFC1234567", UNKNOWN]})
+    annotated = validate_accounts(df, ["IFSC Code"])
+
+    assert list(annotated.columns) == ["Name", "IFSC Code", "IFSC Code Status", "IFSC Code Bank", "IFSC Code Branch", "IFSC Code Message"]
+    assert list(annotated["IFSC Code Status"]) == [STATUS_VALID, STATUS_MISSING, STATUS_BAD_FORMAT, STATUS_NOT_FOUND]
+    assert list(annotated["IFSC Code Bank"]) == ["HDFC Stub Bank", "", "", ""]
+    assert annotated["IFSC Code"].tolist() == df["IFSC Code"].tolist()
+
+
+def test_codes_only_index_entries_get_details_from_the_api(ifsc_stub, tmp_path, monkeypatch):
+    dump = tmp_path / "IFSC.json"
+    dump.write_text(json.dumps({"HDFC": [FOUND[0]], "SBIN": [UNKNOWN]}))
+    monkeypatch.setenv("IFSC_INDEX_PATH", str(tmp_path / "index.sqlite"))
+    build_index([str(dump)])
+
+    listed = main.check_ifsc_exists(FOUND[0])
+    assert listed["status"] == "success" and listed["data"]["BANK"] == "HDFC Stub Bank"
+    # The API does not know it, but the index lists it: found, without details
+    only_indexed = main.check_ifsc_exists(UNKNOWN)
+    assert only_indexed["status"] == "success" and only_indexed["data"] == {"IFSC": UNKNOWN, "BANKCODE": "SBIN"}
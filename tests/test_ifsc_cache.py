@@ -0,0 +1,59 @@
+from src.features.ifsc_checker.cache import IFSCCache
+
+FOUND = {"IFSC": "SBIN0000001", "BANK": "State Bank of India"}
+NOT_FOUND = {"error": "IFSC code not found"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_their_ttl_in_both_tiers(tmp_path):
+    clock = Clock()
+    path = tmp_path / "ifsc_cache.sqlite"
+    writer = IFSCCache(path, ttl=100, negative_ttl=10, clock=clock)
+    writer.put("SBIN0000001", FOUND, found=True)
+    writer.put("SBIN0900001", NOT_FOUND, found=False)
+    reader = IFSCCache(path, ttl=100, negative_ttl=10, clock=clock)  # another process: disk tier only
+
+    clock.now = 9
+    for cache in (writer, reader):
+        assert cache.get("SBIN0000001") == FOUND and cache.get("SBIN0900001") == NOT_FOUND
+    assert writer.stats()["memory_hits"] == 2 and reader.stats()["disk_hits"] == 2
+
+    clock.now = 10
+    for cache in (writer, reader):
+        assert cache.get("SBIN0900001") is None
+        assert cache.get("SBIN0000001") == FOUND
+
+    clock.now = 100
+    for cache in (writer, reader):
+        assert cache.get("SBIN0000001") is None  # a disk hit keeps the stored expiry, not a fresh ttl
+    assert reader.stats() == {"memory_entries": 2, "memory_hits": 1, "disk_hits": 2, "misses": 2}
+    assert writer.purge_expired() == 2
+    assert writer.stats()["memory_entries"] == 0
+
+
+def test_memory_only_cache_expires_negative_answers_first():
+    clock = Clock()
+    cache = IFSCCache(None, ttl=100, negative_ttl=10, clock=clock)
+    cache.put("SBIN0000001", FOUND, found=True)
+    cache.put("SBIN0900001", NOT_FOUND, found=False)
+
+    clock.now = 50
+    assert cache.get("SBIN0900001") is None
+    assert cache.get("SBIN0000001") == FOUND
+    assert cache.stats() == {"memory_entries": 2, "memory_hits": 1, "disk_hits": 0, "misses": 1}
+
+
+def test_entries_evicted_from_memory_are_served_from_disk(tmp_path):
+    cache = IFSCCache(tmp_path / "ifsc_cache.sqlite", max_entries=1, clock=Clock())
+    cache.put("SBIN0000001", FOUND, found=True)
+    cache.put("SBIN0000002", FOUND, found=True)
+
+    assert cache.get("SBIN0000001") == FOUND
+    assert cache.stats() == {"memory_entries": 1, "memory_hits": 0, "disk_hits": 1, "misses": 0}
@@ -0,0 +1,74 @@
+"""
+Import-time budgets: each module is imported in a fresh interpreter with `python -X importtime`.
+
+Its cumulative import time (best of up to ATTEMPTS runs) must stay under its
+budget, and modules meant to be loaded lazily must not be in sys.modules
+afterwards. IMPORT_BUDGET_SCALE=2 doubles every budget on a slower machine.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+ATTEMPTS = 3
+SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", 1))
+CALCULATORS = ["src.features.esi_pf_challan.engine", "src.features.esi_pf_challan.Somany.calculate", "src.features.esi_pf_challan.HNG.calculate"]
+
+# module, budget in milliseconds, modules it must not load
+BUDGETS: List[Tuple[str, float, List[str]]] = [
+    ("src.features.esi_pf_challan", 50, ["pandas", "openpyxl", "streamlit", *CALCULATORS]),
+    ("src.features.ifsc_checker", 50, ["pandas", "requests"]),
+    ("src.monitoring", 50, ["pandas"]),
+    ("src.warmup", 50, ["pandas"]),
+    ("src.features.esi_pf_challan.profiles", 50, ["pandas"]),
+    ("src.features.esi_pf_challan.runner", 1500, ["streamlit", "openpyxl", "xlsxwriter", "src.features.esi_pf_challan.engine"]),
+    ("src.features.esi_pf_challan.engine", 1500, ["streamlit", "openpyxl"]),
+    ("src.features.esi_pf_challan.HNG.calculate", 1500, ["streamlit", "openpyxl", "src.features.esi_pf_challan.Somany.calculate"]),
+    ("src.features.esi_pf_challan.Somany.calculate", 1500, ["streamlit", "openpyxl", "src.features.esi_pf_challan.HNG.calculate"]),
+]
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def measure(module: str) -> Tuple[Optional[float], List[str]]:
+    """Cumulative import time of module in ms and the modules loaded with it."""
+    result = _run(f"import {module}, sys, json; print(json.dumps(sorted(sys.modules)))")
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1]) / 1000
+    return cumulative, json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("module, budget, forbidden", BUDGETS, ids=[module for module, _, _ in BUDGETS])
+def test_import_within_budget(module, budget, forbidden):
+    limit = budget * SCALE
+    timings = []
+    for _ in range(ATTEMPTS):
+        ms, modules = measure(module)
+        timings.append(ms)
+        if ms <= limit:
+            break
+    assert [name for name in forbidden if name in modules] == []
+    assert min(timings) <= limit, f"{module} imports in {min(timings):.0f} ms (budget {limit:.0f} ms)"
+
+
+def test_package_loads_a_calculator_on_first_use():
+    code = (
+        "import sys, json, src.features.esi_pf_challan as package; before = sorted(sys.modules); package.pipeline; "
+        "print(json.dumps([before, sorted(sys.modules)]))"
+    )
+    before, after = json.loads(_run(code).stdout)
+    assert "pandas" not in before and not set(CALCULATORS) & set(before)
+    assert {"pandas", "src.features.esi_pf_challan.engine"} <= set(after)
@@ -0,0 +1,37 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.features.esi_pf_challan.helpers.incremental import BaselineStore, RowReuse
+
+
+INPUTS = pd.DataFrame({"UAN": [1, 2], "wages": [15000, 21000]})
+
+
+def _run(baseline=None) -> RowReuse:
+    reuse = RowReuse(baseline)
+    reuse.rows(INPUTS, INPUTS["UAN"], lambda rows: INPUTS.loc[rows].assign(EPF=lambda df: df["wages"] * 0.12))
+    return reuse
+
+
+def test_baselines_round_trip_without_pickle(tmp_path):
+    store = BaselineStore(tmp_path)
+    pf = _run().baseline
+    esi = pd.DataFrame({"IP Number": ["1001", "1002"], "IP Name": ["A", "B"], "Total Monthly Wages": [15000, 21000]})
+    store.save("Plant 1 / Unit A", pf, esi)
+
+    saved = store.load("Plant 1 / Unit A")
+    assert_frame_equal(saved["pf"], pf, check_dtype=False)  # text comes back as TEXT_DTYPE, as from result_store
+    assert _run(saved["pf"]).reused == 2
+    assert_frame_equal(saved["esi"], esi, check_dtype=False)
+    assert saved["saved_at"]
+    assert store.establishments() == ["Plant_1_Unit_A"]
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_missing_pf_baseline_and_old_pickles(tmp_path):
+    (tmp_path / "old.pkl").write_bytes(b"not loaded")
+    store = BaselineStore(tmp_path)
+    store.save("new", None, pd.DataFrame({"IP Number": ["1"]}))
+    assert store.load("new")["pf"] is None
+    assert store.load("old") is None
+    assert store.establishments() == ["new"]
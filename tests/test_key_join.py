@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from conftest import UANS
+from src.features.esi_pf_challan.helpers.key_join import join_on_key
+from src.features.esi_pf_challan.helpers.validation import ValidationError
+from src.features.esi_pf_challan.helpers.verification import verify_pf
+
+
+def _payroll(uans) -> pd.DataFrame:
+    return pd.DataFrame({"UAN": uans, "MEMBER_NAME": [f"MEMBER {i}" for i in range(len(uans))], "father": ""}, index=range(5, 5 + len(uans)))
+
+
+def _active(uans, names=None) -> pd.DataFrame:
+    names = names or [f"MEMBER {i}" for i in range(len(uans))]
+    return pd.DataFrame({"UAN": uans, "Name": names, "Father's/Husband's Name": ""})
+
+
+def test_duplicates_are_reported_on_both_sides_and_match_the_first_member():
+    payroll = _payroll([UANS[0], UANS[1], UANS[0], UANS[2]])
+    active = _active([UANS[0], UANS[1], UANS[1], UANS[3]], ["FIRST", "SECOND", "THIRD", "FOURTH"])
+
+    join = join_on_key(payroll, active.drop(columns=["Father's/Husband's Name"]), "UAN", "UAN")
+
+    assert list(join.joined.index) == list(payroll.index)
+    assert join.joined["Name"].tolist()[:3] == ["FIRST", "SECOND", "FIRST"]
+    assert pd.isna(join.joined["Name"].iloc[3])
+    assert join.duplicate_payroll.index.tolist() == [5, 7]
+    assert join.duplicate_active.index.tolist() == [1, 2]
+    assert join.missing_from_active["UAN"].tolist() == [UANS[2]]
+    assert join.missing_from_payroll["UAN"].tolist() == [UANS[3]]
+    assert join.summary() == {
+        "matched": 3,
+        "missing_from_active": 1,
+        "missing_from_payroll": 1,
+        "duplicate_payroll_rows": 2,
+        "duplicate_active_rows": 2,
+    }
+
+
+def test_verify_pf_records_the_join_summary():
+    verify_df = verify_pf(_payroll(UANS[:2]), _active([UANS[1], UANS[0], UANS[1], UANS[2]]))
+
+    assert verify_df.index.tolist() == [2, 3]
+    assert verify_df["Name in Active List"].tolist() == ["MEMBER 1", "MEMBER 0"]
+    assert verify_df.attrs["join_summary"] == {
+        "matched": 2,
+        "missing_from_active": 0,
+        "missing_from_payroll": 1,
+        "duplicate_payroll_rows": 0,
+        "duplicate_active_rows": 2,
+    }
+
+
+def test_verify_pf_rejects_uans_missing_from_the_active_list():
+    with pytest.raises(ValidationError) as error:
+        verify_pf(_payroll(UANS[:3]), _active(UANS[:2]))
+    assert error.value.count == 1
+    assert error.value.rows["UAN"].tolist() == [UANS[2]]
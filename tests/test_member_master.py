@@ -0,0 +1,47 @@
+import io
+
+import pandas as pd
+
+from conftest import DOBS, UANS, named_buffer
+from src.features.esi_pf_challan.helpers.member_master import MemberMaster, read_esi_members, read_pf_members
+
+
+def test_read_pf_members_parses_mixed_month_names_without_a_format(pf_members_csv):
+    members = read_pf_members(named_buffer(pf_members_csv, "pf.csv"))
+    assert list(members["UAN"]) == [str(uan) for uan in UANS]
+    assert list(members["DoB"]) == [pd.to_datetime(dob, format="%d-%b-%Y") for dob in DOBS]
+
+
+def test_read_pf_members_uses_the_profile_format(pf_members_csv):
+    members = read_pf_members(named_buffer(pf_members_csv, "pf.csv"), dob_format="%d-%b-%Y")
+    assert list(members["DoB"]) == [pd.to_datetime(dob, format="%d-%b-%Y") for dob in DOBS]
+
+
+def test_master_round_trips_dobs(pf_members_csv, tmp_path):
+    master = MemberMaster(tmp_path / "master.sqlite")
+    counts = master.upsert_pf("Somany", read_pf_members(named_buffer(pf_members_csv, "pf.csv")))
+    assert counts["added"] == len(UANS)
+    assert list(master.pf_members("Somany")["DoB"]) == [pd.to_datetime(dob, format="%d-%b-%Y") for dob in DOBS]
+
+
+def test_full_list_removes_members_who_left(pf_members_csv, tmp_path):
+    master = MemberMaster(tmp_path / "master.sqlite")
+    members = read_pf_members(named_buffer(pf_members_csv, "pf.csv"))
+    master.upsert_pf("Somany", members)
+
+    delta = master.upsert_pf("Somany", members.head(2))
+    assert delta["removed"] == 0 and len(master.pf_members("Somany")) == len(UANS)
+    full = master.upsert_pf("Somany", members.head(2), replace=True)
+    assert full == {"added": 0, "updated": 0, "unchanged": 2, "removed": 2}
+    assert list(master.pf_members("Somany")["UAN"]) == [str(uan) for uan in UANS[:2]]
+
+
+def test_blank_esi_names_stay_missing(tmp_path):
+    esi_list = io.BytesIO()
+    pd.DataFrame({"empe_ip_number": [2000000001, 2000000002], "empe_name": ["ASHA DEVI", None]}).to_excel(esi_list, index=False)
+    members = read_esi_members(named_buffer(esi_list.getvalue(), "esi.xlsx"))
+    assert members["empe_name"].isna().tolist() == [False, True]
+
+    master = MemberMaster(tmp_path / "master.sqlite")
+    master.upsert_esi("Somany", members)
+    assert master.esi_members("Somany")["empe_name"].isna().tolist() == [False, True]
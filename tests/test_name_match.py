@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.features.esi_pf_challan.helpers.name_match import name_scores, normalize_names
+
+
+def _scores(pairs) -> list:
+    left, right = zip(*pairs)
+    index = range(2, 2 + len(pairs))
+    return name_scores(pd.Series(left, index=index), pd.Series(right, index=index)).astype(float).round(2).tolist()
+
+
+def test_normalize_names_drops_titles_relations_and_punctuation():
+    names = pd.Series(["Mr. R.K. Sharma", "R K  SHARMA", "S/O Late Ram Lal", "  ", None], index=[2, 3, 4, 5, 6])
+    normalized = normalize_names(names)
+    assert normalized.index.tolist() == [2, 3, 4, 5, 6]
+    assert normalized.tolist()[:3] == ["R K SHARMA", "R K SHARMA", "RAM LAL"]
+    assert normalized.iloc[3:].isna().all()
+
+
+def test_dice_scores_compare_word_sets_row_by_row():
+    assert _scores([
+        ("RAJESH KUMAR", "Rajesh Kumar"),
+        ("RAJESH KUMAR", "RAJESH SINGH"),
+        ("Smt. Sunita Devi", "SUNITA DEVI"),
+        ("RAJESH", "SHARMA"),
+        ("SHARMA", "RAJESH"),  # words shared only across rows never count
+    ]) == [1.0, 0.5, 1.0, 0.0, 0.0]
+
+
+def test_initials_credit_one_unmatched_word_with_the_same_letter():
+    assert _scores([
+        ("R K SHARMA", "RAJESH KUMAR SHARMA"),
+        ("RAJESH KUMAR SHARMA", "R K SHARMA"),
+        ("R SHARMA", "SURESH SHARMA"),
+        ("A SHARMA", "AMIT ANIL SHARMA"),
+        ("RAMKUMAR", "RAM KUMAR"),
+    ]) == [1.0, 1.0, 0.5, 0.8, 1.0]
+
+
+def test_blank_names_only_match_blanks():
+    assert _scores([("", None), ("RAJESH", ""), (None, "RAJESH"), ("Mr.", "")]) == [1.0, 0.0, 0.0, 1.0]
+
+
+def test_scores_are_independent_of_the_other_rows():
+    pairs = [("R K SHARMA", "RAJESH KUMAR SHARMA"), ("A SHARMA", "AMIT ANIL SHARMA"), ("RAJESH KUMAR", "RAJESH SINGH"), ("", "RAM")] * 50
+    assert _scores(pairs) == [_scores([pair])[0] for pair in pairs]
@@ -0,0 +1,42 @@
+import threading
+import time
+
+import pandas as pd
+
+from conftest import named_buffer
+from src.features.esi_pf_challan import runner
+from src.features.esi_pf_challan.helpers.result_cache import ResultCache
+
+
+def test_cache_key_includes_the_pf_cutoff(monkeypatch):
+    cache = ResultCache()
+    calls = []
+    monkeypatch.setattr(runner, "result_cache", cache)
+    monkeypatch.setattr(runner, "process_company", lambda company, *files, progress: calls.append(company) or {"n": len(calls)})
+    files = lambda: [named_buffer(b"same bytes", name) for name in ("pf.xlsx", "esi.xlsx", "pf.csv", "esi.xls")]
+
+    monkeypatch.setattr(runner, "pf_cutoff_date", lambda: pd.Timestamp("2026-08-31"))
+    first = runner.cached_process_company("Somany", *files())
+    assert runner.cached_process_company("Somany", *files()) is first
+    monkeypatch.setattr(runner, "pf_cutoff_date", lambda: pd.Timestamp("2026-09-30"))
+    assert runner.cached_process_company("Somany", *files()) == {"n": 2}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"value": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results[0] is results[1]
@@ -0,0 +1,84 @@
+import pandas as pd
+
+from src.features.esi_pf_challan.helpers import result_store as store_module
+from src.features.esi_pf_challan.helpers.result_store import ResultStore
+
+
+def test_frames_are_decoded_only_when_used(monkeypatch):
+    store = ResultStore()
+    handle = store.put({"pf_df": pd.DataFrame({"UAN": ["1"]}), "verify_pf": pd.DataFrame({"x": [1]})})
+    decoded = []
+    real = store_module.frame_from_bytes
+    monkeypatch.setattr(store_module, "frame_from_bytes", lambda blob: decoded.append(blob) or real(blob))
+
+    results = store.get(handle)
+    assert decoded == []
+    assert results["pf_df"] is results["pf_df"]
+    assert len(decoded) == 1
+    assert list(results) == ["pf_df", "verify_pf"] and results.get("pf_baseline") is None
+
+
+def test_files_are_built_once_and_counted_in_the_budget():
+    store = ResultStore()
+    handle = store.put({"pf_df": pd.DataFrame({"UAN": ["1"]})})
+    before = store.stats()["bytes"]
+    builds = []
+    build = lambda: builds.append(1) or b"PF TEXT"
+
+    assert store.file(handle, "pf", build) == store.file(handle, "pf", build) == b"PF TEXT"
+    assert len(builds) == 1
+    assert store.stats()["bytes"] == before + len(b"PF TEXT")
+    store.discard(handle)
+    assert store.stats()["bytes"] == 0
+    assert store.file(handle, "pf", build) == b"PF TEXT" and len(builds) == 2  # dropped: built, not kept
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frames(n: int) -> dict:
+    return {"pf_df": pd.DataFrame({"UAN": [str(100000000000 + n)] * 10})}
+
+
+def test_idle_results_are_dropped_and_reads_keep_them_alive():
+    clock = Clock()
+    store = ResultStore(idle_seconds=100, clock=clock)
+    idle, read = store.put(_frames(1)), store.put(_frames(2))
+
+    clock.now = 90
+    assert store.get(read) is not None
+    clock.now = 150
+    fresh = store.put(_frames(3))
+
+    assert store.get(idle) is None
+    assert store.get(read)["pf_df"]["UAN"].iloc[0] == "100000000002"
+    assert store.get(fresh) is not None
+    assert store.stats()["entries"] == 2 and store.stats()["evicted"] == 1
+
+
+def test_least_recently_used_results_go_first_over_the_budget():
+    size = len(store_module.frame_to_bytes(_frames(1)["pf_df"]))
+    store = ResultStore(max_bytes=2 * size, clock=Clock())
+    first, second = store.put(_frames(1)), store.put(_frames(2))
+    assert store.get(first) is not None  # now the most recently used
+
+    third = store.put(_frames(3))
+
+    assert store.get(second) is None
+    assert store.get(first) is not None and store.get(third) is not None
+    assert store.stats() == {"entries": 2, "bytes": 2 * size, "evicted": 1}
+
+
+def test_the_result_in_use_is_kept_even_over_the_budget():
+    store = ResultStore(max_bytes=1, clock=Clock())
+    old = store.put(_frames(1))
+    new = store.put(_frames(2), replace=old)
+
+    assert store.get(new) is not None
+    assert store.stats()["entries"] == 1 and store.stats()["evicted"] == 0
+    assert store.get(old) is None
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from conftest import UANS
+from src.features.esi_pf_challan.helpers.save_output import iter_pf_custom_sep, save_pf_custom_sep
+
+
+def _pf_rows(n: int = 7) -> pd.DataFrame:
+    return pd.DataFrame({
+        "UAN": pd.array([UANS[i % 4] for i in range(n)], dtype="Int64"),
+        "MEMBER_NAME": pd.array([f"MEMBER {i}" for i in range(n)], dtype="string"),
+        "GROSS_WAGES": range(1000, 1000 + n),
+    })
+
+
+def test_blocks_join_to_the_whole_text():
+    df = _pf_rows()
+    for header in (False, True):
+        expected = save_pf_custom_sep(df, sep="#~#", header=header)
+        for block_rows in (1, 3, 7, 50):
+            blocks = list(iter_pf_custom_sep(df, sep="#~#", header=header, block_rows=block_rows))
+            assert b"".join(blocks).decode("utf-8") == expected
+    assert list(iter_pf_custom_sep(df.iloc[:0])) == []
+
+
+def test_continued_batches_append_as_one_file():
+    df = _pf_rows()
+    appended = b"".join(
+        b"".join(iter_pf_custom_sep(df.iloc[start:start + 3], continued=start > 0, block_rows=2))
+        for start in range(0, len(df), 3)
+    )
+    assert appended.decode("utf-8") == save_pf_custom_sep(df)
+
+
+def test_missing_values_render_blank():
+    df = pd.DataFrame({
+        "UAN": pd.array([UANS[0], None], dtype="Int64"),
+        "MEMBER_NAME": pd.array(["RAM LAL", None], dtype="string"),
+        "FATHER": ["SHYAM LAL", None],
+        "MIXED": pd.Series([1, None], dtype=object),
+        "RATE": [1.5, np.nan],
+        "DAYS": [26, 0],
+    })
+
+    assert save_pf_custom_sep(df, sep="#~#", header=True).split("\n") == [
+        "UAN#~#MEMBER_NAME#~#FATHER#~#MIXED#~#RATE#~#DAYS",
+        f"{UANS[0]}#~#RAM LAL#~#SHYAM LAL#~#1#~#1.5#~#26",
+        "#~##~##~##~##~#0",
+    ]
@@ -0,0 +1,46 @@
+import io
+
+import pandas as pd
+
+from conftest import DOBS, UANS, named_buffer, somany_workbook
+from src.features.esi_pf_challan.engine import pipeline
+from src.features.esi_pf_challan.helpers.excel_reader import iter_sheet_chunks, read_sheet
+from src.features.esi_pf_challan.helpers.save_output import save_pf_custom_sep
+from src.features.esi_pf_challan.helpers.streaming import read_pf_member_dobs
+
+
+def test_member_dobs_parse_each_value_without_a_format(pf_members_csv):
+    dobs = read_pf_member_dobs(named_buffer(pf_members_csv, "pf.csv"))
+    assert list(dobs.index) == [str(uan) for uan in UANS]
+    assert list(dobs) == [pd.Timestamp(pd.to_datetime(dob, format="%d-%b-%Y")) for dob in DOBS]
+
+
+def test_stream_pf_matches_calculate_pf_with_mixed_month_names(somany_payroll, pf_members_csv):
+    somany = pipeline("Somany")
+    out = io.BytesIO()
+    written = somany.stream_pf(named_buffer(somany_payroll, "somany.xlsx"), named_buffer(pf_members_csv, "pf.csv"), out, chunk_size=2)
+
+    _, pf_df = somany.calculate_pf(named_buffer(somany_payroll, "somany.xlsx"), named_buffer(pf_members_csv, "pf.csv"))
+    assert written == len(UANS)
+    assert out.getvalue() == save_pf_custom_sep(pf_df, sep="#~#", header=False).encode("utf-8")
+
+
+def test_stream_pf_matches_calculate_pf_with_repeated_uans(pf_members_csv):
+    payroll = somany_workbook(rows=[0, 1, 1, 2, 3])
+    somany = pipeline("Somany")
+    out = io.BytesIO()
+    written = somany.stream_pf(named_buffer(payroll, "somany.xlsx"), named_buffer(pf_members_csv, "pf.csv"), out, chunk_size=2)
+
+    _, pf_df = somany.calculate_pf(named_buffer(payroll, "somany.xlsx"), named_buffer(pf_members_csv, "pf.csv"))
+    assert written == len(pf_df)
+    assert out.getvalue() == save_pf_custom_sep(pf_df, sep="#~#", header=False).encode("utf-8")
+
+
+def test_chunk_labels_match_read_sheet_across_blank_rows():
+    sheet = io.BytesIO()
+    pd.DataFrame({"a": [1, None, 3, 4, None], "b": [2, None, 4, 5, None]}).to_excel(sheet, index=False)
+    chunks = list(iter_sheet_chunks(named_buffer(sheet.getvalue(), "s.xlsx"), chunk_size=2))
+
+    expected = read_sheet(named_buffer(sheet.getvalue(), "s.xlsx"))
+    assert list(pd.concat(chunks).index) == list(expected.index) == [0, 1, 2, 3]
+    assert pd.concat(chunks)["a"].isna().tolist() == [False, True, False, False]
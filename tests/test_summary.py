@@ -0,0 +1,15 @@
+import pandas as pd
+
+from src.features.esi_pf_challan.helpers.summary import ESI_DAYS_COL, ESI_WAGES_COL, combine_totals, compute_totals
+
+
+def test_totals_count_blank_esi_cells_as_zero():
+    pf_df = pd.DataFrame({"UAN": ["1", "2"], "GROSS_WAGES": pd.array([15000, None], dtype="Int32")})
+    esi_df = pd.DataFrame({
+        ESI_DAYS_COL: pd.array([26, None], dtype="Int32"),
+        ESI_WAGES_COL: pd.array([None, 12000], dtype="Int32"),
+    })
+    totals = compute_totals(pf_df, esi_df)
+
+    assert (totals["employees"], totals["pf_gross_wages"], totals["esi_total_days"], totals["esi_gross_wages"]) == (2, 15000, 26, 12000)
+    assert combine_totals({"A": totals}).loc["Group Total", "ESI Gross Wages"] == 12000
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from src.features.esi_pf_challan.helpers import streaming
+from src.features.esi_pf_challan.helpers.streaming import RowIssues
+from src.features.esi_pf_challan.helpers.validation import ValidationError
+
+
+def test_truncated_streaming_errors_state_the_real_count(monkeypatch):
+    monkeypatch.setattr(streaming, "MAX_REPORTED_ROWS", 3)
+    issues = RowIssues("Missing UAN:", ["Code"])
+    issues.add(pd.DataFrame({"Code": range(4)}))
+    issues.add(pd.DataFrame({"Code": range(4, 10)}, index=range(4, 10)))
+    try:
+        issues.raise_if_any()
+    except ValidationError as e:
+        error = e
+    assert error.truncated and error.count == 10 and len(error.rows) == 3
+    assert "first 3 of 10" in str(error)
+    lines = error.to_csv().decode("utf-8-sig").splitlines()
+    assert lines[:4] == ["Row,Code", "2,0", "3,1", "4,2"]
+    assert lines[-1].startswith("...,") and "first 3 of 10" in lines[-1]
+
+
+def test_complete_errors_are_not_marked_truncated():
+    error = ValidationError("Missing UAN:", pd.DataFrame({"Code": [1, 2]}, index=[2, 3]))
+    assert not error.truncated
+    assert error.to_csv().decode("utf-8-sig").splitlines() == ["Row,Code", "2,1", "3,2"]
+
+
+def test_csv_is_built_once_per_error():
+    error = ValidationError("Missing UAN:", pd.DataFrame({"Code": [1, 2]}, index=[2, 3]))
+    assert error.to_csv() is error.to_csv()
@@ -0,0 +1,70 @@
+"""
+Compares the Excel engines available to helpers.excel_reader on real payroll layouts.
+
+Every engine must produce identical frames; the script fails otherwise.
+
+    python tools/bench_excel_readers.py --somany somany.xlsx --hng hng.xlsx [--repeat 3]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.features.esi_pf_challan.helpers.excel_reader import available_engines, read_sheets  # noqa: E402
+from src.features.esi_pf_challan.profiles import PROFILES  # noqa: E402
+
+
+def layouts(args):
+    if args.somany:
+        yield "Somany WAGES+PAYMENT", args.somany, PROFILES["Somany"].payroll_reads()
+    if args.hng:
+        yield "HNG PF", args.hng, PROFILES["HNG"].payroll_reads(["pf"])
+        yield "HNG ESI", args.hng, PROFILES["HNG"].payroll_reads(["esi"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--somany", help="Somany payroll workbook")
+    parser.add_argument("--hng", help="HNG payroll workbook")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not (args.somany or args.hng):
+        parser.error("give at least one of --somany / --hng")
+
+    engines = available_engines()
+    rows, ok = [], True
+    for label, path, sheets in layouts(args):
+        reference = None
+        for engine in engines:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                frames = read_sheets(path, sheets, engine=engine)
+                timings.append(time.perf_counter() - start)
+
+            identical = "-"
+            if reference is None:
+                reference = frames
+            else:
+                try:
+                    for sheet, frame in frames.items():
+                        pd.testing.assert_frame_equal(reference[sheet], frame)
+                    identical = "yes"
+                except AssertionError as e:
+                    identical = f"NO: {str(e).splitlines()[0]}"
+                    ok = False
+
+            n_rows = sum(len(frame) for frame in frames.values())
+            rows.append([label, engine, n_rows, f"{min(timings):.3f}", f"{sum(timings) / len(timings):.3f}", identical])
+
+    print(tabulate(rows, headers=["layout", "engine", "rows", "best s", "mean s", f"same as {engines[0]}"], tablefmt="rounded_grid"))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
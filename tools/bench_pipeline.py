@@ -0,0 +1,195 @@
+"""
+Times and memory-profiles each stage of the company pipelines on synthetic payrolls.
+
+Stages:
+    parse               payroll workbook(s) and member lists into DataFrames
+    calculate           PF and ESI challan rows
+    verify              name comparison against the member lists
+    save_pf_custom_sep  PF challan text
+    save_esi_excel      ESI challan workbook
+
+Datasets come from tools/synthetic_payroll.py and are generated into --data
+on first use (rows_<n>/), so later runs reuse them; each company gets the
+files synthetic_payroll.COMPANY_FILES names for its profile. The uploaded
+member lists go straight to the calculators, as in the app without a saved
+employee master. Parsing inside the calculators (payroll sheets and member
+lists) is attributed to "parse" and their verify_pf/verify_esi calls to
+"verify" by wrapping those functions for the duration of the run; nothing
+else is changed. Times are the best of --repeat runs. Peak memory is the
+largest Python/NumPy allocation (tracemalloc) above the stage's starting
+point, measured in one extra run since tracing slows everything down; Arrow
+buffers are not traced.
+
+Save a run and compare a later one against it to see what a change did:
+
+    python tools/bench_pipeline.py --rows 1000 10000 100000 --save before.json
+    python tools/bench_pipeline.py --rows 1000 10000 100000 --compare before.json
+"""
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import mock
+
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_payroll import COMPANY_FILES, dataset_paths, write_dataset  # noqa: E402
+from src.features.esi_pf_challan import save_esi_excel, save_pf_custom_sep  # noqa: E402
+from src.features.esi_pf_challan import engine  # noqa: E402
+
+STAGES = ["parse", "calculate", "verify", "save_pf_custom_sep", "save_esi_excel"]
+
+
+class StageRecorder:
+    """
+    Accumulates wall time (and optionally peak traced memory) per stage.
+
+    Stages nest: time spent in an inner stage is not counted for the outer one,
+    so the per-stage times add up to the total.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.peak_bytes: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self._stack: List[str] = []
+        self._since = 0.0
+        self._base = 0
+
+    def _switch(self) -> None:
+        # Charge the time (and peak) since the last switch to the innermost running stage
+        now = time.perf_counter()
+        if self._stack:
+            stage = self._stack[-1]
+            self.seconds[stage] += now - self._since
+            if self.trace_memory:
+                self.peak_bytes[stage] = max(self.peak_bytes[stage], tracemalloc.get_traced_memory()[1] - self._base)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self._since = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        self._switch()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    def wrap(self, func, name: str):
+        """func, with every call counted under stage name."""
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def _open(path: Path) -> io.BytesIO:
+    # In-memory, named like an upload, so disk speed does not enter the timings
+    buffer = io.BytesIO(path.read_bytes())
+    buffer.name = path.name
+    return buffer
+
+
+def run_once(company: str, paths: Dict[str, Path], recorder: StageRecorder) -> None:
+    """One full pipeline run of company on a dataset, recorded stage by stage."""
+    pipeline = engine.pipeline(company)
+    files = COMPANY_FILES[company]
+    pf_file, esi_file = _open(paths[files["payroll"]]), _open(paths[files["payroll"]])
+    pf_members_file, esi_members_file = _open(paths["pf_members"]), _open(paths[files["esi_members"]])
+
+    with ExitStack() as patches:
+        for name, stage in [("read_sheet", "parse"), ("read_sheets", "parse"), ("verify_pf", "verify"), ("verify_esi", "verify")]:
+            patches.enter_context(mock.patch.object(engine, name, recorder.wrap(getattr(engine, name), stage)))
+        for name in ["_read_pf_members", "_read_esi_members"]:
+            patches.enter_context(mock.patch.object(pipeline, name, recorder.wrap(getattr(pipeline, name), "parse")))
+
+        with recorder.stage("parse"):
+            payroll_sheets = pipeline.read_payroll(pf_file) if pipeline.profile.single_payroll else None
+
+        with recorder.stage("calculate"):
+            _, pf_df = pipeline.calculate_pf(pf_file, pf_members_file, payroll_sheets)
+            _, esi_df = pipeline.calculate_esi(esi_file, esi_members_file, payroll_sheets)
+
+    with recorder.stage("save_pf_custom_sep"):
+        save_pf_custom_sep(pf_df, sep="#~#", header=False)
+    with recorder.stage("save_esi_excel"):
+        save_esi_excel(esi_df)
+
+
+def bench(company: str, paths: Dict[str, Path], repeat: int, memory: bool) -> Dict[str, Dict[str, Optional[float]]]:
+    """Best-of-repeat seconds and (if memory) peak MiB per stage."""
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        recorder = StageRecorder()
+        run_once(company, paths, recorder)
+        for stage, seconds in recorder.seconds.items():
+            best[stage] = min(best.get(stage, seconds), seconds)
+
+    peaks: Dict[str, Optional[float]] = {stage: None for stage in STAGES}
+    if memory:
+        recorder = StageRecorder(trace_memory=True)
+        tracemalloc.start()
+        try:
+            run_once(company, paths, recorder)
+        finally:
+            tracemalloc.stop()
+        peaks = {stage: recorder.peak_bytes[stage] / 1024 / 1024 for stage in STAGES}
+    return {stage: {"seconds": best[stage], "peak_mib": peaks[stage]} for stage in STAGES}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="payroll sizes (generated if missing)")
+    companies = [company for company in engine.PROFILES if company in COMPANY_FILES]  # profiles with synthetic inputs
+    parser.add_argument("--company", choices=companies, nargs="+", default=companies)
+    parser.add_argument("--data", default="bench_data", help="dataset directory (see tools/synthetic_payroll.py)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for datasets that have to be generated")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) memory-profiling run")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="show the change against results saved with --save")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else {}
+    results, rows_out = {}, []
+    for rows in args.rows:
+        data_dir = Path(args.data) / f"rows_{rows}"
+        paths = dataset_paths(data_dir)
+        if not all(path.exists() for path in paths.values()):
+            print(f"Generating {rows} rows into {data_dir} ...", file=sys.stderr)
+            write_dataset(rows, data_dir, args.seed)
+
+        for company in args.company:
+            key = f"{company}/{rows}"
+            results[key] = bench(company, paths, args.repeat, memory=not args.no_memory)
+            total = sum(stage["seconds"] for stage in results[key].values())
+            for stage, measured in list(results[key].items()) + [("total", {"seconds": total, "peak_mib": None})]:
+                row = [company, rows, stage, f"{measured['seconds']:.3f}",
+                       "-" if measured["peak_mib"] is None else f"{measured['peak_mib']:,.1f}"]
+                if args.compare:
+                    before = baseline.get(key, {})
+                    before_s = sum(s["seconds"] for s in before.values()) if stage == "total" else before.get(stage, {}).get("seconds")
+                    row.append(f"{(measured['seconds'] / before_s - 1) * 100:+.0f}%" if before_s else "-")
+                rows_out.append(row)
+
+    headers = ["company", "rows", "stage", "best s", "peak MiB"] + (["vs baseline"] if args.compare else [])
+    print(tabulate(rows_out, headers=headers, tablefmt="rounded_grid"))
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
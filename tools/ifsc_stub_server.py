@@ -0,0 +1,114 @@
+"""
+Local stand-in for the Razorpay IFSC API, for exercising bulk validation offline.
+
+    python tools/ifsc_stub_server.py [--port 8765] [--latency 0.05] [--fail-rate 0.1] [--fail-first 1] [--known IFSC.csv]
+    IFSC_API_URL=http://127.0.0.1:8765 streamlit run app.py
+
+GET /<code> answers like the real API:
+  - 200 with branch JSON for known codes (from --known, or by default any code
+    whose branch part does not start with "9"),
+  - 404 for unknown codes,
+  - 503 for a random --fail-rate share of requests, and for the first
+    --fail-first requests of every code (exercises retry/backoff).
+
+Every request is delayed by --latency seconds. Request totals and the peak
+number of concurrent requests are printed on Ctrl+C.
+"""
+import argparse
+import csv
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.by_status = {}
+        self.by_code = {}
+
+    def enter(self, code):
+        # Returns how many earlier requests there were for code
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            seen = self.by_code.get(code, 0)
+            self.by_code[code] = seen + 1
+            return seen
+
+    def leave(self, status):
+        with self.lock:
+            self.active -= 1
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+
+
+def make_handler(args, known, stats):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_GET(self):
+            code = self.path.strip("/").upper()
+            seen = stats.enter(code)
+            status = 500
+            try:
+                time.sleep(args.latency)
+                if seen < args.fail_first or random.random() < args.fail_rate:
+                    status, body = 503, {"error": "stub: simulated outage"}
+                elif (code in known) if known is not None else (len(code) == 11 and code[5] != "9"):
+                    status, body = 200, known.get(code) if known is not None else {
+                        "BANK": f"{code[:4]} Stub Bank", "IFSC": code, "BRANCH": f"Branch {code[5:]}",
+                        "CITY": "Stub City", "DISTRICT": "Stub District", "ADDRESS": f"{code[5:]} Stub Road",
+                    }
+                else:
+                    status, body = 404, "Not Found"
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            finally:
+                stats.leave(status)
+
+        def log_message(self, format, *log_args):
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+    return Handler
+
+
+def load_known(path):
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        return {row["IFSC"].upper(): row for row in csv.DictReader(fh)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds to wait before answering")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests of each code with 503")
+    parser.add_argument("--known", help="CSV with an IFSC column; only these codes are found")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    known = load_known(args.known) if args.known else None
+    stats = Stats()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args, known, stats))
+    print(f"IFSC stub listening on http://{args.host}:{args.port} (latency {args.latency}s, fail rate {args.fail_rate})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Requests by status: {dict(sorted(stats.by_status.items()))}; peak concurrency: {stats.peak}")
+
+
+if __name__ == "__main__":
+    main()
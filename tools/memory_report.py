@@ -0,0 +1,73 @@
+"""
+Reports how much memory the calculator results take, compared with the old object-string layout.
+
+The frames kept in st.session_state (PF/ESI challans and both name
+comparisons) are measured with memory_usage(deep=True) as they are now
+(Arrow-backed text, Int32 amounts) and as they used to be (Python str
+objects, Int64 amounts).
+
+    python tools/memory_report.py Somany --payroll somany.xlsx --pf-members pf.csv --esi-members esi.xls
+    python tools/memory_report.py HNG --pf-payroll pf.xlsx --esi-payroll esi.xlsx --pf-members pf.csv --esi-members esi.xlsx
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.features.esi_pf_challan.runner import COMPANIES, process_company  # noqa: E402
+from src.features.esi_pf_challan.profiles import PROFILES  # noqa: E402
+from src.features.esi_pf_challan.helpers.dtypes import PF_TEXT_COLUMNS  # noqa: E402
+
+
+def legacy_layout(name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """The same frame as the calculators built it before: object strings, Int64 PF amounts."""
+    if name == "pf_df":
+        return df.astype({col: str if col in PF_TEXT_COLUMNS else "Int64" for col in df.columns})
+    return df.astype(str)
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("company", choices=COMPANIES)
+    parser.add_argument("--payroll", help="payroll workbook (single-payroll companies, e.g. Somany)")
+    parser.add_argument("--pf-payroll", help="PF payroll workbook (e.g. HNG)")
+    parser.add_argument("--esi-payroll", help="ESI payroll workbook (e.g. HNG)")
+    parser.add_argument("--pf-members", required=True, help="PF active member list (.csv)")
+    parser.add_argument("--esi-members", required=True, help="ESI list of employees (.xls/.xlsx)")
+    args = parser.parse_args()
+
+    if PROFILES[args.company].single_payroll:
+        if not args.payroll:
+            parser.error(f"{args.company} needs --payroll")
+        pf_payroll = esi_payroll = args.payroll
+    else:
+        if not (args.pf_payroll and args.esi_payroll):
+            parser.error(f"{args.company} needs --pf-payroll and --esi-payroll")
+        pf_payroll, esi_payroll = args.pf_payroll, args.esi_payroll
+
+    with open(pf_payroll, "rb") as pf_file, open(esi_payroll, "rb") as esi_file, \
+            open(args.pf_members, "rb") as pf_members, open(args.esi_members, "rb") as esi_members:
+        results = process_company(args.company, pf_file, esi_file, pf_members, esi_members)
+
+    rows, before_total, after_total = [], 0, 0
+    for name, df in results.items():
+        before, after = frame_bytes(legacy_layout(name, df)), frame_bytes(df)
+        before_total += before
+        after_total += after
+        rows.append([name, len(df), f"{before / 1024:,.1f}", f"{after / 1024:,.1f}", f"{before / max(after, 1):.1f}x"])
+    rows.append(["total", "", f"{before_total / 1024:,.1f}", f"{after_total / 1024:,.1f}", f"{before_total / max(after_total, 1):.1f}x"])
+
+    print(tabulate(rows, headers=["frame", "rows", "before KiB", "after KiB", "smaller by"], tablefmt="rounded_grid"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Generates realistic synthetic payroll inputs for the Somany and HNG calculators.
+
+For every size a directory rows_<n>/ is written with:
+
+    somany.xlsx        WAGES + PAYMENT sheets (PAYMENT has a title row above its header)
+    hng.xlsx           HNG payroll: title rows, header on row 5, trailing totals row
+    pf_members.csv     PF active member list (as downloaded from the EPFO portal)
+    esi_members.xls    ESI list of employees (the portal's HTML ".xls" export)
+    esi_members.xlsx   the same list as a real workbook
+
+The payroll and member lists mostly agree, with the noise seen in practice:
+honorifics and initials in names, a few genuinely different names, members
+who left (only in the lists), fractional ESI days and members aged 58+.
+Output is deterministic for a given --seed (within a month: ages are relative to today).
+
+    python tools/synthetic_payroll.py --rows 1000 10000 100000 500000 --out bench_data
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+FIRST_NAMES = [
+    "RAJESH", "SURESH", "RAMESH", "MAHESH", "DINESH", "MUKESH", "ANIL", "SUNIL", "VIJAY", "AJAY", "SANJAY", "MANOJ",
+    "PRADEEP", "SANDEEP", "RAKESH", "ASHOK", "DEEPAK", "AMIT", "ROHIT", "VIKAS", "PANKAJ", "RAHUL", "ARUN", "VINOD",
+    "SUNITA", "ANITA", "KAVITA", "SEEMA", "REKHA", "POOJA", "NEHA", "PRIYA", "MEENA", "GEETA", "SAROJ", "SHARDA",
+]
+MIDDLE_NAMES = ["KUMAR", "PRASAD", "SINGH", "LAL", "CHAND", "DEVI", "KUMARI", "NATH", ""]
+SURNAMES = [
+    "SHARMA", "VERMA", "GUPTA", "SINGH", "YADAV", "KUMAR", "PATEL", "MISHRA", "PANDEY", "TIWARI", "CHAUHAN", "JAIN",
+    "AGARWAL", "SAINI", "RAWAT", "BISHT", "NEGI", "THAKUR", "MEENA", "JAT", "GURJAR", "KHAN", "ANSARI", "QURESHI",
+]
+# Inputs each company profile is benchmarked on: its payroll and the ESI list format its portal exports
+COMPANY_FILES = {
+    "Somany": {"payroll": "somany", "esi_members": "esi_members_xls"},
+    "HNG": {"payroll": "hng", "esi_members": "esi_members_xlsx"},
+}
+DEPARTMENTS = ["PRODUCTION", "PACKING", "MAINTENANCE", "STORES", "QUALITY", "ADMIN", "DISPATCH"]
+
+DEFAULT_SIZES = [1000, 10000, 100000, 500000]
+# Shares of rows that deviate from a clean match
+HONORIFIC_SHARE = 0.05
+INITIALS_SHARE = 0.05
+MISMATCH_SHARE = 0.02
+LEFT_SHARE = 0.02  # members in the lists without a payroll row
+
+
+def _names(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    """Employee and father names; fathers share the employee's surname."""
+    first = rng.choice(FIRST_NAMES, n)
+    middle = rng.choice(MIDDLE_NAMES, n)
+    surname = rng.choice(SURNAMES, n)
+    father_first = rng.choice(FIRST_NAMES[:24], n)
+    name = pd.Series([" ".join(filter(None, parts)) for parts in zip(first, middle, surname)])
+    father = pd.Series([f"{a} {b}" for a, b in zip(father_first, surname)])
+    return pd.DataFrame({"name": name, "father": father, "first": first, "middle": middle, "surname": surname})
+
+
+def _payroll_names(rng: np.random.Generator, people: pd.DataFrame) -> pd.Series:
+    """How the payroll spells the names: mostly as registered, sometimes with honorifics, initials or a different name."""
+    n = len(people)
+    names = people["name"].copy()
+    roll = rng.random(n)
+
+    honorific = roll < HONORIFIC_SHARE
+    names[honorific] = rng.choice(["MR. ", "SHRI ", "SMT. "], honorific.sum()) + names[honorific]
+
+    initials = (roll >= HONORIFIC_SHARE) & (roll < HONORIFIC_SHARE + INITIALS_SHARE)
+    names[initials] = [
+        " ".join(filter(None, [f[0], m[:1]])) + f" {s}"
+        for f, m, s in zip(people["first"][initials], people["middle"][initials], people["surname"][initials])
+    ]
+
+    mismatch = (roll >= 1 - MISMATCH_SHARE)
+    names[mismatch] = rng.choice(FIRST_NAMES, mismatch.sum()) + " " + rng.choice(SURNAMES, mismatch.sum())
+    return names
+
+
+def build_frames(rows: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """
+    Builds every synthetic input as DataFrames (nothing written).
+
+    Returns:
+        Dict[str, pd.DataFrame]: "wages", "payment", "hng", "pf_members" and "esi_members".
+    """
+    rng = np.random.default_rng(seed)
+    n_left = int(rows * LEFT_SHARE)
+    n_members = rows + n_left
+    people = _names(rng, n_members)
+    uan = 100_000_000_000 + rng.choice(900_000_000, n_members, replace=False).astype(np.int64)
+    ip_number = 1_000_000_000 + rng.choice(900_000_000, n_members, replace=False).astype(np.int64)
+    # Ages 18-62 on the first of next month, so some are past the EPS age limit
+    dob = pd.Timestamp.today().normalize().replace(day=1) - pd.to_timedelta(rng.integers(18 * 365, 62 * 365, n_members), unit="D")
+
+    # Payroll rows are the first `rows` members; the rest have left
+    staff = slice(0, rows)
+    names = _payroll_names(rng, people.iloc[staff])
+    paycode = np.arange(1, rows + 1)
+    days = rng.integers(0, 27, rows).astype(float)
+    days[rng.random(rows) < 0.1] += 0.5
+    basic = rng.integers(7000, 16000, rows)
+    earn_pf = rng.integers(0, 4000, rows)
+    ncp = rng.integers(0, 5, rows)
+    tot_earn = basic + earn_pf + rng.integers(0, 3000, rows)
+    ot = np.where(rng.random(rows) < 0.3, rng.integers(100, 2500, rows), 0)
+    department = rng.choice(DEPARTMENTS, rows)
+
+    wages = pd.DataFrame({
+        "code": paycode, "naam": names, "father": people["father"][staff], "dept": department,
+        "uan_no": uan[staff], "esi_no": ip_number[staff], "birth_date": dob[staff],
+        "basic_sal": basic, "earn_pf": earn_pf, "days": days, "tot_earn": tot_earn, "ot_amtord": ot,
+        "net_pay": tot_earn + ot - (basic + earn_pf).clip(max=15000) * 12 // 100,
+    })
+    # PAYMENT lists the same people in a different order
+    order = rng.permutation(rows)
+    payment = pd.DataFrame({
+        "code": paycode[order], "uan_no": uan[staff][order], "NCP DAYS": ncp[order],
+        "bank_ac": rng.integers(10**11, 10**12, rows)[order],
+    })
+
+    pf_gross = basic + earn_pf
+    hng = pd.DataFrame({
+        "Paycode": paycode, "Name Of the Employee": names, "Father Name": people["father"][staff], "Department": department,
+        "UAN": uan[staff].astype(str), "PF GROSS": pf_gross, "NCP DAYS": ncp, "EDLI WAGES": pf_gross.clip(max=15000),
+        "ESI No": ip_number[staff], "Day ": days, "Earning On Which ESI Deducted.": tot_earn + ot,
+    })
+
+    pf_members = pd.DataFrame({
+        "UAN": uan, "Name": people["name"], "Father's/Husband's Name": people["father"],
+        "DoB": dob.strftime("%d-%b-%Y"), "Gender": rng.choice(["M", "F"], n_members),
+        "Date of Joining EPF": (dob + pd.DateOffset(years=20)).strftime("%d-%b-%Y"),
+    })
+    esi_members = pd.DataFrame({
+        "sl_no": np.arange(1, n_members + 1), "empe_ip_number": ip_number, "empe_name": people["name"],
+        "date_of_appointment": (dob + pd.DateOffset(years=20)).strftime("%d/%m/%Y"),
+    })
+    # Member lists are in portal order, not payroll order
+    shuffle = rng.permutation(n_members)
+    return {
+        "wages": wages.reset_index(drop=True), "payment": payment, "hng": hng.reset_index(drop=True),
+        "pf_members": pf_members.iloc[shuffle].reset_index(drop=True),
+        "esi_members": esi_members.iloc[shuffle].reset_index(drop=True),
+    }
+
+
+def _write_sheet(book: xlsxwriter.Workbook, name: str, df: pd.DataFrame, title_rows=(), footer=None, date_format=None) -> None:
+    """Writes title rows, a header row and the rows of df (and an optional footer row) in constant memory."""
+    sheet = book.add_worksheet(name)
+    for r, title in enumerate(title_rows):
+        sheet.write_row(r, 0, title)
+    start = len(title_rows)
+    sheet.write_row(start, 0, list(df.columns))
+    columns = [df[col].tolist() for col in df.columns]
+    date_cols = {i for i, col in enumerate(df.columns) if pd.api.types.is_datetime64_any_dtype(df[col])}
+    for r in range(len(df)):
+        for c, values in enumerate(columns):
+            if c in date_cols:
+                sheet.write_datetime(start + 1 + r, c, values[r].to_pydatetime(), date_format)
+            else:
+                sheet.write(start + 1 + r, c, values[r])
+    if footer is not None:
+        sheet.write_row(start + 1 + len(df), 0, footer)
+
+
+def dataset_paths(out_dir: Path) -> Dict[str, Path]:
+    """Files of the dataset in out_dir, by role."""
+    names = {"somany": "somany.xlsx", "hng": "hng.xlsx", "pf_members": "pf_members.csv",
+             "esi_members_xls": "esi_members.xls", "esi_members_xlsx": "esi_members.xlsx"}
+    return {key: out_dir / name for key, name in names.items()}
+
+
+def write_dataset(rows: int, out_dir: Path, seed: int = 0) -> Dict[str, Path]:
+    """
+    Writes one dataset of `rows` payroll rows into out_dir.
+
+    Returns:
+        Dict[str, Path]: "somany", "hng", "pf_members", "esi_members_xls" and "esi_members_xlsx".
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    frames = build_frames(rows, seed)
+    paths = dataset_paths(out_dir)
+
+    with xlsxwriter.Workbook(paths["somany"], {"constant_memory": True}) as book:
+        date_format = book.add_format({"num_format": "dd/mm/yyyy"})
+        _write_sheet(book, "WAGES", frames["wages"], date_format=date_format)
+        _write_sheet(book, "PAYMENT", frames["payment"], title_rows=[["PAYMENT REGISTER"]])
+
+    hng = frames["hng"]
+    totals = ["", "TOTAL"] + [""] * 3 + [int(hng["PF GROSS"].sum()), int(hng["NCP DAYS"].sum()), int(hng["EDLI WAGES"].sum()),
+                                     "", float(hng["Day "].sum()), int(hng["Earning On Which ESI Deducted."].sum())]
+    with xlsxwriter.Workbook(paths["hng"], {"constant_memory": True}) as book:
+        _write_sheet(book, "Sheet1", hng, footer=totals, title_rows=[
+            ["HNG FLOAT GLASS LIMITED"], ["PLOT NO. 1, INDUSTRIAL AREA"], ["WAGES FOR THE MONTH"], [""],
+        ])
+
+    frames["pf_members"].to_csv(paths["pf_members"], index=False)
+    frames["esi_members"].to_html(paths["esi_members_xls"], index=False)
+    with xlsxwriter.Workbook(paths["esi_members_xlsx"], {"constant_memory": True}) as book:
+        _write_sheet(book, "Sheet1", frames["esi_members"])
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SIZES, help="payroll rows per dataset")
+    parser.add_argument("--out", default="bench_data", help="output directory (one rows_<n>/ per size)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        start = time.perf_counter()
+        paths = write_dataset(rows, Path(args.out) / f"rows_{rows}", args.seed)
+        size = sum(path.stat().st_size for path in paths.values())
+        print(f"rows_{rows}: {size / 1024 / 1024:,.1f} MiB in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())